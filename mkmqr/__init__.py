@@ -11,15 +11,37 @@ from .__version import __version__
 from .binary import (
     BinaryArray,
     BinaryMatrix,
+    MatrixIndex,
     arr2str,
     mat2str,
     arr2bin,
     bin2arr,
+    bins2arr,
+    bytes2arr,
     bin2mat,
     concat_arr,
+    to_index_arr,
     merge_matrix,
+    stack_matrix,
     toggle_matrix,
     empty_matrix,
+    matrix_runs,
+    to_matrix_index,
+    index_grid,
+    freeze_matrix,
+    ByteArray,
+    to_byte_arr,
+    empty_byte_arr,
+    str2codepoints,
+    BitWriter,
+    SymbolBits,
+    popcount,
+    allocate_raster,
+    flush_raster,
+    render_raster,
+    render_raster_rows,
+    pack_raster,
+    pack_scanlines,
 )
 
 # from .error_correction import ()
@@ -48,9 +70,20 @@ from .factory import (
     text2segment,
     add_quiet_zone,
     segment2symbol_matrix,
+    symbol_matrix2raster,
     symbol_matrix2image,
     create_symbol_matrix,
     create_symbol_image,
+    write_symbol_png,
+    write_raster_png,
+    symbol_matrix2png,
+    symbol_matrix2path,
+    symbol_matrix2svg,
+    symbol_matrix2zpl,
+    symbol_matrix2zpl_label,
+    symbol_matrix2escpos,
+    get_sheet_shape,
+    create_sheet_raster,
 )
 
 from .optimization import (
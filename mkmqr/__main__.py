@@ -8,7 +8,7 @@ from logging import getLogger, StreamHandler, Formatter, DEBUG, INFO
 from typing import Optional
 
 import mkmqr
-from .factory import create_symbol_image
+from .factory import create_symbol_matrix, symbol_matrix2image, write_symbol_png
 from .model import ErrorCorrectionLevel as ECL, InvalidPairError, InvalidCharacterError, OverCapacityError, set_encoding
 
 handler = StreamHandler()
@@ -100,13 +100,17 @@ def main():
         logger.info('------------------------------------')
 
         set_encoding(encoding)
-        image = create_symbol_image(text, ecl)
+        matrix = create_symbol_matrix(text, ecl)
 
         if path is not None:
-            image.save(path)
+            if path.lower().endswith('.png'):  # PNGはPILを使わずに書き出す
+                with open(path, 'wb') as f:
+                    write_symbol_png(f, matrix)
+            else:
+                symbol_matrix2image(matrix).save(path)
             logger.info(f'image saved')
         if show:
-            image.show(text)
+            symbol_matrix2image(matrix).show(text)
     except OverCapacityError:
         print(f'over capacity', file=sys.stderr)
     except InvalidCharacterError as e:
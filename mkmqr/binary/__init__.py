@@ -9,14 +9,44 @@ from .array import (
     BinaryArray,
     arr2bin,
     bin2arr,
+    bins2arr,
+    bytes2arr,
     arr2str,
     concat_arr,
+    to_index_arr,
 )
 from .matrix import (
     BinaryMatrix,
+    MatrixIndex,
     bin2mat,
     mat2str,
     merge_matrix,
+    stack_matrix,
     toggle_matrix,
     empty_matrix,
+    matrix_runs,
+    to_matrix_index,
+    index_grid,
+    freeze_matrix,
+)
+from .byte import (
+    ByteArray,
+    to_byte_arr,
+    empty_byte_arr,
+    str2codepoints,
+)
+from .writer import (
+    BitWriter,
+)
+from .bits import (
+    SymbolBits,
+    popcount,
+)
+from .raster import (
+    allocate_raster,
+    flush_raster,
+    render_raster,
+    render_raster_rows,
+    pack_raster,
+    pack_scanlines,
 )
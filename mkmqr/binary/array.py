@@ -41,6 +41,34 @@ def bin2arr(binary: int, capacity: int) -> BinaryArray:
     ], dtype=_dtype)
 
 
+def bins2arr(binaries: Iterable[int], capacity: int) -> BinaryArray:
+    """
+    複数の自然数のビットをそれぞれ同じビット数で配列に変換し、連結する
+
+    :param binaries: 変換する自然数の列 (配列も可)
+    :param capacity: 自然数1つあたりのビットの容量
+    :return: 変換後の配列
+    """
+    binaries = np.asarray(binaries, dtype=np.int64).reshape(-1)
+    if (binaries < 0).any():
+        raise ValueError(f'binary must be greater than or equal to 0', binaries)
+    if (binaries >> capacity != 0).any():
+        raise ValueError(f'overflow ({capacity} bits)', binaries, capacity)
+
+    shifts = np.arange(capacity)[::-1]
+    return ((binaries[:, None] >> shifts) & 1).astype(_dtype).reshape(-1)
+
+
+def bytes2arr(data: bytes) -> BinaryArray:
+    """
+    バイト列のビットを配列に変換する
+
+    :param data: 変換するバイト列
+    :return: 変換後の配列
+    """
+    return np.unpackbits(np.frombuffer(data, dtype=np.uint8)).astype(_dtype)
+
+
 def arr2str(array: BinaryArray, on: str = '1', off: str = '0', byte_sep: str = '') -> str:
     """
     配列を文字列に変換する
@@ -64,3 +92,15 @@ def concat_arr(arrays: Iterable[BinaryArray]):
     :return: 連結した配列
     """
     return np.concatenate(arrays, dtype=_dtype)
+
+
+def to_index_arr(indices: Iterable[int]) -> np.ndarray:
+    """
+    添字の列を配列の要素を指定するインデックスに変換する
+
+    :param indices: 添字の列
+    :return: インデックス (読み取り専用)
+    """
+    idx = np.array(list(indices), dtype=np.intp)
+    idx.setflags(write=False)
+    return idx
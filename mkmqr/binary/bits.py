@@ -0,0 +1,143 @@
+"""
+シンボル全体を1つの自然数で表すためのファイル
+"""
+
+from functools import lru_cache
+from typing import Tuple
+import numpy as np
+
+from .matrix import BinaryMatrix
+
+try:
+    _popcount = int.bit_count  # Python 3.10以降
+except AttributeError:
+    def _popcount(x: int) -> int:
+        return bin(x).count('1')
+
+
+def popcount(x: int) -> int:
+    """
+    自然数の1のビットの数を数える
+
+    :param x: 自然数
+    :return: 1のビットの数
+    """
+    return _popcount(x)
+
+
+@lru_cache(maxsize=None)
+def _get_edge_masks(size: int) -> Tuple[int, int]:
+    """下端の行 (左端を除く) と右端の列 (上端を除く) のビットを立てた値を取得"""
+    bottom = sum(1 << ((size - 1) * size + j) for j in range(1, size))
+    right = sum(1 << (i * size + size - 1) for i in range(1, size))
+    return bottom, right
+
+
+class SymbolBits:
+    """
+    一辺sizeの正方行列を、i行j列の要素を (i * size + j) ビット目とする1つの自然数で表す
+
+    | マイクロQRコードのシンボルは最大でも17×17と小さく、BinaryMatrixでは各演算のnumpyの呼び出しの負荷の方が大きくなる
+    | シンボル全体を1つの自然数で表すことで、排他的論理和やビットの数え上げを整数演算のみで行う
+    """
+
+    __slots__ = ('_size', '_value')
+
+    def __init__(self, size: int, value: int = 0):
+        """
+        :param size: 行列の一辺の大きさ
+        :param value: 行列を表す自然数
+        """
+        if size < 0:
+            raise ValueError('size must be greater than or equal to 0', size)
+        if value < 0 or value >> (size * size) != 0:
+            raise ValueError(f'value must be in [0, 2^{size * size})', value)
+
+        self._size = size
+        self._value = value
+
+    @classmethod
+    def from_matrix(cls, matrix: BinaryMatrix) -> 'SymbolBits':
+        """
+        行列から変換する
+
+        :param matrix: 正方行列
+        :return: 変換後の値
+        """
+        h, w = matrix.shape
+        if h != w:
+            raise ValueError(f'matrix must be square, but it is {h}x{w}', matrix)
+
+        packed = np.packbits(matrix.ravel(), bitorder='little')
+        return cls(h, int.from_bytes(packed.tobytes(), 'little'))
+
+    def to_matrix(self) -> BinaryMatrix:
+        """
+        行列に変換する
+
+        :return: 変換後の行列
+        """
+        n = self._size
+        buffer = self._value.to_bytes((n * n + 7) // 8, 'little')
+        bits = np.unpackbits(np.frombuffer(buffer, dtype=np.uint8), count=n * n, bitorder='little')
+        return bits.astype(bool).reshape(n, n)
+
+    @property
+    def size(self) -> int:
+        """行列の一辺の大きさ"""
+        return self._size
+
+    @property
+    def value(self) -> int:
+        """行列を表す自然数"""
+        return self._value
+
+    def row(self, i: int) -> int:
+        """
+        i行目を取得する
+
+        :param i: 行番号
+        :return: j列目の要素を jビット目とする自然数
+        """
+        n = self._size
+        return (self._value >> (i * n)) & ((1 << n) - 1)
+
+    def count(self) -> int:
+        """1の要素の数"""
+        return _popcount(self._value)
+
+    def count_edges(self) -> Tuple[int, int]:
+        """
+        下端の行 (左端を除く) と右端の列 (上端を除く) の、1の要素の数を数える
+
+        :return: 下端の行の1の数, 右端の列の1の数
+        """
+        bottom, right = _get_edge_masks(self._size)
+        return _popcount(self._value & bottom), _popcount(self._value & right)
+
+    def _check_size(self, other: 'SymbolBits') -> None:
+        if self._size != other._size:
+            raise ValueError(f'size mismatch ({self._size} != {other._size})')
+
+    def __xor__(self, other: 'SymbolBits') -> 'SymbolBits':
+        self._check_size(other)
+        return SymbolBits(self._size, self._value ^ other._value)
+
+    def __or__(self, other: 'SymbolBits') -> 'SymbolBits':
+        self._check_size(other)
+        return SymbolBits(self._size, self._value | other._value)
+
+    def __and__(self, other: 'SymbolBits') -> 'SymbolBits':
+        self._check_size(other)
+        return SymbolBits(self._size, self._value & other._value)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, SymbolBits):
+            return NotImplemented
+        return self._size == other._size and self._value == other._value
+
+    def __hash__(self) -> int:
+        return hash((self._size, self._value))
+
+    def __repr__(self) -> str:
+        return f'SymbolBits({self._size}, {self._value:#x})'
@@ -0,0 +1,47 @@
+"""
+バイト(8ビットの自然数)の配列を扱うためのファイル
+"""
+
+from typing import Iterable, Tuple, Union
+import numpy as np
+
+ByteArray = np.ndarray
+"""バイト単位の配列 (多次元も含む)"""
+
+_dtype = np.uint8
+"""データ型"""
+
+
+def to_byte_arr(data: Union[bytes, Iterable[int], ByteArray]) -> ByteArray:
+    """
+    バイト列や自然数の列をバイト単位の配列に変換する
+
+    :param data: 変換するデータ (ネストしたリストや多次元の配列も可)
+    :return: 変換後の配列
+    """
+    if isinstance(data, (bytes, bytearray)):
+        return np.frombuffer(data, dtype=_dtype)
+    arr = np.asarray(data)
+    if arr.size != 0 and (arr.min() < 0 or arr.max() > 0xFF):
+        raise ValueError('each value must be in range 0-255')
+    return arr.astype(_dtype, copy=False)
+
+
+def empty_byte_arr(size: Union[int, Tuple[int, ...]]) -> ByteArray:
+    """
+    全ての要素が0のバイト単位の配列を作成する
+
+    :param size: 配列の大きさ
+    :return: 作成した配列
+    """
+    return np.zeros(size, dtype=_dtype)
+
+
+def str2codepoints(text: str) -> np.ndarray:
+    """
+    文字列を各文字のコードポイントの配列に変換する
+
+    :param text: 変換する文字列
+    :return: コードポイントの配列
+    """
+    return np.frombuffer(text.encode('utf-32-le', 'surrogatepass'), dtype='<u4')
@@ -2,12 +2,15 @@
 真偽値の行列を扱うためのファイル
 """
 
-from typing import Iterable, Union, Tuple
+from typing import Iterable, List, Union, Tuple
 import numpy as np
 
 BinaryMatrix = np.ndarray
 """バイナリ形式の行列"""
 
+MatrixIndex = Tuple[np.ndarray, np.ndarray]
+"""行列の要素を指定するインデックス (行番号の配列, 列番号の配列)"""
+
 _dtype = bool
 """データ型"""
 
@@ -62,6 +65,16 @@ def merge_matrix(matrix: Iterable[BinaryMatrix]) -> BinaryMatrix:
     return np.logical_xor.reduce(matrix, dtype=_dtype)
 
 
+def stack_matrix(matrix: Iterable[BinaryMatrix]) -> BinaryMatrix:
+    """
+    同じ大きさの行列(あるいは配列)を、先頭に軸を追加して並べる
+
+    :param matrix: 並べる行列
+    :return: 並べた行列
+    """
+    return np.stack(list(matrix))
+
+
 def toggle_matrix(matrix: BinaryMatrix) -> BinaryMatrix:
     """
     行列の全ての要素を反転する
@@ -72,13 +85,64 @@ def toggle_matrix(matrix: BinaryMatrix) -> BinaryMatrix:
     return np.logical_not(matrix)
 
 
-def empty_matrix(size: Union[int, Tuple[int, int]]):
+def empty_matrix(size: Union[int, Tuple[int, ...]]):
     """
     空の行列を作成する
 
-    :param size: 行列の大きさ (値を1つのみ指定した場合は正方行列となる)
+    :param size: 行列の大きさ (値を1つのみ指定した場合は正方行列となる、3つ以上指定した場合は行列を並べた配列となる)
     :return: 空の行列
     """
     if isinstance(size, int):
         size = size, size
     return np.zeros(size, dtype=bool)
+
+
+def matrix_runs(matrix: BinaryMatrix) -> List[Tuple[int, int, int]]:
+    """
+    行列の各行で、Trueが連続する区間を求める
+
+    :param matrix: 行列
+    :return: 区間 (行番号, 開始列, 終了列の次) の一覧 (行・列の順)
+    """
+    edges = np.diff(np.pad(matrix, ((0, 0), (1, 1))).astype(np.int8), axis=1)
+    rows, begins = np.nonzero(edges == 1)
+    ends = np.nonzero(edges == -1)[1]
+    return list(zip(rows.tolist(), begins.tolist(), ends.tolist()))
+
+
+def to_matrix_index(positions: Iterable[Tuple[int, int]]) -> MatrixIndex:
+    """
+    座標の列を行列のインデックスに変換する
+
+    :param positions: 座標(i,j)の列
+    :return: 行列のインデックス (読み取り専用)
+    """
+    idx = np.array(list(positions), dtype=np.intp).reshape(-1, 2)
+    rows, cols = idx[:, 0].copy(), idx[:, 1].copy()
+    rows.setflags(write=False)
+    cols.setflags(write=False)
+    return rows, cols
+
+
+def index_grid(size: Union[int, Tuple[int, int]]) -> MatrixIndex:
+    """
+    行列の各要素の座標を表す配列を作成する
+
+    :param size: 行列の大きさ (値を1つのみ指定した場合は正方行列となる)
+    :return: 各要素の行番号を並べた行列, 各要素の列番号を並べた行列
+    """
+    if isinstance(size, int):
+        size = size, size
+    y, x = np.indices(size)
+    return y, x
+
+
+def freeze_matrix(matrix: BinaryMatrix) -> BinaryMatrix:
+    """
+    行列を読み取り専用にする (破壊操作)
+
+    :param matrix: 読み取り専用にする行列
+    :return: 読み取り専用にした行列 (引数と同一)
+    """
+    matrix.setflags(write=False)
+    return matrix
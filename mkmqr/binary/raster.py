@@ -0,0 +1,120 @@
+"""
+行列を画素の配列に描画するためのファイル
+"""
+
+from typing import List, Tuple
+
+import numpy as np
+
+from .byte import ByteArray
+from .matrix import BinaryMatrix
+
+
+def allocate_raster(shape: Tuple[int, int], path: str = None) -> BinaryMatrix:
+    """
+    画素の配列を確保する (値は初期化しない)
+
+    :param shape: 配列の形状 (高さ, 幅)
+    :param path: .npy形式のメモリマップトファイルのパス (省略するとメモリ上に確保する)
+    :return: 画素の配列
+    """
+    if path is None:
+        return np.empty(shape, dtype=bool)
+    return np.lib.format.open_memmap(path, mode='w+', dtype=bool, shape=shape)
+
+
+def flush_raster(raster: BinaryMatrix) -> None:
+    """
+    メモリマップトファイルとして確保した画素の配列の変更を、ファイルに書き込む (メモリ上の配列なら何もしない)
+
+    :param raster: 画素の配列
+    """
+    if isinstance(raster, np.memmap):
+        raster.flush()
+
+
+def render_raster(matrix: BinaryMatrix, module_size: int, quiet_zone: int, out: BinaryMatrix = None) -> BinaryMatrix:
+    """
+    行列を、クワイエットゾーンを付けて拡大した画素の配列に描画する
+
+    | 反転・クワイエットゾーンの追加・拡大を、確保した配列への1回の書き込みで行う
+    | 画素はTrueが白 (明モジュール・クワイエットゾーン)、Falseが黒 (暗モジュール) を表す (PILのモード'1'と同じ)
+
+    :param matrix: 描画する行列 (Trueが暗モジュール)
+    :param module_size: 1モジュールあたりのピクセル数
+    :param quiet_zone: クワイエットゾーンの幅 (モジュール数)
+    :param out: 描画先の配列 (省略すると確保する)
+    :return: 画素の配列 ((高さ + 2 * quiet_zone) * module_size × (幅 + 2 * quiet_zone) * module_size)
+    """
+    if module_size < 1:
+        raise ValueError('module_size must be greater than 0', module_size)
+    if quiet_zone < 0:
+        raise ValueError('quiet_zone must be greater than or equal to 0', quiet_zone)
+
+    h, w = matrix.shape
+    shape = ((h + 2 * quiet_zone) * module_size, (w + 2 * quiet_zone) * module_size)
+    if out is None:
+        out = np.empty(shape, dtype=bool)
+    elif out.shape != shape or out.dtype != bool:
+        raise ValueError(f'out must be bool array of {shape}, but it is {out.dtype} array of {out.shape}', out)
+
+    q = quiet_zone * module_size
+    if q > 0:  # クワイエットゾーン
+        out[:q] = True
+        out[-q:] = True
+        out[q:-q, :q] = True
+        out[q:-q, -q:] = True
+
+    # 各モジュールを (module_size × module_size) の区画に展開した4次元のビュー (コピーではない) に、反転しながら書き込む
+    region = out[q:shape[0] - q, q:shape[1] - q]
+    symbol = region.reshape(h, module_size, w, module_size)
+    if np.may_share_memory(symbol, region):  # reshapeがコピーを返した場合は新しい領域なので、範囲の比較だけで判定できる
+        np.logical_not(matrix[:, None, :, None], out=symbol)
+    else:  # 描画先の配列の並びによってビューを作れない場合
+        region[...] = np.logical_not(matrix).repeat(module_size, axis=0).repeat(module_size, axis=1)
+    return out
+
+
+def render_raster_rows(matrix: BinaryMatrix, module_size: int, quiet_zone: int) -> BinaryMatrix:
+    """
+    行列の各行を、クワイエットゾーンを付けて横方向にだけ拡大した1ピクセル分の行に描画する
+
+    | 縦方向の拡大と上下のクワイエットゾーンは、呼び出し側で同じ行を繰り返して表す
+    | 画素はrender_rasterと同じく、Trueが白、Falseが黒を表す
+
+    :param matrix: 描画する行列 (Trueが暗モジュール)
+    :param module_size: 1モジュールあたりのピクセル数
+    :param quiet_zone: クワイエットゾーンの幅 (モジュール数)
+    :return: 画素の行の配列 (高さ × (幅 + 2 * quiet_zone) * module_size)
+    """
+    if module_size < 1:
+        raise ValueError('module_size must be greater than 0', module_size)
+    if quiet_zone < 0:
+        raise ValueError('quiet_zone must be greater than or equal to 0', quiet_zone)
+
+    h, w = matrix.shape
+    q = quiet_zone * module_size
+    out = np.ones((h, (w + 2 * quiet_zone) * module_size), dtype=bool)
+    np.logical_not(matrix[:, :, None], out=out[:, q:out.shape[1] - q].reshape(h, w, module_size))
+    return out
+
+
+def pack_raster(raster: BinaryMatrix) -> ByteArray:
+    """
+    画素の配列を、1画素1ビットで行ごとにバイト単位に詰める (行末の余りは0で埋める)
+
+    :param raster: 画素の配列
+    :return: 詰めた配列 (高さ × ceil(幅 / 8))
+    """
+    return np.packbits(raster, axis=-1)
+
+
+def pack_scanlines(raster: BinaryMatrix, prefix: bytes = b'') -> List[bytes]:
+    """
+    画素の配列を、1画素1ビットで詰めた行ごとのバイト列に変換する (行末の余りは0で埋める)
+
+    :param raster: 画素の配列
+    :param prefix: 各行の先頭に付けるバイト列 (例えばPNGのフィルタの種類)
+    :return: 行ごとのバイト列の一覧
+    """
+    return [prefix + line.tobytes() for line in np.packbits(raster, axis=-1)]
@@ -0,0 +1,137 @@
+"""
+ビット単位でデータを書き込むためのファイル
+"""
+
+from typing import Sequence
+import numpy as np
+
+from .array import BinaryArray, bytes2arr
+
+
+class BitWriter:
+    """
+    容量を指定して確保したバッファに、ビット単位でデータを書き込む
+
+    | バッファは1バイトに8ビットを詰めて保持する
+    | 書き込んだ後のデータはバイト列あるいはバイナリ形式の配列として取り出せる
+    """
+
+    def __init__(self, capacity: int):
+        """
+        :param capacity: ビット単位の容量
+        """
+        if capacity < 0:
+            raise ValueError('capacity must be greater than or equal to 0', capacity)
+
+        self._capacity = capacity
+        self._buffer = bytearray((capacity + 7) // 8)  # 書き込み位置以降は常に0
+        self._length = 0
+
+    @property
+    def capacity(self) -> int:
+        """ビット単位の容量"""
+        return self._capacity
+
+    @property
+    def remaining(self) -> int:
+        """ビット単位の残りの容量"""
+        return self._capacity - self._length
+
+    def __len__(self) -> int:
+        """書き込んだビット数"""
+        return self._length
+
+    def _advance(self, bit_length: int) -> int:
+        """書き込み位置を進め、進める前の位置を返す"""
+        if bit_length > self.remaining:
+            raise ValueError(f'over capacity ({self._length} + {bit_length} > {self._capacity} bits)')
+        start = self._length
+        self._length += bit_length
+        return start
+
+    def write(self, value: int, bit_length: int) -> 'BitWriter':
+        """
+        自然数を指定のビット数で書き込む
+
+        :param value: 書き込む自然数
+        :param bit_length: ビット数
+        :return: 自身
+        """
+        if value < 0:
+            raise ValueError(f'value must be greater than or equal to 0', value)
+        if value >> bit_length != 0:
+            raise ValueError(f'overflow ({value:b} : {bit_length} bits)', value, bit_length)
+        if bit_length == 0:
+            return self
+
+        start = self._advance(bit_length)
+        end = start + bit_length
+        first, last = start >> 3, (end + 7) >> 3
+
+        # バイト境界に揃えてから書き込む (書き込み位置以降は0のため、先頭のバイト以外はそのまま代入できる)
+        chunk = (value << ((last << 3) - end)).to_bytes(last - first, 'big')
+        self._buffer[first] |= chunk[0]
+        self._buffer[first+1:last] = chunk[1:]
+        return self
+
+    def write_arr(self, array: BinaryArray) -> 'BitWriter':
+        """
+        バイナリ形式の配列を書き込む
+
+        :param array: 書き込む配列
+        :return: 自身
+        """
+        bit_length = len(array)
+        if bit_length == 0:
+            return self
+        value = int.from_bytes(np.packbits(array).tobytes(), 'big') >> (-bit_length % 8)
+        return self.write(value, bit_length)
+
+    def write_zeros(self, bit_length: int) -> 'BitWriter':
+        """
+        0を指定のビット数だけ書き込む (容量を超える分は書き込まない)
+
+        終端パターンなどのように、容量が足りなければ省略できるものに使用する
+
+        :param bit_length: ビット数
+        :return: 自身
+        """
+        self._advance(min(bit_length, self.remaining))
+        return self
+
+    def pad_to_byte(self) -> 'BitWriter':
+        """
+        8ビットの倍数になるように0を書き込む (容量を超える分は書き込まない)
+
+        :return: 自身
+        """
+        return self.write_zeros(-self._length % 8)
+
+    def pad_codewords(self, patterns: Sequence[int]) -> 'BitWriter':
+        """
+        | 残りの容量をバイト単位のパターンで埋める (パターンは交互に繰り返す)
+        | 1バイトに満たない残りは0で埋める
+
+        :param patterns: 埋めるパターン
+        :return: 自身
+        """
+        codeword_num, remaining = divmod(self.remaining, 8)
+        for i in range(codeword_num):
+            self.write(patterns[i % len(patterns)], 8)
+        return self.write_zeros(remaining)
+
+    def to_bytes(self) -> bytes:
+        """
+        書き込んだデータをバイト列として取得する (末尾の1バイトに満たない部分は0で埋める)
+
+        :return: バイト列
+        """
+        return bytes(self._buffer[:(self._length + 7) // 8])
+
+    def to_arr(self) -> BinaryArray:
+        """
+        書き込んだデータをバイナリ形式の配列として取得する
+
+        :return: バイナリ形式の配列
+        """
+        return bytes2arr(self.to_bytes())[:self._length]
@@ -4,4 +4,5 @@
 
 from .polynomial_ring import F2Array, PolynomialRing
 from .residue_field import ResidueFieldOperator
-from .reed_solomon_code import ReedSolomonCode
+from .galois_field import GaloisField
+from .reed_solomon_code import ReedSolomonCode, calc_generator_polynomial
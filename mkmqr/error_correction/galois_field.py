@@ -0,0 +1,171 @@
+"""
+有限体 GF(2^m)を指数表・対数表で扱うためのファイル
+"""
+
+from typing import List, Tuple, Union
+
+from .polynomial_ring import PolynomialRing, F2Array
+
+
+class GaloisField:
+    """
+    有限体 GF(2^m)
+
+    元は多項式表現の自然数 (x^3 + x + 1 なら 0b1011) として扱う
+    原始元αのべき乗を事前に表にしておくことで、乗算・除算・逆元を定数時間で求める
+    """
+
+    def __init__(self, primitive_polynomial: Union[PolynomialRing, F2Array]):
+        """
+        :param primitive_polynomial: 原始多項式
+        """
+        if isinstance(primitive_polynomial, PolynomialRing):
+            primitive_polynomial = primitive_polynomial.coefficient
+        if primitive_polynomial < 2:
+            raise ValueError(f'degree of primitive polynomial must be greater than 0 ({primitive_polynomial:b})')
+
+        degree = primitive_polynomial.bit_length() - 1
+        size = 1 << degree
+        order = size - 1
+
+        # 指数表 (べき表現→多項式表現) と対数表 (多項式表現→べき表現)
+        # 指数表は2周期分用意し、対数の和をそのまま引けるようにする
+        exp_table: List[int] = [0] * (2 * order)
+        log_table: List[int] = [0] * size
+        x = 1
+        for e in range(order):
+            if e != 0 and x == 1:
+                raise ValueError(f'{primitive_polynomial:b} is not a primitive polynomial')
+            exp_table[e] = x
+            exp_table[e + order] = x
+            log_table[x] = e
+            x <<= 1
+            if x & size:
+                x ^= primitive_polynomial
+        if x != 1:
+            raise ValueError(f'{primitive_polynomial:b} is not a primitive polynomial')
+
+        self._primitive_polynomial = primitive_polynomial
+        self._degree = degree
+        self._order = order
+        self._exp_table: Tuple[int, ...] = tuple(exp_table)
+        self._log_table: Tuple[int, ...] = tuple(log_table)
+
+    @property
+    def primitive_polynomial(self) -> PolynomialRing:
+        """原始多項式"""
+        return PolynomialRing(self._primitive_polynomial)
+
+    @property
+    def degree(self) -> int:
+        """拡大次数 m"""
+        return self._degree
+
+    @property
+    def order(self) -> int:
+        """乗法群の位数 (2^m - 1)"""
+        return self._order
+
+    @property
+    def exp_table(self) -> Tuple[int, ...]:
+        """指数表 (exp_table[e] == α^e, 2周期分)"""
+        return self._exp_table
+
+    @property
+    def log_table(self) -> Tuple[int, ...]:
+        """対数表 (log_table[α^e] == e, log_table[0]は未定義)"""
+        return self._log_table
+
+    def _check(self, value: F2Array) -> None:
+        if not 0 <= value <= self._order:
+            raise ValueError(f'{value} is not an element of GF(2^{self._degree})')
+
+    def add(self, left: F2Array, right: F2Array) -> F2Array:
+        """
+        加算
+
+        :param left: 左オペランド
+        :param right: 右オペランド
+        :return: 和
+        """
+        return left ^ right
+
+    def sub(self, left: F2Array, right: F2Array) -> F2Array:
+        """
+        減算
+
+        :param left: 左オペランド
+        :param right: 右オペランド
+        :return: 差
+        """
+        return left ^ right
+
+    def mul(self, left: F2Array, right: F2Array) -> F2Array:
+        """
+        乗算
+
+        :param left: 左オペランド
+        :param right: 右オペランド
+        :return: 積
+        """
+        if left == 0 or right == 0:
+            return 0
+        return self._exp_table[self._log_table[left] + self._log_table[right]]
+
+    def div(self, left: F2Array, right: F2Array) -> F2Array:
+        """
+        除算
+
+        :param left: 左オペランド
+        :param right: 右オペランド
+        :return: 商
+        """
+        if right == 0:
+            raise ZeroDivisionError()
+        if left == 0:
+            return 0
+        return self._exp_table[self._log_table[left] - self._log_table[right] + self._order]
+
+    def inv(self, value: F2Array) -> F2Array:
+        """
+        逆元
+
+        :param value: オペランド
+        :return: 逆元
+        """
+        if value == 0:
+            raise ZeroDivisionError()
+        return self._exp_table[self._order - self._log_table[value]]
+
+    def from_exp(self, exp: int) -> F2Array:
+        """
+        べき表現から体の元を取得する
+
+        :param exp: べき表現
+        :return: 対応する体の元 (多項式表現)
+        """
+        return self._exp_table[exp % self._order]
+
+    def to_exp(self, value: F2Array) -> int:
+        """
+        体の元をべき表現に変換する
+
+        :param value: 体の元 (多項式表現)
+        :return: べき表現
+        """
+        if value == 0:
+            raise ValueError('0 cannot be expressed as a power of the primitive element')
+        self._check(value)
+        return self._log_table[value]
+
+    def from_coefficient(self, coefficient: F2Array) -> F2Array:
+        """
+        多項式表現から体の元を取得する
+
+        :param coefficient: 多項式表現
+        :return: 対応する体の元
+        """
+        return (PolynomialRing(coefficient) % PolynomialRing(self._primitive_polynomial)).coefficient
+
+    def __repr__(self):
+        return f'GaloisField({bin(self._primitive_polynomial)})'
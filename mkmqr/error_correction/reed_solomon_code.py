@@ -2,37 +2,110 @@
 RS符号を計算するためのファイル
 """
 
-from .polynomial_ring import PolynomialRing
+from ..binary import ByteArray, to_byte_arr, empty_byte_arr
+from .galois_field import GaloisField
+from .polynomial_ring import PolynomialRing, F2Array
 from .residue_field import ResidueFieldOperator
-from typing import List, Union
+from typing import List, Sequence, Tuple, Union
+
+
+def calc_generator_polynomial(field: GaloisField, degree: int) -> List[F2Array]:
+    """
+    生成多項式 (x - α^0)(x - α^1)...(x - α^(degree-1)) を展開して求める
+
+    :param field: 係数の属する有限体
+    :param degree: 生成多項式の次数
+    :return: 生成多項式 (高次 gp[0] ← ... → gp[-1] 低次)
+    """
+    if degree < 0:
+        raise ValueError('degree must be greater than or equal to 0', degree)
+
+    gp = [1]
+    for i in range(degree):
+        # (x - α^i)を掛ける (有限体F2[x]/(p)では減算も加算もXORに相当)
+        root = field.from_exp(i)
+        gp = [a ^ field.mul(b, root) for a, b in zip(gp + [0], [0] + gp)]
+    return gp
 
 
 class ReedSolomonCode:
-    """RS符号を計算するクラス"""
+    """
+    RS符号を計算するクラス
+
+    | 生成多項式の係数と各バイトの積を事前に表にしておくため、生成後は変更できない
+    | (generator_polynomial, rf_op は以前と同じ型で参照できるが、読み取り専用となった)
+    """
 
     def __init__(
             self,
-            primitive_polynomial: Union[PolynomialRing, ResidueFieldOperator],
-            generator_polynomial: List[PolynomialRing]
+            primitive_polynomial: Union[PolynomialRing, ResidueFieldOperator, GaloisField],
+            generator_polynomial: Sequence[Union[PolynomialRing, F2Array]]
     ):
         """
-        :param primitive_polynomial: 原始多項式
+        :param primitive_polynomial: 原始多項式 (あるいは計算に使用する有限体)
         :param generator_polynomial: 生成多項式 (高次 gp[0] ← ... → gp[-1] 低次)
         """
-        if isinstance(primitive_polynomial, PolynomialRing):
-            rf_op = ResidueFieldOperator(primitive_polynomial)
-        else:
+        if isinstance(primitive_polynomial, GaloisField):
+            field = primitive_polynomial
+            rf_op = ResidueFieldOperator(field.primitive_polynomial)
+        elif isinstance(primitive_polynomial, ResidueFieldOperator):
+            field = GaloisField(primitive_polynomial.primitive_polynomial)
             rf_op = primitive_polynomial
+        else:
+            field = GaloisField(primitive_polynomial)
+            rf_op = ResidueFieldOperator(primitive_polynomial)
+
+        gp = tuple(
+            g.coefficient if isinstance(g, PolynomialRing) else g
+            for g in generator_polynomial
+        )
+        if len(gp) < 2:
+            raise ValueError('degree of generator polynomial must be greater than 0')
+        if gp[0] == 0:
+            raise ValueError('leading coefficient of generator polynomial must not be 0')
+
+        self._field = field
+        self._rf_op = rf_op
+        self._generator_polynomial = gp
 
-        self.rf_op = rf_op
-        """剰余体の計算補助"""
-        self.generator_polynomial = generator_polynomial
-        """生成多項式"""
+        # 商の最高次の係数(=剰余の先頭と入力の和)ごとに、差し引く値を表にしておく
+        # mul_table[lead][j] == (lead / gp[0]) * gp[j+1]
+        self._mul_table = tuple(
+            tuple(field.mul(field.div(lead, gp[0]), g) for g in gp[1:])
+            for lead in range(field.order + 1)
+        )
+        # 一括処理用 (係数が1バイトに収まる場合のみ)
+        self._mul_table_arr = to_byte_arr(self._mul_table) if field.degree <= 8 else None
+
+    @property
+    def field(self) -> GaloisField:
+        """有限体の計算補助"""
+        return self._field
+
+    @property
+    def rf_op(self) -> ResidueFieldOperator:
+        """剰余体の計算補助 (互換性のため残している。計算にはfieldを使用する)"""
+        return self._rf_op
+
+    @property
+    def generator_polynomial(self) -> List[PolynomialRing]:
+        """生成多項式 (高次 gp[0] ← ... → gp[-1] 低次)"""
+        return [PolynomialRing(g) for g in self._generator_polynomial]
+
+    @property
+    def generator_coefficients(self) -> Tuple[F2Array, ...]:
+        """生成多項式の係数 (多項式表現) (高次 gp[0] ← ... → gp[-1] 低次)"""
+        return self._generator_polynomial
 
     @property
     def primitive_polynomial(self):
         """原始多項式"""
-        return self.rf_op.primitive_polynomial
+        return self._field.primitive_polynomial
+
+    @property
+    def degree(self) -> int:
+        """生成多項式の次数 (=誤り訂正コード語の数)"""
+        return len(self._generator_polynomial) - 1
 
     def encode(self, data: List[PolynomialRing]) -> List[PolynomialRing]:
         """
@@ -41,9 +114,8 @@ class ReedSolomonCode:
         :param data: RS符号を求めるデータ
         :return: 求めたRS符号
         """
-        n = len(self.generator_polynomial) - 1
-        trail = [PolynomialRing(0) for _ in range(n)]
-        return self.encode_raw(data + trail)
+        ecc = self.encode_coefficient([d.coefficient for d in data])
+        return [PolynomialRing(e) for e in ecc]
 
     def encode_raw(self, data: List[PolynomialRing]) -> List[PolynomialRing]:
         """
@@ -52,14 +124,71 @@ class ReedSolomonCode:
         :param data: RS符号を求めるデータ
         :return: 求めたRS符号
         """
-        temp = data.copy()
+        ecc = self.encode_raw_coefficient([d.coefficient for d in data])
+        return [PolynomialRing(e) for e in ecc]
+
+    def encode_coefficient(self, data: Sequence[F2Array]) -> List[F2Array]:
+        """
+        多項式表現のまま符号化を行う (計算前に自動で桁をシフトする)
+
+        :param data: RS符号を求めるデータ
+        :return: 求めたRS符号
+        """
+        # 線形帰還シフトレジスタの要領で、1係数ごとに剰余を更新していく
+        mul_table = self._mul_table
+        remainder = [0] * self.degree
+        for d in data:
+            row = mul_table[d ^ remainder[0]]
+            remainder = [r ^ m for r, m in zip(remainder[1:] + [0], row)]
+        return remainder
+
+    def encode_raw_coefficient(self, data: Sequence[F2Array]) -> List[F2Array]:
+        """
+        多項式表現のまま符号化を行う (計算前に桁をシフトしない)
+
+        :param data: RS符号を求めるデータ
+        :return: 求めたRS符号
+        """
+        n = self.degree
+        if len(data) < n:  # 除数より次数が低いため、データがそのまま剰余となる (以前と同じく桁は揃えない)
+            return list(data)
+
+        # 下位n桁は除数より次数が低いため、そのまま剰余に加わる
+        head, trail = data[:len(data)-n], data[len(data)-n:]
+        return [r ^ t for r, t in zip(self.encode_coefficient(head), trail)]
+
+    def encode_bytes(self, data: bytes) -> bytes:
+        """
+        バイト列のまま符号化を行う (計算前に自動で桁をシフトする)
+
+        :param data: RS符号を求めるデータ (1バイトが1係数)
+        :return: 求めたRS符号
+        """
+        if self._field.degree > 8:
+            raise ValueError(f'byte encoding supports only GF(2^m) with m <= 8 ({self._field})')
+        return bytes(self.encode_coefficient(data))
+
+    def encode_batch(self, data: ByteArray) -> ByteArray:
+        """
+        複数のデータをまとめて符号化を行う (計算前に自動で桁をシフトする)
+
+        同じ生成多項式を使う多数のデータについて、列ごとにまとめて剰余を更新する
+
+        :param data: RS符号を求めるデータ (データ数N × コード語数kのバイト単位の配列)
+        :return: 求めたRS符号 (データ数N × 誤り訂正コード語数のバイト単位の配列)
+        """
+        if self._mul_table_arr is None:
+            raise ValueError(f'batch encoding supports only GF(2^m) with m <= 8 ({self._field})')
 
-        # 筆算のように最高次から順番に引いていく
-        for i in range(len(temp) - len(self.generator_polynomial) + 1):
-            # 商を求める (最高次は1のはずだが、一応割る)
-            q = temp[i] / self.generator_polynomial[0]
-            for j in range(len(self.generator_polynomial)):
-                temp[i+j] = self.rf_op.sub(temp[i+j], q * self.generator_polynomial[j])
+        data = to_byte_arr(data)
+        if data.ndim != 2:
+            raise ValueError(f'data must be 2-dimensional, but it is {data.ndim}-dimensional', data)
 
-        # 剰余だけ取り出す
-        return temp[-(len(self.generator_polynomial)-1):]
+        mul_table = self._mul_table_arr
+        remainder = empty_byte_arr((data.shape[0], self.degree))
+        for column in data.T:
+            lead = column ^ remainder[:, 0]
+            remainder[:, :-1] = remainder[:, 1:]
+            remainder[:, -1] = 0
+            remainder ^= mul_table[lead]
+        return remainder
@@ -4,6 +4,8 @@
 
 # データの解析
 from .segment import (
+    write_data_segment,
+    write_text_segment,
     data2segment,
     text2segment,
 )
@@ -13,6 +15,33 @@ from .symbol import (
     add_quiet_zone,
     segment2symbol_matrix,
     create_symbol_matrix,
+    symbol_matrix2raster,
     symbol_matrix2image,
     create_symbol_image,
 )
+
+# PNGの書き出し
+from .png import (
+    write_symbol_png,
+    write_raster_png,
+    symbol_matrix2png,
+)
+
+# SVGの書き出し
+from .svg import (
+    symbol_matrix2path,
+    symbol_matrix2svg,
+)
+
+# プリンターのコマンド
+from .printer import (
+    symbol_matrix2zpl,
+    symbol_matrix2zpl_label,
+    symbol_matrix2escpos,
+)
+
+# シートへの配置
+from .sheet import (
+    get_sheet_shape,
+    create_sheet_raster,
+)
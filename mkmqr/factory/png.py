@@ -0,0 +1,133 @@
+"""
+マイクロQRコードの行列を、PILを使わずに1ビットグレースケールのPNGとして書き出すプログラム
+
+参考：
+`PNG (Portable Network Graphics) Specification <https://www.w3.org/TR/png/>`_
+"""
+
+import struct
+import zlib
+from io import BytesIO
+from typing import BinaryIO, Iterable, Iterator
+
+from ..binary import BinaryMatrix, empty_matrix, render_raster_rows, pack_scanlines
+
+_signature = b'\x89PNG\r\n\x1a\n'
+_idat_size = 1 << 16
+"""IDATチャンクに溜めるバイト数の目安"""
+_raster_block_rows = 256
+"""画素の配列をまとめて走査線に変換する行数"""
+
+
+def _write_chunk(file: BinaryIO, chunk_type: bytes, data: bytes) -> None:
+    """
+    チャンク (長さ, 種類, データ, CRC) を書き込む
+
+    :param file: 書き込み先
+    :param chunk_type: チャンクの種類
+    :param data: データ
+    """
+    file.write(struct.pack('>I', len(data)))
+    file.write(chunk_type)
+    file.write(data)
+    file.write(struct.pack('>I', zlib.crc32(data, zlib.crc32(chunk_type))))
+
+
+def _write_png(file: BinaryIO, width: int, height: int, scanlines: Iterable[bytes], compress_level: int) -> None:
+    """
+    走査線を圧縮して、1ビットグレースケールのPNGを書き込む
+
+    | 圧縮したデータは一定量ごとにIDATチャンクとして書き込む
+
+    :param file: 書き込み先
+    :param width: 幅
+    :param height: 高さ
+    :param scanlines: フィルタの種類を付けた走査線 (複数行をまとめたものでもよい)
+    :param compress_level: zlibの圧縮レベル (0～9)
+    """
+    file.write(_signature)
+    _write_chunk(file, b'IHDR', struct.pack('>IIBBBBB', width, height, 1, 0, 0, 0, 0))  # ビット深度1, グレースケール
+
+    compressor = zlib.compressobj(compress_level)
+    buffer = bytearray()
+    for scanline in scanlines:
+        buffer.extend(compressor.compress(scanline))
+        if len(buffer) >= _idat_size:
+            _write_chunk(file, b'IDAT', bytes(buffer))
+            buffer.clear()
+
+    buffer.extend(compressor.flush())
+    _write_chunk(file, b'IDAT', bytes(buffer))
+    _write_chunk(file, b'IEND', b'')
+
+
+def write_symbol_png(
+        file: BinaryIO, matrix: BinaryMatrix, module_size: int = 10, quiet_zone: int = 2, compress_level: int = 6
+) -> None:
+    """
+    マイクロQRコードの行列を1ビットグレースケールのPNGとして書き込む
+
+    | 行列の各行について走査線 (フィルタなし) を1度だけ作り、モジュールの大きさの分だけ繰り返して圧縮する
+
+    :param file: 書き込み先 (バイナリモードのファイルオブジェクト)
+    :param matrix: 行列
+    :param module_size: 1セルあたりのピクセル数
+    :param quiet_zone: クワイエットゾーンの幅 (2以上を推奨)
+    :param compress_level: zlibの圧縮レベル (0～9)
+    """
+    if module_size < 1:
+        raise ValueError('module_size must be greater than 0', module_size)
+    if quiet_zone < 0:
+        raise ValueError('quiet_zone must be greater than or equal to 0', quiet_zone)
+
+    h, w = matrix.shape
+    width = (w + 2 * quiet_zone) * module_size
+    height = (h + 2 * quiet_zone) * module_size
+
+    # 走査線 (先頭はフィルタの種類0)
+    scanlines = pack_scanlines(render_raster_rows(matrix, module_size, quiet_zone), b'\x00')
+    blank, = pack_scanlines(render_raster_rows(empty_matrix((1, w)), module_size, quiet_zone), b'\x00')
+
+    def generate() -> Iterator[bytes]:
+        yield from [blank] * (quiet_zone * module_size)
+        for scanline in scanlines:
+            yield from [scanline] * module_size
+        yield from [blank] * (quiet_zone * module_size)
+
+    _write_png(file, width, height, generate(), compress_level)
+
+
+def write_raster_png(file: BinaryIO, raster: BinaryMatrix, compress_level: int = 6) -> None:
+    """
+    画素の配列を1ビットグレースケールのPNGとして書き込む
+
+    | 一定の行数ごとに走査線に変換して圧縮するため、メモリマップトファイルの巨大な配列も少しずつ読み込んで書き込める
+
+    :param file: 書き込み先 (バイナリモードのファイルオブジェクト)
+    :param raster: 画素の配列 (Trueが白、Falseが黒)
+    :param compress_level: zlibの圧縮レベル (0～9)
+    """
+    height, width = raster.shape
+
+    def generate() -> Iterator[bytes]:
+        for begin in range(0, height, _raster_block_rows):
+            yield b''.join(pack_scanlines(raster[begin:begin + _raster_block_rows], b'\x00'))  # 各行の先頭にフィルタの種類0
+
+    _write_png(file, width, height, generate(), compress_level)
+
+
+def symbol_matrix2png(
+        matrix: BinaryMatrix, module_size: int = 10, quiet_zone: int = 2, compress_level: int = 6
+) -> bytes:
+    """
+    マイクロQRコードの行列から1ビットグレースケールのPNGを生成
+
+    :param matrix: 行列
+    :param module_size: 1セルあたりのピクセル数
+    :param quiet_zone: クワイエットゾーンの幅 (2以上を推奨)
+    :param compress_level: zlibの圧縮レベル (0～9)
+    :return: PNGのバイト列
+    """
+    file = BytesIO()
+    write_symbol_png(file, matrix, module_size, quiet_zone, compress_level)
+    return file.getvalue()
@@ -0,0 +1,170 @@
+"""
+マイクロQRコードの行列から、ラベルプリンター・レシートプリンターのラスタ画像のコマンドを生成するプログラム
+
+| いずれのコマンドもビットが1のドットを印字する (暗モジュールが1)
+"""
+
+import re
+import struct
+from functools import lru_cache
+from typing import List, Tuple
+
+from ..binary import (
+    BinaryMatrix,
+    ByteArray,
+    toggle_matrix,
+    render_raster,
+    render_raster_rows,
+    pack_raster,
+    pack_scanlines,
+)
+
+_zpl_run = re.compile(r'(.)\1{2,}')
+"""圧縮すると短くなる、同じ文字の連続 (3文字以上)"""
+
+
+def _symbol_matrix2lines(matrix: BinaryMatrix, dot_size: int, quiet_zone: int) -> List[bytes]:
+    """
+    行列の各行を、1ドット1ビットでバイト単位に詰めた1ドット分の行に変換する (1が印字、行末の余りは0)
+
+    :param matrix: 行列
+    :param dot_size: 1セルあたりのドット数
+    :param quiet_zone: クワイエットゾーンの幅
+    :return: ドットの行の一覧 (行列の高さの分)
+    """
+    if dot_size < 1:
+        raise ValueError('dot_size must be greater than 0', dot_size)
+    if quiet_zone < 0:
+        raise ValueError('quiet_zone must be greater than or equal to 0', quiet_zone)
+
+    return pack_scanlines(toggle_matrix(render_raster_rows(matrix, dot_size, quiet_zone)))
+
+
+def _symbol_matrix2dots(matrix: BinaryMatrix, dot_size: int, quiet_zone: int) -> ByteArray:
+    """
+    行列を、1ドット1ビットで行ごとにバイト単位に詰めたドットの配列に変換する (1が印字、行末の余りは0)
+
+    :param matrix: 行列
+    :param dot_size: 1セルあたりのドット数
+    :param quiet_zone: クワイエットゾーンの幅
+    :return: ドットの配列 (高さ × 1行あたりのバイト数)
+    """
+    if dot_size < 1:
+        raise ValueError('dot_size must be greater than 0', dot_size)
+    if quiet_zone < 0:
+        raise ValueError('quiet_zone must be greater than or equal to 0', quiet_zone)
+
+    return pack_raster(toggle_matrix(render_raster(matrix, dot_size, quiet_zone)))
+
+
+# region ZPL
+@lru_cache(maxsize=None)
+def _zpl_repeat(char: str, count: int) -> str:
+    """
+    ZPLの圧縮形式で、同じ文字の繰り返しを表す
+
+    | 繰り返し回数は G～Y (1～19) と g～z (20～400) の和で表す
+
+    :param char: 文字
+    :param count: 繰り返し回数
+    :return: 圧縮した文字列
+    """
+    chunks: List[str] = []
+    while count > 0:
+        n = min(count, 419)
+        count -= n
+        if n == 1:
+            chunks.append(char)
+            continue
+        high, low = divmod(n, 20)
+        prefix = (chr(ord('f') + high) if high else '') + (chr(ord('F') + low) if low else '')
+        chunks.append(prefix + char)
+    return ''.join(chunks)
+
+
+def _zpl_compress_row(row: str) -> str:
+    """
+    ZPLの圧縮形式で1行分の16進数を表す
+
+    | 行末の0の連続は ','、Fの連続は '!' で表す
+
+    :param row: 1行分の16進数
+    :return: 圧縮した文字列
+    """
+    suffix = ''
+    if row.endswith('0'):
+        row, suffix = row.rstrip('0'), ','
+    elif row.endswith('F'):
+        row, suffix = row.rstrip('F'), '!'
+
+    return _zpl_run.sub(lambda m: _zpl_repeat(m.group(1), m.end() - m.start()), row) + suffix
+
+
+def symbol_matrix2zpl(matrix: BinaryMatrix, dot_size: int = 4, quiet_zone: int = 2, compress: bool = True) -> str:
+    """
+    マイクロQRコードの行列から、ZPLのグラフィックフィールド (^GF) を生成
+
+    | データは16進数 (形式A) で、compressがTrueならZPLの圧縮形式で表す
+    | 圧縮する場合はモジュールの行ごとに1度だけ圧縮し、残りのドット数分の行は ':' (直前の行と同じ) で表す
+
+    :param matrix: 行列
+    :param dot_size: 1セルあたりのドット数
+    :param quiet_zone: クワイエットゾーンの幅 (2以上を推奨)
+    :param compress: 圧縮するか？
+    :return: ^GFコマンド
+    """
+    if not compress:
+        dots = _symbol_matrix2dots(matrix, dot_size, quiet_zone)
+        height, row_bytes = dots.shape
+        total = height * row_bytes
+        return f'^GFA,{total},{total},{row_bytes},{dots.tobytes().hex().upper()}'
+
+    lines = _symbol_matrix2lines(matrix, dot_size, quiet_zone)
+    row_bytes = len(lines[0])
+    total = (matrix.shape[0] + 2 * quiet_zone) * dot_size * row_bytes
+
+    margin = [','] + [':'] * (quiet_zone * dot_size - 1) if quiet_zone > 0 else []  # クワイエットゾーンの行 (全て0)
+    data: List[str] = list(margin)
+    prev = ',' if margin else None
+    for line in lines:
+        row = _zpl_compress_row(line.hex().upper())
+        data.append(':' if row == prev else row)
+        data.extend(':' * (dot_size - 1))
+        prev = row
+    data.extend(margin)
+    return f'^GFA,{total},{total},{row_bytes},{"".join(data)}'
+
+
+def symbol_matrix2zpl_label(
+        matrix: BinaryMatrix, dot_size: int = 4, quiet_zone: int = 2, origin: Tuple[int, int] = (0, 0)
+) -> str:
+    """
+    マイクロQRコードの行列から、ZPLのラベル (^XA～^XZ) を生成
+
+    :param matrix: 行列
+    :param dot_size: 1セルあたりのドット数
+    :param quiet_zone: クワイエットゾーンの幅 (2以上を推奨)
+    :param origin: 印字する位置 (x, y) (ドット)
+    :return: ラベルのコマンド
+    """
+    x, y = origin
+    return f'^XA^FO{x},{y}{symbol_matrix2zpl(matrix, dot_size, quiet_zone)}^FS^XZ'
+# endregion
+
+
+# region ESC/POS
+def symbol_matrix2escpos(matrix: BinaryMatrix, dot_size: int = 4, quiet_zone: int = 2) -> bytes:
+    """
+    マイクロQRコードの行列から、ESC/POSのラスタービットイメージ (GS v 0) を生成
+
+    :param matrix: 行列
+    :param dot_size: 1セルあたりのドット数
+    :param quiet_zone: クワイエットゾーンの幅 (2以上を推奨)
+    :return: GS v 0コマンド (通常モード)
+    """
+    dots = _symbol_matrix2dots(matrix, dot_size, quiet_zone)
+    height, row_bytes = dots.shape
+    if row_bytes > 0xFFFF or height > 0xFFFF:
+        raise ValueError(f'image is too large ({row_bytes} bytes x {height} dots)', dot_size)
+    return b'\x1dv0\x00' + struct.pack('<HH', row_bytes, height) + dots.tobytes()
+# endregion
@@ -4,18 +4,56 @@
 
 from logging import getLogger
 
-from ..binary import concat_arr, BinaryArray, arr2str
-from ..model import Version, Mode, values
+from ..binary import BinaryArray, BitWriter, arr2str
+from ..model import Version, Mode, values, OverCapacityError
 
 logger = getLogger(__name__)
 
 
+def write_data_segment(
+        writer: BitWriter, version: Version, mode: Mode, data: BinaryArray, character_count: int
+) -> None:
+    """
+    2進データをセグメントとして書き込む
+
+    :param writer: 書き込み先
+    :param version: 型番
+    :param mode: モード
+    :param data: 2進データ
+    :param character_count: 文字数
+    """
+    mi_len = version.mode_indicator_length
+    cci_len = values.get_character_count_indicator_length(version, mode)
+    if character_count >> cci_len != 0:
+        raise OverCapacityError(f'character count ({character_count}) is over {cci_len}-bit', character_count)
+
+    logger.debug(f'segment: (mi: {mode.mode_indicator_value}/{mi_len}bits)(cci: {character_count}/{cci_len}bits)'
+                 f'(data: {arr2str(data)})')
+    writer.write(mode.mode_indicator_value, mi_len)
+    writer.write(character_count, cci_len)
+    writer.write_arr(data)
+
+
+def write_text_segment(writer: BitWriter, version: Version, mode: Mode, text: str) -> None:
+    """
+    テキストをセグメントとして書き込む
+
+    :param writer: 書き込み先
+    :param version: 型番
+    :param mode: モード
+    :param text: テキスト
+    """
+    data = mode.encode(text)
+    cc = mode.character_count(text)
+    write_data_segment(writer, version, mode, data, cc)
+
+
 def data2segment(version: Version, mode: Mode, data: BinaryArray, character_count: int) -> BinaryArray:
     """2進データをセグメントに変換"""
-    mi = values.get_mode_indicator(version, mode)
-    cci = values.get_character_count_indicator(version, mode, character_count)
-    logger.debug(f'segment: (mi: {arr2str(mi)})(cci: {arr2str(cci)})(data: {arr2str(data)})')
-    return concat_arr([mi, cci, data])
+    seg_len = version.mode_indicator_length + values.get_character_count_indicator_length(version, mode) + len(data)
+    writer = BitWriter(seg_len)
+    write_data_segment(writer, version, mode, data, character_count)
+    return writer.to_arr()
 
 
 def text2segment(version: Version, mode: Mode, text: str) -> BinaryArray:
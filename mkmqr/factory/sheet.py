@@ -0,0 +1,70 @@
+"""
+複数のマイクロQRコードを、格子状に並べて1枚の画素の配列に描画するプログラム
+"""
+
+from typing import List, Sequence, Tuple, Union
+
+from .symbol import create_symbol_matrix
+from ..binary import BinaryMatrix, allocate_raster, flush_raster, render_raster
+from ..model import ErrorCorrectionLevel as ECL
+
+
+def get_sheet_shape(count: int, columns: int, cell_size: int) -> Tuple[int, int]:
+    """
+    シートの画素の配列の形状を求める
+
+    :param count: シンボルの数
+    :param columns: 列数
+    :param cell_size: 1つのシンボルに割り当てる区画の一辺のピクセル数
+    :return: (高さ, 幅)
+    """
+    if columns < 1:
+        raise ValueError('columns must be greater than 0', columns)
+    rows = -(-count // columns)
+    return rows * cell_size, columns * cell_size
+
+
+def create_sheet_raster(
+        symbols: Sequence[Union[str, BinaryMatrix]], columns: int, module_size: int = 10, quiet_zone: int = 2,
+        cell_size: int = None, ecl: ECL = ECL.NONE, path: str = None
+) -> BinaryMatrix:
+    """
+    複数のマイクロQRコードを、格子状に並べて1枚の画素の配列に描画する
+
+    | シートの配列を1度だけ確保し、各シンボルは区画のビューへ直接描画する (シンボルごとの画像は作らない)
+    | シンボルは区画の左上に描画し、区画の残りは白で埋める
+    | pathを指定すると、シートを.npy形式のメモリマップトファイルとして確保する (巨大なシート向け)
+
+    :param symbols: テキストまたはマイクロQRコードの行列の一覧 (左上から行ごとに並べる)
+    :param columns: 列数
+    :param module_size: 1セルあたりのピクセル数
+    :param quiet_zone: クワイエットゾーンの幅 (2以上を推奨)
+    :param cell_size: 1つのシンボルに割り当てる区画の一辺のピクセル数 (省略すると最大のシンボルの大きさ)
+    :param ecl: テキストから作成する場合の誤り訂正レベル
+    :param path: メモリマップトファイルのパス (省略するとメモリ上に確保する)
+    :return: シートの画素の配列 (Trueが白、Falseが黒)
+    """
+    matrices: List[BinaryMatrix] = [
+        create_symbol_matrix(symbol, ecl) if isinstance(symbol, str) else symbol for symbol in symbols
+    ]
+    sizes = [(matrix.shape[0] + 2 * quiet_zone) * module_size for matrix in matrices]
+    if cell_size is None:
+        cell_size = max(sizes, default=0)
+    elif any(size > cell_size for size in sizes):
+        raise ValueError(f'cell_size must be greater than or equal to {max(sizes)}', cell_size)
+
+    sheet = allocate_raster(get_sheet_shape(len(matrices), columns, cell_size), path)
+
+    for i, (matrix, size) in enumerate(zip(matrices, sizes)):
+        row, col = divmod(i, columns)
+        top, left = row * cell_size, col * cell_size
+        render_raster(matrix, module_size, quiet_zone, sheet[top:top + size, left:left + size])
+        sheet[top:top + size, left + size:left + cell_size] = True  # 区画の右の余り
+        sheet[top + size:top + cell_size, left:left + cell_size] = True  # 区画の下の余り
+
+    rest = len(matrices) % columns
+    if rest:  # 最終行の空いた区画
+        sheet[-cell_size:, rest * cell_size:] = True
+
+    flush_raster(sheet)
+    return sheet
@@ -0,0 +1,72 @@
+"""
+マイクロQRコードの行列を、ラスタライズせずにSVGとして書き出すプログラム
+"""
+
+from typing import List, Optional
+
+from ..binary import BinaryMatrix, matrix_runs
+
+
+def symbol_matrix2path(matrix: BinaryMatrix, quiet_zone: int = 2) -> str:
+    """
+    マイクロQRコードの行列から、暗モジュールを描くSVGのパスデータを生成
+
+    | 各行の連続する暗モジュールを1本の水平線 (太さ1モジュール) にまとめる
+    | 座標の単位はモジュールで、線の中心はモジュールの中央を通る (stroke-width="1"で描画する)
+    | 同じ行の2本目以降の線は、直前の線の終点からの相対座標で移動する
+
+    :param matrix: 行列
+    :param quiet_zone: クワイエットゾーンの幅 (2以上を推奨)
+    :return: パスデータ
+    """
+    if quiet_zone < 0:
+        raise ValueError('quiet_zone must be greater than or equal to 0', quiet_zone)
+
+    commands: List[str] = []
+    row = prev_end = None
+    for y, begin, end in matrix_runs(matrix):  # 各行の暗モジュールの連続区間 [begin, end)
+        if y != row:
+            commands.append(f'M{begin + quiet_zone} {y + quiet_zone + .5:g}')
+            row = y
+        else:
+            commands.append(f'm{begin - prev_end} 0')
+        commands.append(f'h{end - begin}')
+        prev_end = end
+    return ''.join(commands)
+
+
+def symbol_matrix2svg(
+        matrix: BinaryMatrix, scale: float = 10, quiet_zone: int = 2, unit: str = '',
+        dark: str = '#000', light: Optional[str] = '#fff'
+) -> str:
+    """
+    マイクロQRコードの行列からSVGを生成
+
+    | viewBoxの単位はモジュールとし、画像の大きさはscaleとunitで指定する
+
+    :param matrix: 行列
+    :param scale: 1セルあたりの大きさ
+    :param quiet_zone: クワイエットゾーンの幅 (2以上を推奨)
+    :param unit: 大きさの単位 (例えば'mm'、省略するとピクセル)
+    :param dark: 暗モジュールの色
+    :param light: 明モジュールとクワイエットゾーンの色 (Noneなら透明)
+    :return: SVGの文字列
+    """
+    if scale <= 0:
+        raise ValueError('scale must be greater than 0', scale)
+
+    path = symbol_matrix2path(matrix, quiet_zone)
+    h, w = matrix.shape
+    width = w + 2 * quiet_zone
+    height = h + 2 * quiet_zone
+
+    elements = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width * scale:g}{unit}" height="{height * scale:g}{unit}"'
+        f' viewBox="0 0 {width} {height}" shape-rendering="crispEdges">'
+    ]
+    if light is not None:
+        elements.append(f'<path fill="{light}" d="M0 0h{width}v{height}H0z"/>')
+    if path:
+        elements.append(f'<path fill="none" stroke="{dark}" stroke-width="1" d="{path}"/>')
+    elements.append('</svg>')
+    return ''.join(elements)
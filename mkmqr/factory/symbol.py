@@ -3,14 +3,16 @@
 """
 
 from logging import getLogger
+from typing import TYPE_CHECKING
 
-from PIL import Image
-
-from ..binary import BinaryMatrix, merge_matrix, empty_matrix, toggle_matrix, BinaryArray
-from ..matrix import segment2matrix, get_optimal_mask, get_format_information_matrix, get_function_pattern_matrix
+from ..binary import BinaryMatrix, empty_matrix, toggle_matrix, BinaryArray, render_raster
+from ..matrix import segment2bits, get_optimal_mask_bits, get_template_bits
 from ..model import Version, ErrorCorrectionLevel as ECL
 from ..optimization import analyze_text
 
+if TYPE_CHECKING:
+    from PIL import Image  # 画像が必要になるまで読み込まない
+
 logger = getLogger(__name__)
 
 
@@ -41,29 +43,47 @@ def segment2symbol_matrix(version: Version, ecl: ECL, segment: BinaryArray) -> B
     :param segment: セグメント
     :return: マイクロQRコードの行列
     """
-    mat_codeword = segment2matrix(version, ecl, segment)
-    mask, mat_mask = get_optimal_mask(mat_codeword)
-    mat_fi = get_format_information_matrix(version, ecl, mask)
-    mat_fp = get_function_pattern_matrix(version)
+    code = segment2bits(version, ecl, segment)  # 行列への変換は最後の1回のみ
+    mask, mask_bits = get_optimal_mask_bits(code)
+    code ^= mask_bits  # マスクしたコード語列
+    code ^= get_template_bits(version, ecl, mask)  # 機能パターンと形式情報
+    return code.to_matrix()
 
-    code = merge_matrix([mat_fp, mat_fi, mat_codeword, mat_mask])
-    return code
 
+def symbol_matrix2raster(matrix: BinaryMatrix, module_size: int = 10, quiet_zone: int = 2) -> BinaryMatrix:
+    """
+    マイクロQRコードの行列から画素の配列を生成
 
-def symbol_matrix2image(matrix: BinaryMatrix, size: int = None, quiet_zone: int = 2) -> Image.Image:
+    :param matrix: 行列
+    :param module_size: 1セルあたりのピクセル数
+    :param quiet_zone: クワイエットゾーンの幅 (2以上を推奨)
+    :return: 画素の配列 (Trueが白、Falseが黒)
+    """
+    return render_raster(matrix, module_size, quiet_zone)
+
+
+def symbol_matrix2image(matrix: BinaryMatrix, size: int = None, quiet_zone: int = 2) -> 'Image.Image':
     """
     マイクロQRコードの行列から画像を生成
 
+    画像の一辺がセル数で割り切れる場合は、拡大後の画素の配列を直接描画する (PILでの拡大を行わない)
+
     :param matrix: 行列
     :param size: 画像の一辺のピクセル数 (省略すると1セルが10ピクセルとなるサイズ)
     :param quiet_zone: クワイエットゾーンの幅 (2以上を推奨)
-    :return: 画像
+    :return: 画像 (モード'1')
     """
+    from PIL import Image
+
+    cells = matrix.shape[0] + 2 * quiet_zone
+    if size is None:
+        size = cells * 10
+    if size % cells == 0:
+        return Image.fromarray(symbol_matrix2raster(matrix, size // cells, quiet_zone))
+
     matrix = add_quiet_zone(matrix, quiet_zone)
     matrix = toggle_matrix(matrix)
     img = Image.fromarray(matrix)
-    if size is None:
-        size = img.height * 10
     img = img.resize((size, size), resample=Image.Resampling.NEAREST)  # PIL 9.1.0から変更
     return img
 
@@ -85,7 +105,7 @@ def create_symbol_matrix(text: str, ecl: ECL = ECL.NONE) -> BinaryMatrix:
     return segment2symbol_matrix(version, ecl, segment)
 
 
-def create_symbol_image(text: str, ecl: ECL = ECL.NONE, size: int = None) -> Image.Image:
+def create_symbol_image(text: str, ecl: ECL = ECL.NONE, size: int = None) -> 'Image.Image':
     """
     テキストからマイクロQRコードの画像を作成
 
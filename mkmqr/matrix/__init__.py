@@ -14,8 +14,16 @@ from .matrix_codeword import (
     setup_rs_code,
     get_error_correction_codeword,
     # 行列
+    codeword2arr,
+    get_codeword_bits_table,
+    place_codeword_bits,
+    get_codeword_index,
     place_codeword,
+    extract_codeword,
+    get_edge_codeword_index,
+    segment2codeword,
     segment2matrix,
+    segment2bits,
 )
 from .matrix_format_information import (
     place_format_information,
@@ -24,8 +32,17 @@ from .matrix_format_information import (
 from .matrix_mask import (
     get_mask_matrix,
     calc_mask_score,
+    get_mask_edges,
+    calc_mask_scores,
+    select_mask,
     get_optimal_mask,
+    get_mask_bits,
+    get_optimal_mask_bits,
 )
 from .matrix_function_pattern import (
     get_function_pattern_matrix,
 )
+from .matrix_template import (
+    get_template_matrix,
+    get_template_bits,
+)
@@ -2,24 +2,33 @@
 コード語列を表す行列を作成するプログラム
 """
 
+from functools import lru_cache
 from logging import getLogger
-
-from ..binary import bin2arr, concat_arr, BinaryArray, BinaryMatrix, arr2bin, empty_matrix, arr2str
-from ..error_correction import ReedSolomonCode, ResidueFieldOperator, PolynomialRing
+from typing import Iterator, Tuple
+
+from ..binary import (
+    BitWriter,
+    SymbolBits,
+    bytes2arr,
+    concat_arr,
+    BinaryArray,
+    BinaryMatrix,
+    empty_matrix,
+    MatrixIndex,
+    to_matrix_index,
+    to_index_arr,
+)
+from ..error_correction import ReedSolomonCode, GaloisField, PolynomialRing, calc_generator_polynomial
 from ..model import Version, ErrorCorrectionLevel as ECL, OverCapacityError, values
-from ..util import Case
 
 logger = getLogger(__name__)
 
 
-def padding_to_8bit(arr: BinaryArray) -> BinaryArray:
-    """8bitの倍数になるように末尾に0を追加する"""
-    n = len(arr) % 8
-    n = (8 - n) % 8
-    return concat_arr([arr, bin2arr(0, n)])
+# region データコード語
+_padding_codewords = (0b1110_1100, 0b0001_0001)
+"""埋め草コード語 (交互に繰り返す)"""
 
 
-# region データコード語
 def add_terminator(version: Version, arr: BinaryArray, capacity: int) -> BinaryArray:
     """
     配列に終端パターンを追加
@@ -29,8 +38,7 @@ def add_terminator(version: Version, arr: BinaryArray, capacity: int) -> BinaryA
     :param capacity: ビット単位の容量
     :return: 終端パターンを追加した配列
     """
-    arr = concat_arr([arr, version.terminator])
-    return arr[:capacity]
+    return BitWriter(capacity).write_arr(arr).write_zeros(len(version.terminator)).to_arr()
 
 
 def add_padding_bit(arr: BinaryArray, capacity: int):
@@ -41,8 +49,7 @@ def add_padding_bit(arr: BinaryArray, capacity: int):
     :param capacity: ビット単位の容量
     :return: 埋め草ビットを追加した配列
     """
-    arr = padding_to_8bit(arr)
-    return arr[:capacity]
+    return BitWriter(capacity).write_arr(arr).pad_to_byte().to_arr()
 
 
 def add_padding_codeword(arr: BinaryArray, capacity: int):
@@ -53,116 +60,285 @@ def add_padding_codeword(arr: BinaryArray, capacity: int):
     :param capacity: ビット単位の容量
     :return: 埋め草コード語を追加した配列
     """
-    padding_codeword_num, remaining = divmod(capacity - len(arr), 8)  # remainingは 0 or 4
-    cw = [
-        bin2arr(0b1110_1100, 8) if i % 2 == 0 else bin2arr(0b0001_0001, 8)
-        for i in range(padding_codeword_num)
-    ]
-    return concat_arr([arr] + cw + [bin2arr(0, remaining)])
+    return BitWriter(capacity).write_arr(arr).pad_codewords(_padding_codewords).to_arr()
 
 
-def segment2data_codeword(version: Version, ecl: ECL, segment: BinaryArray) -> BinaryArray:
-    """セグメントをデータコード語に変換"""
+def segment2data_codeword(version: Version, ecl: ECL, segment: BinaryArray) -> bytes:
+    """
+    セグメントをデータコード語に変換
+
+    | M1とM3の最後のデータコード語は4ビットのため、下位4ビットを0とした1バイトとして格納する
+    | (誤り訂正コード語の計算でも同じく下位4ビットを0として扱う)
+
+    :param version: 型番
+    :param ecl: 誤り訂正レベル
+    :param segment: セグメント
+    :return: データコード語 (1コード語が1バイト)
+    """
     logger.debug(f'[convert segment to data codeword]')
 
     capacity = values.get_data_bit_capacity(version, ecl)
     if len(segment) > capacity:
         raise OverCapacityError(f'Segment({len(segment)}-bit) is over capacity({capacity}-bit)', segment)
 
-    arr = segment
-    logger.debug(f'segment: {len(segment)}/{capacity} bits')
-    arr = add_terminator(version, arr, capacity)
-    logger.debug(f'add terminator: {len(arr)}/{capacity} bits')
-    arr = add_padding_bit(arr, capacity)
-    logger.debug(f'add remaining bit: {len(arr)}/{capacity} bits')
-    arr = add_padding_codeword(arr, capacity)
-    logger.debug(f'add remaining codeword: {len(arr)}/{capacity} bits')
-
-    return arr
+    writer = BitWriter(capacity)  # 容量の分だけ確保したバッファに順に書き込む
+    writer.write_arr(segment)
+    logger.debug(f'segment: {len(writer)}/{capacity} bits')
+    writer.write_zeros(len(version.terminator))
+    logger.debug(f'add terminator: {len(writer)}/{capacity} bits')
+    writer.pad_to_byte()
+    logger.debug(f'add remaining bit: {len(writer)}/{capacity} bits')
+    writer.pad_codewords(_padding_codewords)
+    logger.debug(f'add remaining codeword: {len(writer)}/{capacity} bits')
+
+    return writer.to_bytes()
 # endregion
 
 
 # region 誤り訂正コード語
-def get_generator_polynomial(rf_op: ResidueFieldOperator, degree: int):
+def get_generator_polynomial(field: GaloisField, degree: int):
     """
     生成多項式を取得
 
-    :param rf_op: 剰余環として扱うためのインスタンス
+    規格に掲載された生成多項式を (x - α^0)...(x - α^(degree-1)) の展開によって求める
+
+    :param field: 係数の属する有限体
     :param degree: 生成多項式の次数
-    :return: 生成多項式
+    :return: 生成多項式 (多項式表現)
     """
-    def exp2gen(*exp: int):
-        return [rf_op.from_exp(e) for e in exp]
+    return calc_generator_polynomial(field, degree)
+
 
-    return Case(degree)\
-        .when(2, exp2gen(0, 25, 1))\
-        .when(5, exp2gen(0, 113, 164, 166, 119, 10))\
-        .when(6, exp2gen(0, 166, 0, 134, 5, 176, 15))\
-        .when(8, exp2gen(0, 175, 238, 208, 249, 215, 252, 196, 28))\
-        .when(10, exp2gen(0, 251, 67, 46, 61, 118, 70, 64, 94, 32, 45))\
-        .when(14, exp2gen(0, 199, 249, 155, 48, 190, 124, 218, 137, 216, 87, 207, 59, 22, 91))\
-        .value
+@lru_cache(maxsize=1)
+def _get_field() -> GaloisField:
+    """RS符号の係数が属する有限体を取得 (原始多項式 x^8 + x^4 + x^3 + x^2 + 1)"""
+    return GaloisField(PolynomialRing(0b1_0001_1101))
 
 
+@lru_cache(maxsize=None)
 def setup_rs_code(version: Version, ecl: ECL) -> ReedSolomonCode:
-    """RS符号を計算するためのインスタンスを取得"""
-    primitive_poly = PolynomialRing(0b1_0001_1101)
-    rf_op = ResidueFieldOperator(primitive_poly)
+    """
+    RS符号を計算するためのインスタンスを取得
+
+    型番と誤り訂正レベルの組み合わせごとに、初回の呼び出し時に生成したものを使い回す
+    """
+    field = _get_field()
     degree = values.get_error_correction_codeword_num(version, ecl)
-    generator_poly = get_generator_polynomial(rf_op, degree)
-    return ReedSolomonCode(rf_op, generator_poly)
+    generator_poly = get_generator_polynomial(field, degree)
+    return ReedSolomonCode(field, generator_poly)
 
 
-def get_error_correction_codeword(version: Version, ecl: ECL, data_codeword: BinaryArray) -> BinaryArray:
+def _get_data_codeword_num(version: Version, ecl: ECL) -> int:
+    """データコード語の数 (M1とM3の4ビットのコード語も1つと数える)"""
+    return (values.get_data_bit_capacity(version, ecl) + 7) // 8
+
+
+def get_error_correction_codeword(version: Version, ecl: ECL, data_codeword: bytes) -> bytes:
     """
     データコード語から誤り訂正コード語を取得
 
     :param version: 型番
     :param ecl: 誤り訂正レベル
-    :param data_codeword: 誤り訂正コード語を計算する対象のデータコード語
-    :return: 計算した誤り訂正コード語
+    :param data_codeword: 誤り訂正コード語を計算する対象のデータコード語 (segment2data_codewordの戻り値)
+    :return: 計算した誤り訂正コード語 (1コード語が1バイト)
     """
-    data_codeword = padding_to_8bit(data_codeword)  # 末尾が4bitでも8bitに合わせる
-    poly = [PolynomialRing(arr2bin(data_codeword[i:i+8])) for i in range(0, len(data_codeword), 8)]  # 8bitごとに区切る
+    data_codeword_num = _get_data_codeword_num(version, ecl)
+    if len(data_codeword) != data_codeword_num:
+        raise ValueError(
+            f'Data codewords must be {data_codeword_num} bytes, but it is {len(data_codeword)} bytes', data_codeword
+        )
 
     rs_code = setup_rs_code(version, ecl)
-    ecc = rs_code.encode(poly)
-    return concat_arr([bin2arr(e.coefficient, 8) for e in ecc])
+    return rs_code.encode_bytes(data_codeword)
 # endregion
 
 
 # region 行列
+def _codeword_cursor(n: int) -> Iterator[Tuple[int, int]]:
+    """
+    ビットを配置する座標(i,j)を順に返す
+    原点は左上、iは下方向、jは右方向を表す
+
+    :param n: 一辺あたりのモジュール数
+    """
+    for idx, j in enumerate(range(n-1, 0, -2)):
+        rng = range(9, n) if j <= 8 else range(1, n)  # j<=8のときは切り出しパターンを避けなければならない
+        if idx % 2 == 0:  # 最初は上方向(iの減少方向)に配置していく
+            rng = reversed(rng)  # 上下に往復するように配置するため、向きを反転する
+        for i in rng:  # ジグザグに蛇行して配置していく
+            yield i, j
+            yield i, j-1
+
+
+@lru_cache(maxsize=None)
+def get_codeword_index(version: Version) -> MatrixIndex:
+    """
+    コード語列の各ビットを配置する座標を取得
+
+    配置経路は型番のみで決まるため、型番ごとに初回の呼び出し時に求めたものを使い回す
+
+    :param version: 型番
+    :return: コード語列のk番目のビットを配置する座標を、k番目の要素とするインデックス
+    """
+    return to_matrix_index(_codeword_cursor(version.size))
+
+
+@lru_cache(maxsize=None)
+def get_edge_codeword_index(version: Version) -> Tuple[BinaryArray, BinaryArray]:
+    """
+    下端の行と右端の列に配置されるビットが、コード語列の何番目のビットかを取得
+
+    マスクの点数は下端の行と右端の列のみで決まるため、配置前のコード語列からマスクを選択するために用いる
+
+    :param version: 型番
+    :return: 下端の行 (左端を除く) のインデックス, 右端の列 (上端を除く) のインデックス
+    """
+    n = version.size
+    position2k = {(i, j): k for k, (i, j) in enumerate(_codeword_cursor(n))}
+    bottom = to_index_arr(position2k[n-1, j] for j in range(1, n))
+    right = to_index_arr(position2k[i, n-1] for i in range(1, n))
+    return bottom, right
+
+
+def _check_codeword_length(version: Version, length: int) -> None:
+    n = version.size
+    if length != (n-1)**2 - 8**2:
+        raise ValueError(f'Codewords must be {(n-1)**2 - 8**2}bit, but it is {length}bit', length)
+
+
 def place_codeword(version: Version, codeword: BinaryArray) -> BinaryMatrix:
     """
     コード語列を行列に配置
 
+    先頭に軸を追加した配列 (N × ビット数) を与えると、N個の行列 (N × n × n) にまとめて配置する
+
     :param version: 型番
     :param codeword: コード語列
     :return: コード語列を配置した行列
     """
     n = version.size
-    if len(codeword) != (n-1)**2 - 8**2:
-        raise ValueError(f'Codewords must be {(n-1)**2 - 8**2}bit, but it is {len(codeword)}bit', codeword)
-
-    def cursor():
-        """
-        ビットを配置する座標(i,j)を順に返す
-        原点は左上、iは下方向、jは右方向を表す
-        """
-        for idx, j in enumerate(range(n-1, 0, -2)):
-            rng = range(9, n) if j <= 8 else range(1, n)  # j<=8のときは切り出しパターンを避けなければならない
-            if idx % 2 == 0:  # 最初は上方向(iの減少方向)に配置していく
-                rng = reversed(rng)  # 上下に往復するように配置するため、向きを反転する
-            for i in rng:  # ジグザグに蛇行して配置していく
-                yield i, j
-                yield i, j-1
-
-    code = empty_matrix(n)
-    for (i, j), c in zip(cursor(), codeword):
-        code[i, j] = c
+    _check_codeword_length(version, codeword.shape[-1])
+
+    code = empty_matrix(codeword.shape[:-1] + (n, n))
+    rows, cols = get_codeword_index(version)
+    code[..., rows, cols] = codeword
     return code
 
 
+def extract_codeword(version: Version, code: BinaryMatrix) -> BinaryArray:
+    """
+    行列に配置されたコード語列を取り出す (place_codewordの逆)
+
+    先頭に軸を追加した配列 (N × n × n) を与えると、N個のコード語列 (N × ビット数) をまとめて取り出す
+
+    :param version: 型番
+    :param code: コード語列を配置した行列
+    :return: コード語列
+    """
+    n = version.size
+    if code.shape[-2:] != (n, n):
+        raise ValueError(f'Matrix must be {n}x{n}, but it is {code.shape[-2:]}', code)
+
+    rows, cols = get_codeword_index(version)
+    return code[..., rows, cols]
+
+
+@lru_cache(maxsize=None)
+def get_codeword_bits_table(version: Version, ecl: ECL) -> Tuple[Tuple[int, ...], ...]:
+    """
+    コード語の値から、SymbolBitsとして配置した値への変換表を取得
+
+    M1とM3は4ビットのデータコード語の位置によって以降の配置がずれるため、型番と誤り訂正レベルの組み合わせごとに作成する
+
+    :param version: 型番
+    :param ecl: 誤り訂正レベル
+    :return: table[k][c] == k番目のコード語の値がcのときに、そのコード語のみを配置したSymbolBitsの値
+    """
+    n = version.size
+    rows, cols = get_codeword_index(version)
+    positions = (rows * n + cols).tolist()  # コード語列のk番目のビットを配置する位置
+
+    capacity = values.get_data_bit_capacity(version, ecl)
+    data_codeword_num = _get_data_codeword_num(version, ecl)
+    ec_codeword_num = values.get_error_correction_codeword_num(version, ecl)
+
+    table = []
+    for k in range(data_codeword_num + ec_codeword_num):
+        if k < data_codeword_num:
+            begin = 8 * k
+            end = min(begin + 8, capacity)  # 4ビットのデータコード語は上位4ビットのみ配置する
+        else:
+            begin = capacity + 8 * (k - data_codeword_num)
+            end = begin + 8
+
+        # 最上位ビットから順に配置する
+        bit2value = [1 << positions[begin + b] if begin + b < end else 0 for b in range(8)]
+        row = [0] * 256
+        for c in range(1, 256):
+            low = c & -c  # 最下位の1のビット
+            row[c] = row[c ^ low] | bit2value[8 - low.bit_length()]
+        table.append(tuple(row))
+    return tuple(table)
+
+
+def place_codeword_bits(version: Version, ecl: ECL, codeword: bytes) -> SymbolBits:
+    """
+    コード語をSymbolBitsに配置
+
+    :param version: 型番
+    :param ecl: 誤り訂正レベル
+    :param codeword: データコード語と誤り訂正コード語を連結したバイト列
+    :return: コード語列を配置した値
+    """
+    table = get_codeword_bits_table(version, ecl)
+    if len(codeword) != len(table):
+        raise ValueError(f'Codewords must be {len(table)} bytes, but it is {len(codeword)} bytes', codeword)
+
+    value = 0
+    for row, c in zip(table, codeword):
+        value |= row[c]
+    return SymbolBits(version.size, value)
+
+
+def codeword2arr(version: Version, ecl: ECL, data_codeword: bytes, ec_codeword: bytes) -> BinaryArray:
+    """
+    データコード語と誤り訂正コード語を、配置するコード語列に変換
+
+    M1とM3の最後のデータコード語は、上位4ビットのみを配置する
+
+    :param version: 型番
+    :param ecl: 誤り訂正レベル
+    :param data_codeword: データコード語
+    :param ec_codeword: 誤り訂正コード語
+    :return: コード語列
+    """
+    arr = bytes2arr(data_codeword + ec_codeword)  # ビットに展開するのはここの1回のみ
+    capacity = values.get_data_bit_capacity(version, ecl)
+    padding = len(data_codeword) * 8 - capacity  # 0 or 4
+    if padding == 0:
+        return arr
+    return concat_arr([arr[:capacity], arr[capacity + padding:]])
+
+
+def _codeword2str(codeword: bytes) -> str:
+    return ' '.join(f'{c:08b}' for c in codeword)
+
+
+def segment2codeword(version: Version, ecl: ECL, segment: BinaryArray) -> Tuple[bytes, bytes]:
+    """
+    セグメントをコード語に変換
+
+    :param version: 型番
+    :param ecl: 誤り訂正レベル
+    :param segment: セグメント
+    :return: データコード語, 誤り訂正コード語
+    """
+    data_codeword = segment2data_codeword(version, ecl, segment)
+    ec_codeword = get_error_correction_codeword(version, ecl, data_codeword)
+    logger.info(f'codewords: {_codeword2str(data_codeword)}, {_codeword2str(ec_codeword)}')
+    return data_codeword, ec_codeword
+
+
 def segment2matrix(version: Version, ecl: ECL, segment: BinaryArray) -> BinaryMatrix:
     """
     セグメントを行列に変換
@@ -172,10 +348,21 @@ def segment2matrix(version: Version, ecl: ECL, segment: BinaryArray) -> BinaryMa
     :param segment: セグメント
     :return: セグメントの情報を格納した行列
     """
-    data_codeword = segment2data_codeword(version, ecl, segment)
-    ec_codeword = get_error_correction_codeword(version, ecl, data_codeword)
-    codeword = concat_arr([data_codeword, ec_codeword])
-    logger.info('codewords: ' + arr2str(data_codeword, byte_sep=' ') + ', ' + arr2str(ec_codeword, byte_sep=' '))
+    data_codeword, ec_codeword = segment2codeword(version, ecl, segment)
+    codeword = codeword2arr(version, ecl, data_codeword, ec_codeword)
     mat_codeword = place_codeword(version, codeword)
     return mat_codeword
+
+
+def segment2bits(version: Version, ecl: ECL, segment: BinaryArray) -> SymbolBits:
+    """
+    セグメントをSymbolBitsに変換 (ビットに展開せずにコード語から直接配置する)
+
+    :param version: 型番
+    :param ecl: 誤り訂正レベル
+    :param segment: セグメント
+    :return: セグメントの情報を格納した値
+    """
+    data_codeword, ec_codeword = segment2codeword(version, ecl, segment)
+    return place_codeword_bits(version, ecl, data_codeword + ec_codeword)
 # endregion
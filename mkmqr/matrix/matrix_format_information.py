@@ -2,30 +2,42 @@
 形式情報の行列を生成するプログラム
 """
 
+from functools import lru_cache
 from logging import getLogger
 
-from ..binary import BinaryArray, BinaryMatrix, empty_matrix, arr2str
+from ..binary import BinaryArray, BinaryMatrix, MatrixIndex, empty_matrix, arr2str, to_matrix_index, freeze_matrix
 from ..model import Version, ErrorCorrectionLevel as ECL, Mask, values
 
 logger = getLogger(__name__)
 
 
+def _format_information_cursor():
+    """形式情報の各ビットを配置する座標(i,j)を順に返す"""
+    for i in range(1, 8):
+        yield 8, i
+    for i in range(8, 0, -1):
+        yield i, 8
+
+
+_format_information_index: MatrixIndex = to_matrix_index(_format_information_cursor())
+"""形式情報のk番目のビットを配置する座標を、k番目の要素とするインデックス"""
+
+
 def place_format_information(version: Version, format_information: BinaryArray) -> BinaryMatrix:
     """形式情報を行列に配置"""
-    def idx():
-        for i in range(1, 8):
-            yield 8, i
-        for i in range(8, 0, -1):
-            yield i, 8
-
+    rows, cols = _format_information_index
     mat = empty_matrix(version.size)
-    for (i, j), fi in zip(idx(), format_information):
-        mat[i, j] = fi
+    mat[rows, cols] = format_information
     return mat
 
 
+@lru_cache(maxsize=None)
 def get_format_information_matrix(version: Version, ecl: ECL, mask: Mask) -> BinaryMatrix:
-    """形式情報を配置した行列を取得"""
+    """
+    形式情報を配置した行列を取得
+
+    組み合わせごとに初回の呼び出し時に作成したもの(読み取り専用)を使い回す
+    """
     fi = values.get_format_information(version, ecl, mask)
     logger.info(f'format information: ' + arr2str(fi, byte_sep=' '))
-    return place_format_information(version, fi)
+    return freeze_matrix(place_format_information(version, fi))
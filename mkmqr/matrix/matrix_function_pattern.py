@@ -2,12 +2,19 @@
 機能パターンの行列を作成するプログラム
 """
 
-from ..binary import BinaryMatrix, empty_matrix
+from functools import lru_cache
+
+from ..binary import BinaryMatrix, empty_matrix, freeze_matrix
 from ..model import Version
 
 
+@lru_cache(maxsize=None)
 def get_function_pattern_matrix(version: Version) -> BinaryMatrix:
-    """機能パターンの行列を取得"""
+    """
+    機能パターンの行列を取得
+
+    型番ごとに初回の呼び出し時に作成したもの(読み取り専用)を使い回す
+    """
     ptn = empty_matrix(version.size)
     # タイミングパターン
     ptn[::2, 0] = True
@@ -16,4 +23,4 @@ def get_function_pattern_matrix(version: Version) -> BinaryMatrix:
     ptn[0:7, 0:7] = True
     ptn[1:6, 1:6] = False
     ptn[2:5, 2:5] = True
-    return ptn
+    return freeze_matrix(ptn)
@@ -2,15 +2,31 @@
 マスクの行列を生成するプログラム
 """
 
-import itertools
+from functools import lru_cache
 from logging import getLogger
 from typing import Tuple, Union
 
-from ..binary import BinaryMatrix, empty_matrix
+from ..binary import BinaryArray, BinaryMatrix, SymbolBits, index_grid, freeze_matrix, stack_matrix
 from ..model import Mask
 
 logger = getLogger(__name__)
 
+_masks = tuple(sorted(Mask, key=lambda m: m.mask_pattern_value))
+"""マスクパターン参照子の値の順に並べたマスク"""
+
+
+@lru_cache(maxsize=None)
+def _get_mask_matrix(mask: Mask, shape: Tuple[int, int]) -> BinaryMatrix:
+    """マスクを作成 (大きさごとに初回の呼び出し時に作成したものを使い回す)"""
+    y, x = index_grid(shape)
+
+    # データ領域以外はマスクしない
+    data_area = (y != 0) & (x != 0)  # タイミングパターン
+    data_area &= (y > 8) | (x > 8)  # 切り出しシンボル・分離パターン・形式情報
+
+    mat = data_area & mask.get_pattern((y, x))  # マスクパターン
+    return freeze_matrix(mat)
+
 
 def get_mask_matrix(mask: Mask, size: Union[int, Tuple[int, int]]) -> BinaryMatrix:
     """
@@ -18,25 +34,11 @@ def get_mask_matrix(mask: Mask, size: Union[int, Tuple[int, int]]) -> BinaryMatr
 
     :param mask: マスクの種類
     :param size: 行列の大きさ
-    :return: マスクの行列
+    :return: マスクの行列 (読み取り専用)
     """
-
-    def func(tup):
-        i, j = tup
-
-        # データ領域以外はマスクしない
-        if i == 0 or j == 0:  # タイミングパターン
-            return False
-        if i <= 8 and j <= 8:  # 切り出しシンボル・分離パターン・形式情報
-            return False
-
-        return mask.function(i, j)  # マスクパターン
-
-    mat = empty_matrix(size)
-    h, w = mat.shape
-    idx = tuple(zip(*filter(func, itertools.product(range(h), range(w)))))
-    mat[idx] = True
-    return mat
+    if isinstance(size, int):
+        size = size, size
+    return _get_mask_matrix(mask, tuple(size))
 
 
 def calc_mask_score(matrix: BinaryMatrix) -> int:
@@ -51,20 +53,86 @@ def calc_mask_score(matrix: BinaryMatrix) -> int:
     return min(s1, s2) * 16 + max(s1, s2)
 
 
+@lru_cache(maxsize=None)
+def get_mask_edges(size: int) -> Tuple[BinaryMatrix, BinaryMatrix]:
+    """
+    マスクの点数の計算に用いる、各マスクの下端の行と右端の列を取得
+
+    :param size: 行列の一辺の大きさ
+    :return: 下端の行 (マスクの種類 × (size-1)), 右端の列 (マスクの種類 × (size-1))
+    """
+    masks = stack_matrix([get_mask_matrix(mask, size) for mask in _masks])
+    bottom = freeze_matrix(masks[:, -1, 1:].copy())
+    right = freeze_matrix(masks[:, 1:, -1].copy())
+    return bottom, right
+
+
+def calc_mask_scores(bottom: BinaryArray, right: BinaryArray):
+    """
+    下端の行と右端の列のみから、全てのマスクの点数をまとめて計算
+
+    先頭に軸を追加した配列 (N × (n-1)) を与えると、N個のシンボルについてまとめて計算する
+
+    :param bottom: マスクする前の下端の行 (左端を除く)
+    :param right: マスクする前の右端の列 (上端を除く)
+    :return: 得点(高い方が良い)をマスクパターン参照子の値の順に並べた配列 (... × マスクの種類)
+    """
+    mask_bottom, mask_right = get_mask_edges(bottom.shape[-1] + 1)
+    s1 = (bottom[..., None, :] ^ mask_bottom).sum(axis=-1)
+    s2 = (right[..., None, :] ^ mask_right).sum(axis=-1)
+    s = stack_matrix([s1, s2])
+    return s.min(axis=0) * 16 + s.max(axis=0)
+
+
+def select_mask(bottom: BinaryArray, right: BinaryArray):
+    """
+    下端の行と右端の列のみから、最適なマスクのマスクパターン参照子の値を求める
+
+    先頭に軸を追加した配列 (N × (n-1)) を与えると、N個のシンボルについてまとめて求める
+
+    :param bottom: マスクする前の下端の行 (左端を除く)
+    :param right: マスクする前の右端の列 (上端を除く)
+    :return: マスクパターン参照子の値 (得点が同じ場合は値が小さい方)
+    """
+    return calc_mask_scores(bottom, right).argmax(axis=-1)
+
+
 def get_optimal_mask(code: BinaryMatrix) -> Tuple[Mask, BinaryMatrix]:
     """最適なマスクを取得"""
 
-    best_mask: Tuple[Mask, BinaryMatrix] = ...
-    best_score = -1
+    logger.debug(f'[select optimal mask]')
+    scores = calc_mask_scores(code[-1, 1:], code[1:, -1])
+    for mask, score in zip(_masks, scores):
+        logger.debug(f'- {mask}: {score:3}')
+
+    best_mask = _masks[int(scores.argmax())]
+    logger.info(f'selected mask: {best_mask}')
+    return best_mask, get_mask_matrix(best_mask, code.shape)
+
+
+@lru_cache(maxsize=None)
+def get_mask_bits(mask: Mask, size: int) -> SymbolBits:
+    """
+    マスクをSymbolBitsとして取得
+
+    :param mask: マスクの種類
+    :param size: 行列の一辺の大きさ
+    :return: マスク
+    """
+    return SymbolBits.from_matrix(get_mask_matrix(mask, size))
+
+
+def get_optimal_mask_bits(code: SymbolBits) -> Tuple[Mask, SymbolBits]:
+    """最適なマスクを取得 (SymbolBits版)"""
 
     logger.debug(f'[select optimal mask]')
-    for mask in Mask:
-        mat_mask = get_mask_matrix(mask, code.shape)
-        score = calc_mask_score(mat_mask ^ code)
+    best_mask, best_score = None, -1
+    for mask in _masks:
+        s1, s2 = (code ^ get_mask_bits(mask, code.size)).count_edges()
+        score = min(s1, s2) * 16 + max(s1, s2)
         logger.debug(f'- {mask}: {score:3}')
-        if score > best_score:
-            best_mask = mask, mat_mask
-            best_score = score
+        if score > best_score:  # 得点が同じ場合は値が小さい方
+            best_mask, best_score = mask, score
 
-    logger.info(f'selected mask: {best_mask[0]}')
-    return best_mask
+    logger.info(f'selected mask: {best_mask}')
+    return best_mask, get_mask_bits(best_mask, code.size)
@@ -0,0 +1,41 @@
+"""
+コード語列以外のパーツをまとめたひな形の行列を作成するプログラム
+"""
+
+from functools import lru_cache
+
+from ..binary import BinaryMatrix, SymbolBits, freeze_matrix
+from .matrix_format_information import get_format_information_matrix
+from .matrix_function_pattern import get_function_pattern_matrix
+from ..model import Version, ErrorCorrectionLevel as ECL, Mask
+
+
+@lru_cache(maxsize=None)
+def get_template_matrix(version: Version, ecl: ECL, mask: Mask) -> BinaryMatrix:
+    """
+    機能パターンと形式情報を配置したひな形の行列を取得
+
+    ひな形とマスクしたコード語列の行列の排他的論理和が最終的なシンボルとなる
+    組み合わせ(シンボル番号8通り×マスク4通り)ごとに、初回の呼び出し時に作成したもの(読み取り専用)を使い回す
+
+    :param version: 型番
+    :param ecl: 誤り訂正レベル
+    :param mask: マスク
+    :return: ひな形の行列
+    """
+    mat_fp = get_function_pattern_matrix(version)
+    mat_fi = get_format_information_matrix(version, ecl, mask)
+    return freeze_matrix(mat_fp ^ mat_fi)
+
+
+@lru_cache(maxsize=None)
+def get_template_bits(version: Version, ecl: ECL, mask: Mask) -> SymbolBits:
+    """
+    機能パターンと形式情報を配置したひな形をSymbolBitsとして取得
+
+    :param version: 型番
+    :param ecl: 誤り訂正レベル
+    :param mask: マスク
+    :return: ひな形
+    """
+    return SymbolBits.from_matrix(get_template_matrix(version, ecl, mask))
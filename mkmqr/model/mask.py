@@ -1,6 +1,6 @@
 from enum import Enum
 from typing import Callable
-from mkmqr.binary import bin2arr, BinaryArray
+from mkmqr.binary import bin2arr, BinaryArray, BinaryMatrix, MatrixIndex
 
 
 class Mask(Enum):
@@ -30,6 +30,18 @@ class Mask(Enum):
         P49 (PDF 52) 表10
         """
 
+    def get_pattern(self, index: MatrixIndex) -> BinaryMatrix:
+        """
+        マスクする範囲を座標の配列についてまとめて求める
+
+        P49 (PDF 52) 表10
+
+        :param index: 行番号の配列と列番号の配列 (index_gridで作成したもの等)
+        :return: 各座標をマスクするか否かを並べた行列
+        """
+        y, x = index
+        return self.function(y, x)  # 各関数は剰余と比較のみで構成されているため、配列をそのまま渡せる
+
     @property
     def mask_pattern_reference(self) -> BinaryArray:
         """
@@ -4,13 +4,14 @@
 
 
 from enum import Enum
-from typing import List, Optional, Union
+from typing import Optional, Union
 
-from ..binary import bin2arr, BinaryArray, concat_arr
+from ..binary import bin2arr, bins2arr, bytes2arr, to_byte_arr, BinaryArray, concat_arr
 
 
-def _each_slice(lst: str, n: int) -> List[str]:
-    return [lst[i:i+n] for i in range(0, len(lst), n)]
+def _str2ints(text: str):
+    """1バイト文字のみから成る文字列を、各文字の値の配列に変換する"""
+    return to_byte_arr(text.encode('latin-1')).astype(int)
 
 
 class _NumericMode:
@@ -28,13 +29,17 @@ class _NumericMode:
         return all((c in '0123465789' for c in text))
 
     def encode(self, text: str) -> BinaryArray:
-        def f(txt: str):
-            txt2bin = {1: 4, 2: 7, 3: 10}
-            txt_len = len(txt)
-            bin_len = txt2bin[txt_len]
-            return bin2arr(int(txt), bin_len)
-
-        return concat_arr([f(txt) for txt in _each_slice(text, 3)])
+        # 3桁ずつ10ビットに変換し、余った1桁・2桁はそれぞれ4ビット・7ビットに変換する
+        digits = _str2ints(text) - ord('0')
+        n = len(digits) // 3 * 3
+        d = digits[:n]
+        arr = bins2arr(d[0::3] * 100 + d[1::3] * 10 + d[2::3], 10)
+        if n == len(digits):
+            return arr
+
+        txt2bin = {1: 4, 2: 7}
+        remaining = text[n:]
+        return concat_arr([arr, bin2arr(int(remaining), txt2bin[len(remaining)])])
 
     def bit_length(self, character_count: int) -> int:
         d = 10 * (character_count // 3)
@@ -59,19 +64,24 @@ class _AlphaNumericMode:
         self.mode_indicator_value = 1
 
         self._table = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ $%*+-./:'
+        self._translation = str.maketrans({
+            chr(b): chr(self._table.index(chr(b)) if chr(b) in self._table else 0xFF) for b in range(256)
+        })
+        """各文字を、表における位置を値とする1バイト文字に置き換える変換表 (表にない1バイト文字は0xFF)"""
 
     def is_valid(self, text: str) -> bool:
         return all((c in self._table for c in text))
 
     def encode(self, text: str) -> BinaryArray:
-        def f(txt: str):
-            indices = [self._table.index(c) for c in txt]
-            if len(indices) == 1:
-                return bin2arr(indices[0], 6)
-            else:  # len(indices) == 2
-                return bin2arr(indices[0] * 45 + indices[1], 11)
-
-        return concat_arr([f(txt) for txt in _each_slice(text, 2)])
+        # 2文字ずつ11ビットに変換し、余った1文字は6ビットに変換する
+        indices = _str2ints(text.translate(self._translation))  # 1バイト文字以外はここで例外が発生する
+        if len(indices) > 0 and indices.max() >= len(self._table):  # 表にない1バイト文字
+            raise ValueError('text contains characters that cannot be encoded in alphanumeric mode', text)
+        n = len(indices) // 2 * 2
+        arr = bins2arr(indices[0:n:2] * 45 + indices[1:n:2], 11)
+        if n == len(indices):
+            return arr
+        return concat_arr([arr, bin2arr(int(indices[-1]), 6)])
 
     def bit_length(self, character_count: int) -> int:
         d = 11 * (character_count // 2)
@@ -107,7 +117,7 @@ class _EightBitByteMode:
             return False
 
     def encode(self, text: str) -> BinaryArray:
-        return concat_arr([bin2arr(b, 8) for b in text.encode(self.encoding)])
+        return bytes2arr(text.encode(self.encoding))
 
     def bit_length(self, character_count: int) -> int:
         return 8 * character_count
@@ -142,17 +152,12 @@ class _KanjiMode:
         return all((check(c) for c in text))
 
     def encode(self, text: str) -> BinaryArray:
-        def cvt(char: str):
-            x = int.from_bytes(char.encode(self._encoding), 'big')
-            if 0x8140 <= x <= 0x9FFC:
-                x -= 0x8140
-            else:  # elif 0xE040 <= x <= 0xEBBF:
-                x -= 0xC140
-            high, low = divmod(x, 0x100)
-            x = 0xC0 * high + low
-            return bin2arr(x, 13)
-
-        return concat_arr([cvt(c) for c in text])
+        # 全ての文字が2バイトで表されるため、まとめて符号化して2バイトずつ区切る
+        b = to_byte_arr(text.encode(self._encoding)).astype(int)
+        x = b[0::2] << 8 | b[1::2]
+        x -= 0x8140 + (x > 0x9FFC) * (0xC140 - 0x8140)  # 0x8140～0x9FFCなら0x8140を、0xE040～0xEBBFなら0xC140を引く
+        high, low = x >> 8, x & 0xFF
+        return bins2arr(0xC0 * high + low, 13)
 
     def bit_length(self, character_count: int) -> int:
         return 13 * character_count
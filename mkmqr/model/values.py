@@ -1,15 +1,196 @@
-from typing import Set, Union
+from typing import Dict, Optional, Sequence, Set, Tuple, TypeVar, Union
 
 from .error import OverCapacityError, InvalidPairError
-from ..binary import concat_arr, bin2arr, BinaryArray
+from ..binary import bin2arr, BinaryArray
 from ..error_correction import PolynomialRing
 from ..model import Version, ErrorCorrectionLevel as ECL, Mask, Mode
-from ..util import Case
 
 
 # todo 1つから決まる値はEnumに持たせているが、表記の統一のためここに移すか検討する
 
 
+# region 表の作成
+# 各表は読み込み時に (型番の番号 * 4 + 誤り訂正レベル/モードの番号) を添字とするタプルに変換しておく
+
+_T = TypeVar('_T')
+
+_version_id: Dict[Version, int] = {version: i for i, version in enumerate(Version)}
+"""型番の番号"""
+
+_ecl_id: Dict[ECL, int] = {ecl: ecl.value for ecl in ECL}
+"""誤り訂正レベルの番号"""
+
+_mode_id: Dict[Mode, int] = {mode: mode.mode_indicator_value for mode in Mode}
+"""モードの番号"""
+
+_width = 4
+"""型番1つあたりの表の幅 (誤り訂正レベル・モードの種類の数)"""
+
+assert all(0 <= i < _width for i in list(_ecl_id.values()) + list(_mode_id.values()))
+
+
+def _compile_table(table: Dict[Tuple[Version, Union[ECL, Mode]], _T]) -> Tuple[Optional[_T], ...]:
+    """
+    (型番, 誤り訂正レベル or モード)をキーとする表を、番号を添字とするタプルに変換する
+
+    :param table: 表
+    :return: 変換後の表 (表にない組み合わせはNone)
+    """
+    lst = [None] * (len(_version_id) * _width)
+    for (version, x), value in table.items():
+        lst[_version_id[version] * _width + (_ecl_id[x] if isinstance(x, ECL) else _mode_id[x])] = value
+    return tuple(lst)
+
+
+def _lookup(table: Sequence[Optional[_T]], version: Version, x: Union[ECL, Mode]) -> _T:
+    """
+    変換後の表から値を取得する
+
+    :raise InvalidPairError: 表にない組み合わせが与えられたとき
+    """
+    value = table[_version_id[version] * _width + (_ecl_id[x] if isinstance(x, ECL) else _mode_id[x])]
+    if value is None:
+        raise InvalidPairError(f'Invalid value ({[version, x]})')
+    return value
+
+
+_data_bit_capacity = _compile_table({
+    (Version.M1, ECL.NONE): 20,
+    (Version.M2, ECL.L): 40,
+    (Version.M2, ECL.M): 32,
+    (Version.M3, ECL.L): 84,
+    (Version.M3, ECL.M): 68,
+    (Version.M4, ECL.L): 128,
+    (Version.M4, ECL.M): 112,
+    (Version.M4, ECL.Q): 80,
+})
+"""データ容量(ビット単位) P31 (PDF 34) 表7"""
+
+_error_correction_codeword_num = _compile_table({
+    (Version.M1, ECL.NONE): 2,
+    (Version.M2, ECL.L): 5,
+    (Version.M2, ECL.M): 6,
+    (Version.M3, ECL.L): 6,
+    (Version.M3, ECL.M): 8,
+    (Version.M4, ECL.L): 8,
+    (Version.M4, ECL.M): 10,
+    (Version.M4, ECL.Q): 14,
+})
+"""誤り訂正コード語の総数 P36 (PDF 39) 表9"""
+
+_symbol_number = _compile_table({
+    (version, ecl): i
+    for i, (version, ecl) in enumerate([
+        (Version.M1, ECL.NONE),
+        (Version.M2, ECL.L),
+        (Version.M2, ECL.M),
+        (Version.M3, ECL.L),
+        (Version.M3, ECL.M),
+        (Version.M4, ECL.L),
+        (Version.M4, ECL.M),
+        (Version.M4, ECL.Q),
+    ])
+})
+"""シンボル番号 P55 (PDF 58) 表13"""
+
+_character_count_indicator_length = _compile_table({
+    (Version.M1, Mode.Numeric): 3,
+    (Version.M2, Mode.Numeric): 4,
+    (Version.M2, Mode.AlphaNumeric): 3,
+    (Version.M3, Mode.Numeric): 5,
+    (Version.M3, Mode.AlphaNumeric): 4,
+    (Version.M3, Mode.EightBitByte): 4,
+    (Version.M3, Mode.Kanji): 3,
+    (Version.M4, Mode.Numeric): 6,
+    (Version.M4, Mode.AlphaNumeric): 5,
+    (Version.M4, Mode.EightBitByte): 5,
+    (Version.M4, Mode.Kanji): 4,
+})
+"""文字数指示子のビット数 P21 (PDF 24) 表3"""
+
+
+def _calc_format_information(symbol_number: int, mask: Mask) -> int:
+    """
+    形式情報を計算
+
+    P55 (PDF 58) 7.9.2
+
+    :param symbol_number: シンボル番号
+    :param mask: マスク
+    :return: 形式情報 (15ビット)
+    """
+    fi = symbol_number << 2 | mask.mask_pattern_value
+    fi_poly = PolynomialRing(fi << 10)
+    gp = PolynomialRing(0b101_0011_0111)
+    bch = (fi_poly % gp).coefficient
+    return (fi << 10 | bch) ^ 0b100010001000101
+
+
+_format_information: Dict[Tuple[int, Mask], int] = {
+    (symbol_number, mask): _calc_format_information(symbol_number, mask)
+    for symbol_number in _symbol_number if symbol_number is not None
+    for mask in Mask
+}
+"""(シンボル番号, マスク)ごとの形式情報"""
+
+
+def _to_mask(modes) -> int:
+    return sum(1 << _mode_id[mode] for mode in modes)
+
+
+_valid_ecls: Tuple[int, ...] = tuple(
+    sum(1 << _ecl_id[ecl] for ecl in ECL if _symbol_number[_version_id[version] * _width + _ecl_id[ecl]] is not None)
+    for version in Version
+)
+"""型番ごとの、有効な誤り訂正レベルのビットマスク (1 << 誤り訂正レベルの番号 の和) P31 (PDF 34) 表7, P36 (PDF 39) 表9 等"""
+
+_valid_modes: Tuple[int, ...] = tuple(
+    _to_mask(
+        mode for mode in Mode
+        if _character_count_indicator_length[_version_id[version] * _width + _mode_id[mode]] is not None
+    )
+    for version in Version
+)
+"""型番ごとの、有効なモードのビットマスク (1 << モードの番号 の和) P18 (PDF 21) 7.3, P21 (PDF 24) 表2,3 等"""
+
+
+def _calc_max_character_count(version: Version, ecl: ECL, mode: Mode) -> int:
+    """
+    1つのモードのみから成るセグメントがデータ容量に収まる最大の文字数を計算
+
+    :param version: 型番
+    :param ecl: 誤り訂正レベル
+    :param mode: モード
+    :return: 最大の文字数 (8ビットバイトモードはバイト数)
+    """
+    vid = _version_id[version]
+    capacity = _data_bit_capacity[vid * _width + _ecl_id[ecl]]
+    overhead = version.mode_indicator_length + _character_count_indicator_length[vid * _width + _mode_id[mode]]
+    count = 0
+    while overhead + mode.bit_length(count + 1) <= capacity:
+        count += 1
+    return count
+
+
+_max_character_count: Dict[Tuple[Version, ECL, Mode], int] = {
+    (version, ecl, mode): _calc_max_character_count(version, ecl, mode)
+    for version in Version
+    for ecl in ECL if _valid_ecls[_version_id[version]] >> _ecl_id[ecl] & 1
+    for mode in Mode if _valid_modes[_version_id[version]] >> _mode_id[mode] & 1
+}
+"""1つのモードのみから成るセグメントの最大の文字数 P31 (PDF 34) 表7"""
+
+_min_overhead: Tuple[int, ...] = tuple(
+    version.mode_indicator_length + min(
+        _character_count_indicator_length[_version_id[version] * _width + _mode_id[mode]]
+        for mode in Mode if _valid_modes[_version_id[version]] >> _mode_id[mode] & 1
+    )
+    for version in Version
+)
+"""型番ごとの、1つのセグメントのモード指示子と文字数指示子のビット数の最小値"""
+# endregion
+
+
 # region 組み合わせで決まる値
 def _assert_mode(version: Version, mode: Mode) -> None:
     """
@@ -17,9 +198,11 @@ def _assert_mode(version: Version, mode: Mode) -> None:
 
     :raise InvalidPairError: 不適切な組み合わせが与えられたとき
     """
-    if version == Version.M1 and mode != Mode.Numeric:
+    if _valid_modes[_version_id[version]] >> _mode_id[mode] & 1:
+        return
+    if version == Version.M1:
         raise InvalidPairError('M1 only supports number mode')
-    if version == Version.M2 and mode not in [Mode.Numeric, Mode.AlphaNumeric]:
+    if version == Version.M2:
         raise InvalidPairError('M2 only supports number mode and alphanumeric mode')
 
 
@@ -33,16 +216,7 @@ def get_data_bit_capacity(version: Version, ecl: ECL) -> int:
     :param ecl: 誤り訂正レベル
     :return: データ容量(ビット単位)
     """
-    return Case([version, ecl]) \
-        .when([Version.M1, ECL.NONE], 20) \
-        .when([Version.M2, ECL.L], 40) \
-        .when([Version.M2, ECL.M], 32) \
-        .when([Version.M3, ECL.L], 84) \
-        .when([Version.M3, ECL.M], 68) \
-        .when([Version.M4, ECL.L], 128) \
-        .when([Version.M4, ECL.M], 112) \
-        .when([Version.M4, ECL.Q], 80) \
-        .value
+    return _lookup(_data_bit_capacity, version, ecl)
 
 
 def get_error_correction_codeword_num(version: Version, ecl: ECL) -> int:
@@ -55,16 +229,7 @@ def get_error_correction_codeword_num(version: Version, ecl: ECL) -> int:
     :param ecl: 誤り訂正レベル
     :return: 誤り訂正コード語の総数
     """
-    return Case([version, ecl]) \
-        .when([Version.M1, ECL.NONE], 2) \
-        .when([Version.M2, ECL.L], 5) \
-        .when([Version.M2, ECL.M], 6) \
-        .when([Version.M3, ECL.L], 6) \
-        .when([Version.M3, ECL.M], 8) \
-        .when([Version.M4, ECL.L], 8) \
-        .when([Version.M4, ECL.M], 10) \
-        .when([Version.M4, ECL.Q], 14) \
-        .value
+    return _lookup(_error_correction_codeword_num, version, ecl)
 
 
 def get_symbol_number(version: Version, ecl: ECL) -> int:
@@ -77,17 +242,7 @@ def get_symbol_number(version: Version, ecl: ECL) -> int:
     :param ecl: 誤り訂正レベル
     :return: シンボル番号
     """
-    lst = [
-        (Version.M1, ECL.NONE),
-        (Version.M2, ECL.L),
-        (Version.M2, ECL.M),
-        (Version.M3, ECL.L),
-        (Version.M3, ECL.M),
-        (Version.M4, ECL.L),
-        (Version.M4, ECL.M),
-        (Version.M4, ECL.Q),
-    ]
-    return lst.index((version, ecl))
+    return _lookup(_symbol_number, version, ecl)
 
 
 def get_format_information(version: Version, ecl: ECL, mask: Mask) -> BinaryArray:
@@ -102,13 +257,39 @@ def get_format_information(version: Version, ecl: ECL, mask: Mask) -> BinaryArra
     :return: 形式情報のビット列
     """
     symbol_number = get_symbol_number(version, ecl)
-    fi = symbol_number << 2 | mask.mask_pattern_value
-    fi_poly = PolynomialRing(fi << 10)
-    gp = PolynomialRing(0b101_0011_0111)
-    bch = (fi_poly % gp).coefficient
-    x = concat_arr([bin2arr(fi, 5), bin2arr(bch, 10)])
-    m = bin2arr(0b100010001000101, 15)
-    return x ^ m
+    return bin2arr(_format_information[symbol_number, mask], 15)
+
+
+def get_max_character_count(version: Version, ecl: ECL, mode: Mode) -> int:
+    """
+    1つのモードのみから成るセグメントについて、データ容量に収まる最大の文字数を取得
+
+    P31 (PDF 34) 表7
+
+    :param version: 型番
+    :param ecl: 誤り訂正レベル
+    :param mode: モード
+    :return: 最大の文字数 (8ビットバイトモードはバイト数)
+    """
+    _lookup(_data_bit_capacity, version, ecl)
+    _assert_mode(version, mode)
+    return _max_character_count[version, ecl, mode]
+
+
+def get_min_bit_length(version: Version, character_count: int) -> int:
+    """
+    文字数から、どのようにセグメントに分けても下回らないビット数の下限を取得
+
+    | 1文字あたりのビット数が最も少ない数字モードで、1つのセグメントとした場合のビット数を下限とする
+    | (他のモードは1文字あたりのビット数が多く、セグメントを分けると指示子の分だけ増えるため)
+
+    :param version: 型番
+    :param character_count: 文字数
+    :return: ビット数の下限 (文字数が0なら0)
+    """
+    if character_count == 0:
+        return 0
+    return _min_overhead[_version_id[version]] + Mode.Numeric.bit_length(character_count)
 
 
 def get_mode_indicator(version: Version, mode: Mode) -> BinaryArray:
@@ -140,20 +321,7 @@ def get_character_count_indicator_length(version: Version, mode: Mode) -> int:
     """
     _assert_mode(version, mode)
 
-    cci_len = Case([version, mode]) \
-        .when([Version.M1, Mode.Numeric], 3) \
-        .when([Version.M2, Mode.Numeric], 4) \
-        .when([Version.M2, Mode.AlphaNumeric], 3) \
-        .when([Version.M3, Mode.Numeric], 5) \
-        .when([Version.M3, Mode.AlphaNumeric], 4) \
-        .when([Version.M3, Mode.EightBitByte], 4) \
-        .when([Version.M3, Mode.Kanji], 3) \
-        .when([Version.M4, Mode.Numeric], 6) \
-        .when([Version.M4, Mode.AlphaNumeric], 5) \
-        .when([Version.M4, Mode.EightBitByte], 5) \
-        .when([Version.M4, Mode.Kanji], 4) \
-        .value
-    return cci_len
+    return _lookup(_character_count_indicator_length, version, mode)
 
 
 def get_character_count_indicator(version: Version, mode: Mode, character_count: int) -> BinaryArray:
@@ -176,69 +344,28 @@ def get_character_count_indicator(version: Version, mode: Mode, character_count:
 
 
 # region 組み合わせの確認
-def _check_combination_ve(version: Version, ecl: ECL) -> bool:
-    """
-    型番と誤り訂正レベルの組み合わせが有効か確認する
-
-    P31 (PDF 34) 表7, P36 (PDF 39) 表9 等
-
-    :param version: 型番
-    :param ecl: 誤り訂正レベル
-    :return: 組み合わせが有効か？
-    """
-    if version == Version.M1 and ecl != ECL.NONE:
-        # logger.debug(f'M1 supports only error detection')
-        return False  # M1は誤り検出のみ
-
-    if ecl == ECL.NONE and version != Version.M1:
-        # logger.debug(f'error detection supports only M1')
-        return False  # 誤り検出はM1のみ
-
-    if ecl == ECL.Q and version != Version.M4:
-        # logger.debug(f'Level Q supports only M4')
-        return False  # 誤り訂正レベルQはM4のみ
-
-    return True
-
-
-def _check_combination_vm(version: Version, mode: Union[Mode, Set[Mode]]) -> bool:
-    """
-    型番とモードの組み合わせが有効か確認する
-
-    P18 (PDF 21) 7.3, P21 (PDF 24) 表2,3 等
-
-    :param version: 型番
-    :param mode: モード
-    :return: 組み合わせが有効か？
-    """
-    modes = {mode} if isinstance(mode, Mode) else mode
-
-    if version == Version.M1 and not modes <= {Mode.Numeric}:
-        # logger.debug(f'M1 supports only Numeric mode')
-        return False  # M1は数字モードのみ
-
-    if version == Version.M2 and not modes <= {Mode.Numeric, Mode.AlphaNumeric}:
-        # logger.debug(f'M2 supports only Numeric mode and AlphaNumeric mode')
-        return False  # M2は数字モードと英数字モードのみ
-
-    return True
-
-
 def check_combination(*, version: Version = None, ecl: ECL = None, mode: Union[Mode, Set[Mode]] = None) -> bool:
     """
     組み合わせが有効か確認する
 
+    | M1は誤り検出のみ、誤り検出はM1のみ、誤り訂正レベルQはM4のみ
+    | M1は数字モードのみ、M2は数字モードと英数字モードのみ
+
     :param version: 型番
     :param ecl: 誤り訂正レベル
     :param mode: モード
     :return: 組み合わせが有効か？
     """
-    if version is not None and ecl is not None:
-        if not _check_combination_ve(version, ecl):
-            return False
+    if version is None:
+        return True
+
+    vid = _version_id[version]
+    if ecl is not None and not _valid_ecls[vid] >> _ecl_id[ecl] & 1:
+        return False
 
-    if version is not None and mode is not None:
-        if not _check_combination_vm(version, mode):
+    if mode is not None:
+        mask = 1 << _mode_id[mode] if isinstance(mode, Mode) else _to_mask(mode)
+        if mask & ~_valid_modes[vid]:
             return False
 
     return True
@@ -4,36 +4,71 @@
 
 
 from logging import getLogger
-from typing import List, Tuple, Union, Container
+from typing import Callable, List, Set, Tuple, Union, Container
 
-from .algorithm import optimize
-from .util import char2mode, list2str
-from ..binary import BinaryArray, concat_arr, arr2str
-from ..model import Version, ErrorCorrectionLevel as ECL, values, OverCapacityError, InvalidPairError
+from .algorithm import optimize_versions
+from .budget import Budget
+from .util import split_runs, list2str
+from ..binary import BinaryArray, arr2str
+from ..factory import text2segment
+from ..model import Version, ErrorCorrectionLevel as ECL, Mode, values, OverCapacityError, InvalidPairError
 
 logger = getLogger(__name__)
 
+_max_text_length = max(
+    values.get_max_character_count(v, e, m)
+    for v in Version for e in ECL for m in Mode
+    if values.check_combination(version=v, ecl=e, mode=m)
+)
+"""全ての型番・誤り訂正レベル・モードを通じた最大の文字数 (M4-Lの数字モード)"""
 
-def text2mixing_segment(version: Version, text: str) -> BinaryArray:
-    grouped = optimize(version, text)
-    logger.debug(f'({version}, {text}) -> {grouped}')
-    return concat_arr([sub.get_segment(version) for sub in grouped])
 
+def check_admission(text: str, versions: List[Version], ecls: List[ECL], modes: Set[Mode] = None) -> None:
+    """
+    最適化する前に、文字数のみから明らかに容量に収まらないテキストを除外する
+
+    | 文字数と型番ごとのビット数の下限 (values.get_min_bit_length) を各組み合わせのデータ容量と比較するだけなので、テキストの長さに依らず定数時間で終わる
+    | モードを省略すると、文字の種類を調べる前の粗い判定となる (どの型番・モードの最大の文字数も超えるテキストのみを除外する)
+    | (それ以外のテキストは、符号化できない文字や不適切な組み合わせの判定を先に行うため)
+    | 有効な組み合わせが存在しない場合は判定しない (解析でInvalidPairErrorとするため)
+
+    :param text: テキスト
+    :param versions: 使用してもよい型番の一覧
+    :param ecls: 使用してもよい誤り訂正レベルの一覧
+    :param modes: 使用されているモードの一覧 (省略するとモードを考慮しない)
+    :raise OverCapacityError: 有効な組み合わせのいずれの容量にも収まらないとき
+    """
+    pairs = [
+        (v, e) for v in versions for e in ecls
+        if values.check_combination(version=v, ecl=e, mode=modes)
+    ]
+    if len(pairs) == 0:
+        return
+
+    if modes is None:
+        if len(text) > _max_text_length:
+            raise OverCapacityError(f'text ({len(text)} characters) is over capacity of any symbols')
+        return
 
-def text2mixing_segment_length(version: Version, text: str):
-    grouped = optimize(version, text)
-    return sum((sub.get_segment_length(version) for sub in grouped))
+    for v, e in pairs:
+        if values.get_min_bit_length(v, len(text)) <= values.get_data_bit_capacity(v, e):
+            return
+    raise OverCapacityError(f'text ({len(text)} characters) is over capacity of any pairs that meet the conditions')
 
 
 def analyze_text(
-        text: str, version: Union[Version, Container[Version]] = ..., ecl: Union[ECL, Container[ECL]] = ...
+        text: str, version: Union[Version, Container[Version]] = ..., ecl: Union[ECL, Container[ECL]] = ...,
+        budget: Budget = None
 ) -> Tuple[Version, ECL, BinaryArray]:
     """
     テキストを解析して最適な型番、誤り訂正レベル、セグメントを計算する
 
+    予算を指定した場合は、予算内に見つけた最良のグループ化を用いる (最適であることが保証されているかはbudget.proven_optimalに設定する)
+
     :param text: テキスト
     :param version: 最大の型番 (あるいは使用してもよい型番の一覧)
     :param ecl: 必要な誤り訂正レベル (あるいは使用してもよい誤り訂正レベルの一覧)
+    :param budget: 最適化の予算 (省略すると無制限)
     :return: 型番, 誤り訂正レベル, セグメント
     """
     # region 前処理  # これ以降は引数のversion,eclを使用しない 一覧を表すversions,eclsを使用する
@@ -52,12 +87,48 @@ def analyze_text(
     """探索順を考慮した型番の一覧"""
     ecls = parse_arg(ecl, [ECL.Q, ECL.M, ECL.L, ECL.NONE])
     """探索順を考慮した誤り訂正レベルの一覧"""
-    modes = {char2mode(c) for c in text}
+    check_admission(text, versions, ecls)  # 長すぎるテキストは文字の種類を調べる前に除外する
+    runs = split_runs(text)  # 符号化できない文字があれば、ここで例外が発生する
+    modes = {mode for _, _, mode in runs}
     """使用されているモードの一覧"""
+    check_admission(text, versions, ecls, modes)  # モードを考慮しても収まらないテキストは最適化する前に除外する
 
     logger.debug(f'versions: {list2str(versions)}')
     logger.debug(f'ecls: {list2str(ecls)}')
     logger.debug(f'modes: {list2str(modes)}')
+
+    fits: Callable[[Version, ECL], bool]
+    """型番と誤り訂正レベルの組み合わせの容量にセグメントが収まるか？"""
+    get_segment: Callable[[Version], BinaryArray]
+    """型番を確定した後にセグメントを作成する"""
+
+    if len(runs) == 1:
+        # 1つのモードのみから成るテキストは1つのセグメントとするのが最短のため、最適化せずに表の文字数と比較する
+        mode = runs[0][2]
+        character_count = mode.character_count(text)
+        logger.debug(f'single mode: {mode} ({character_count} characters)')
+        if budget is not None:
+            budget.proven_optimal = True
+
+        def fits(v: Version, e: ECL) -> bool:
+            return character_count <= values.get_max_character_count(v, e, mode)
+
+        def get_segment(v: Version) -> BinaryArray:
+            return text2segment(v, mode, text)
+    else:
+        # 最適なグループ化は型番のみで決まる (誤り訂正レベルに依らない) ため、候補の型番についてまとめて1度だけ求める
+        grouped = optimize_versions(
+            [v for v in versions if values.check_combination(version=v, mode=modes)], text, budget=budget
+        )
+        """型番ごとの最適なグループ"""
+        seg_lens = {v: g.get_segment_length(v) for v, g in grouped.items()}
+        """型番ごとの最短のセグメント長"""
+
+        def fits(v: Version, e: ECL) -> bool:
+            return seg_lens[v] <= values.get_data_bit_capacity(v, e)
+
+        def get_segment(v: Version) -> BinaryArray:
+            return grouped[v].get_segment(v)
     # endregion
 
     # region M1は特殊なので別途処理  # これ以降は_version,_eclを個別の要素を表すために使用する
@@ -68,10 +139,8 @@ def analyze_text(
 
     if _version in versions and _ecl in ecls:
         if values.check_combination(version=_version, ecl=_ecl, mode=modes):
-            seg_len = text2mixing_segment_length(_version, text)
-            capacity = values.get_data_bit_capacity(_version, _ecl)
-            if seg_len <= capacity:
-                segment = text2mixing_segment(_version, text)
+            if fits(_version, _ecl):
+                segment = get_segment(_version)
                 return _version, _ecl, segment
         else:
             logger.debug(f'{_version}: invalid pair')
@@ -98,9 +167,7 @@ def analyze_text(
             continue
         exists_valid_pair = True  # 少なくとも1つは有効な組み合わせが存在した
 
-        seg_len = text2mixing_segment_length(_version, text)
-        capacity = values.get_data_bit_capacity(_version, _ecl)
-        if seg_len > capacity:
+        if not fits(_version, _ecl):
             logger.debug(f'{_version}: over capacity')
             continue
 
@@ -121,13 +188,12 @@ def analyze_text(
             logger.debug(f'{_ecl}: invalid pair')
             continue
 
-        seg_len = text2mixing_segment_length(_version, text)
-        capacity = values.get_data_bit_capacity(_version, _ecl)
-        if seg_len > capacity:
+        if not fits(_version, _ecl):
             logger.debug(f'{_ecl}: over capacity')
             continue
 
-        segment = text2mixing_segment(_version, text)
+        segment = get_segment(_version)  # セグメントを作成するのは確定した組み合わせの1度だけ
+        capacity = values.get_data_bit_capacity(_version, _ecl)
         logger.debug(f'{_ecl}: OK')
         logger.info(f'analyzed result: {_version}, {_ecl}')
         logger.info(f'binary data: {arr2str(segment)} ({len(segment)} / {capacity} bits)')
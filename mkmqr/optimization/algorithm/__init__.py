@@ -2,4 +2,7 @@
 最もビット数が短くなるようにテキストをグループ化するアルゴリズム
 """
 
-from .opt_hill_climbing import optimize_hill_climbing as optimize
+from .opt_adaptive import (
+    optimize_adaptive as optimize,
+    optimize_adaptive_versions as optimize_versions,
+)
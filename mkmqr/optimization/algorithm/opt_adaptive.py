@@ -0,0 +1,59 @@
+from logging import getLogger
+from typing import Dict, Iterable
+
+from .opt_brute_force import optimize_brute_force
+from .opt_dynamic_programming import optimize_dynamic_programming_versions
+from ..budget import Budget
+from ..cost_model import CostModel
+from ..text_model import GroupedText
+from ..util import split_runs
+from ...model import Version
+
+logger = getLogger(__name__)
+
+_brute_force_max_groups = 8
+"""総当たりを使用するグループ数の上限 (結合の仕方は 2**(グループ数-1) 通り)"""
+
+
+def optimize_adaptive_versions(
+        versions: Iterable[Version], text: str, cost: CostModel = None, budget: Budget = None
+) -> Dict[Version, GroupedText]:
+    """
+    テキストに応じてアルゴリズムを選択し、最もビット数が短くなるように指定のテキストをグループ化する
+
+    | グループ数が少なければ総当たりを、それ以外は動的計画法を使用する (いずれも予算内に終われば最適解が求まる)
+    | 予算を指定した場合は、結果が最適であることが保証されているかをbudget.proven_optimalに設定する
+
+    :param versions: 型番の一覧
+    :param text: テキスト
+    :param cost: テキストのコストモデル (省略すると作成する)
+    :param budget: 予算 (省略すると無制限)
+    :return: 型番ごとの、ビット数が短くなる区切りのグループ
+    """
+    if cost is None:
+        cost = CostModel(text)
+
+    group_num = len(split_runs(text))
+    if group_num <= _brute_force_max_groups:
+        logger.debug(f'{group_num} groups: brute force')
+        result = {version: optimize_brute_force(version, text, cost, budget) for version in versions}
+    else:
+        logger.debug(f'{group_num} groups: dynamic programming')
+        result = optimize_dynamic_programming_versions(versions, text, cost, budget)
+
+    if budget is not None:
+        budget.proven_optimal = all(grouped.is_optimal for grouped in result.values())
+    return result
+
+
+def optimize_adaptive(version: Version, text: str, cost: CostModel = None, budget: Budget = None) -> GroupedText:
+    """
+    テキストに応じてアルゴリズムを選択し、最もビット数が短くなるように指定のテキストをグループ化する
+
+    :param version: 型番
+    :param text: テキスト
+    :param cost: テキストのコストモデル (省略すると作成する)
+    :param budget: 予算 (省略すると無制限)
+    :return: ビット数が短くなる区切りのグループ
+    """
+    return optimize_adaptive_versions([version], text, cost, budget)[version]
@@ -1,11 +1,11 @@
 import itertools
-from copy import deepcopy
 from logging import getLogger
-from math import inf
-from typing import List
+from typing import List, Sequence
 
-from ..text_model import GroupedText, ModeText
-from ..util import list2str, grouping
+from ..budget import Budget, consume
+from ..cost_model import CostModel
+from ..text_model import GroupedText, ModeSpan
+from ..util import list2str, split_runs
 from ...model import Mode, Version
 
 logger = getLogger(__name__)
@@ -23,7 +23,7 @@ def _get_merged_mode(mode1: Mode, mode2: Mode) -> Mode:
         return Mode.Numeric
 
 
-def _merge_edges(grouped: GroupedText, edges_to_merge: List[bool]):
+def _merge_edges(grouped: GroupedText[ModeSpan], edges_to_merge: List[bool]):
     """
     指定の境界でグループを結合する (破壊操作)
 
@@ -38,9 +38,8 @@ def _merge_edges(grouped: GroupedText, edges_to_merge: List[bool]):
         if edges_to_merge[edge]:
             logger.debug(f'- merged at edge {edge}')
 
-            grouped[edge + 1] = ModeText(
-                _get_merged_mode(grouped[edge].mode, grouped[edge + 1].mode),
-                grouped[edge].text + grouped[edge + 1].text
+            grouped[edge + 1] = grouped[edge].join(
+                grouped[edge + 1], _get_merged_mode(grouped[edge].mode, grouped[edge + 1].mode)
             )
 
             # popでインデックスが1つずれるのでedgeはインクリメントしない
@@ -54,35 +53,76 @@ def _merge_edges(grouped: GroupedText, edges_to_merge: List[bool]):
         logger.debug('grouped: ' + list2str(grouped))
 
 
-def optimize_brute_force(version: Version, text: str) -> GroupedText:
+def _calc_merged_length(
+        version: Version, cost: CostModel, grouped: GroupedText[ModeSpan], edges_to_merge: Sequence[bool]
+) -> int:
+    """
+    指定の境界でグループを結合したときのセグメント長を、結合せずに求める (_merge_edgesと同じ規則で結合する)
+
+    :param version: 型番
+    :param cost: テキストのコストモデル
+    :param grouped: グループ化したテキスト
+    :param edges_to_merge: 結合する境界
+    :return: セグメント長
+    """
+    length = 0
+    begin, end, mode = grouped[0].begin, grouped[0].end, grouped[0].mode
+    for item, merge in zip(grouped[1:], edges_to_merge):
+        if merge:
+            mode = _get_merged_mode(mode, item.mode)
+        else:
+            length += cost.segment_length(version, mode, begin, end)
+            begin, mode = item.begin, item.mode
+        end = item.end
+    return length + cost.segment_length(version, mode, begin, end)
+
+
+def optimize_brute_force(version: Version, text: str, cost: CostModel = None, budget: Budget = None) -> GroupedText:
     """
     最もビット数が短くなるように指定のテキストをグループ化する
 
+    | モードごとにグループ化しただけの結果から始めて、全ての結合の仕方を試す
+    | 予算を使い切った場合は、それまでに見つけた最良の結果を返す (最適であることは保証されない)
+
     :param version: 型番
     :param text: テキスト
+    :param cost: テキストのコストモデル (省略すると作成する)
+    :param budget: 予算 (省略すると無制限)
     :return: ビット数が最短となる区切りのグループ
     """
     # memo グループ数nに対して2**(n-1)回のループを行うため、重くなりやすい 取り扱いに注意
     logger.debug(f'[optimize by brute force]')
 
-    grouped = GroupedText(grouping(text))
+    if cost is None:
+        cost = CostModel(text)
+    grouped = GroupedText([ModeSpan(cost, begin, end, mode) for begin, end, mode in split_runs(text)])
+    if len(grouped) == 0:
+        grouped.is_optimal = True
+        return grouped
     edge_num = len(grouped) - 1
 
-    best_grouped = ...
-    best_length = inf
-
-    for edges_to_merge in itertools.product([True, False], repeat=edge_num):
-        grp = deepcopy(grouped)  # 元のgroupedを破壊しないようにコピー
-        egs = list(edges_to_merge)  # tupleは操作が効かないのでlistへ
-        _merge_edges(grp, egs)
-
-        ln = grp.get_segment_length(version)
-        if ln < best_length:
-            best_grouped = grp
+    # 結合しない場合 (探索順では最後) を初期値とし、同点の場合は探索順で先のものを優先する
+    best_order = 2 ** edge_num - 1
+    best_edges = (False,) * edge_num
+    best_length = _calc_merged_length(version, cost, grouped, best_edges)
+    completed = True
+
+    for order, edges_to_merge in enumerate(itertools.product([True, False], repeat=edge_num)):
+        if not consume(budget):
+            completed = False  # 予算を使い切ったら打ち切る
+            break
+
+        ln = _calc_merged_length(version, cost, grouped, edges_to_merge)  # 候補ごとにはグループを作らない
+        if ln < best_length or (ln == best_length and order < best_order):
+            best_order = order
+            best_edges = edges_to_merge
             best_length = ln
 
         x = '*' if ln == best_length else ' '
-        logger.debug(f'{x} result {ln:3}bits {list2str(grp)}')
+        logger.debug(f'{x} result {ln:3}bits {list2str(edges_to_merge)}')
 
-    logger.info(f'{best_length}bits {list2str(best_grouped)}')
+    best_grouped = GroupedText(grouped)  # 区間は変更されないため、リストのみをコピーすれば元のgroupedを破壊しない
+    _merge_edges(best_grouped, list(best_edges))  # tupleは操作が効かないのでlistへ
+    best_grouped.is_optimal = completed
+    logger.info(f'{best_length}bits {list2str(best_grouped)}' + ('' if completed else ' (budget exhausted)'))
     return best_grouped
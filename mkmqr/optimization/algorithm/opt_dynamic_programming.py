@@ -0,0 +1,224 @@
+from logging import getLogger
+from math import inf
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..budget import Budget, consume
+from ..cost_model import CostModel
+from ..text_model import GroupedText, ModeSpan
+from ..util import list2str, split_runs
+from ...model import Mode, Version, values, InvalidCharacterError, InvalidPairError
+
+logger = getLogger(__name__)
+
+_State = Tuple[Mode, int]
+"""状態 (符号化中のモード, そのセグメントの文字数の剰余)"""
+
+_modes = [Mode.Numeric, Mode.AlphaNumeric, Mode.Kanji, Mode.EightBitByte]
+"""探索するモード (同点の場合は先頭に近いものを優先する)"""
+
+_period = {
+    Mode.Numeric: 3,
+    Mode.AlphaNumeric: 2,
+    Mode.Kanji: 1,
+    Mode.EightBitByte: 1,
+}
+"""1文字あたりのビット数が繰り返す周期"""
+
+
+def _char_bit_length(mode: Mode, phase: int, byte_count: int) -> int:
+    """
+    セグメントに1文字追加したときに増えるビット数
+
+    :param mode: セグメントのモード
+    :param phase: 追加前のセグメントの文字数の剰余
+    :param byte_count: 追加する文字を8ビットバイトモードで符号化したときのバイト数
+    """
+    if mode == Mode.Numeric:
+        return 4 if phase == 0 else 3  # 4 → 7 → 10
+    elif mode == Mode.AlphaNumeric:
+        return 6 if phase == 0 else 5  # 6 → 11
+    elif mode == Mode.Kanji:
+        return 13
+    else:  # mode == Mode.EightBitByte
+        return 8 * byte_count
+
+
+class _Lattice:
+    """1つの型番についての動的計画法の途中経過"""
+
+    def __init__(self, version: Version):
+        self.version = version
+        """型番"""
+        self.modes = [m for m in _modes if values.check_combination(version=version, mode=m)]
+        """型番で使用可能なモード"""
+        self.overhead = {
+            m: version.mode_indicator_length + values.get_character_count_indicator_length(version, m)
+            for m in self.modes
+        }
+        """セグメントを開始するためのビット数 (モード指示子と文字数指示子)"""
+        self.costs: Dict[_State, int] = {}
+        """直前の文字までを符号化したときの、状態ごとの最小のビット数"""
+        self.best_cost = 0
+        """直前の文字までを符号化したときの最小のビット数"""
+        self.best_state: Optional[_State] = None
+        """best_costを達成する状態"""
+        self.back: List[Dict[_State, Tuple[bool, Optional[_State]]]] = []
+        """各文字を符号化した後の状態ごとの、(新しいセグメントを開始したか？, 直前の文字を符号化した後の状態)"""
+
+    def step(self, cost: CostModel, idx: int) -> None:
+        """
+        1文字分だけ状態を進める
+
+        :param cost: テキストのコストモデル
+        :param idx: 文字の位置
+        """
+        char_modes = cost.char_modes(idx)
+        valid_modes = [m for m in self.modes if m in char_modes]
+        if len(valid_modes) == 0:
+            raise InvalidPairError(f'{self.version} does not support the character', cost.text[idx])
+        byte_count = cost.character_count(Mode.EightBitByte, idx, idx + 1)
+
+        costs = self.costs
+        next_costs: Dict[_State, int] = {}
+        pointers: Dict[_State, Tuple[bool, Optional[_State]]] = {}
+        for mode in valid_modes:
+            period = _period[mode]
+
+            # 新しいセグメントを開始する
+            state = (mode, 1 % period)
+            next_costs[state] = self.best_cost + self.overhead[mode] + _char_bit_length(mode, 0, byte_count)
+            pointers[state] = True, self.best_state
+
+            # 同じモードのセグメントを継続する
+            for phase in range(period):
+                cost = costs.get((mode, phase), inf)
+                if cost == inf:
+                    continue
+                cost += _char_bit_length(mode, phase, byte_count)
+                state = (mode, (phase + 1) % period)
+                if cost <= next_costs.get(state, inf):  # 同点なら継続を優先してセグメント数を減らす
+                    next_costs[state] = cost
+                    pointers[state] = False, (mode, phase)
+
+        self.costs = next_costs
+        self.best_state = min(next_costs, key=next_costs.get)
+        self.best_cost = next_costs[self.best_state]
+        self.back.append(pointers)
+
+    def backtrack(self, cost: CostModel) -> GroupedText:
+        """
+        処理済みの最後の文字から状態を辿り、セグメントの区切りを復元する
+
+        :param cost: テキストのコストモデル
+        :return: 処理済みの文字について、ビット数が最短となる区切りのグループ
+        """
+        spans = []
+        state = self.best_state
+        end = len(self.back)
+        for idx in reversed(range(end)):
+            is_new, prev = self.back[idx][state]
+            if is_new:
+                spans.append(ModeSpan(cost, idx, end, state[0]))
+                end = idx
+            state = prev
+        return GroupedText(reversed(spans))
+
+
+def _trivial_grouping(version: Version, cost: CostModel) -> GroupedText:
+    """
+    モードごとにグループ化しただけの結果を取得する (予算を使い切った場合に比較に用いる)
+
+    :param version: 型番
+    :param cost: テキストのコストモデル
+    :return: グループ
+    """
+    runs = split_runs(cost.text)
+    if not values.check_combination(version=version, mode={mode for _, _, mode in runs}):
+        raise InvalidPairError(f'{version} does not support the text', cost.text)
+    return GroupedText([ModeSpan(cost, begin, end, mode) for begin, end, mode in runs])
+
+
+def _partial_grouping(lattice: _Lattice, cost: CostModel) -> GroupedText:
+    """
+    予算を使い切った時点までの最良のグループ化に、残りの文字をモードごとにグループ化しただけの結果を繋げる
+
+    | テキスト全体をモードごとにグループ化しただけの結果の方が短ければ、そちらを返す
+
+    :param lattice: 動的計画法の途中経過
+    :param cost: テキストのコストモデル
+    :return: グループ
+    """
+    trivial = _trivial_grouping(lattice.version, cost)
+    done = len(lattice.back)
+    spans = list(lattice.backtrack(cost))
+    for span in trivial:
+        if span.end <= done:
+            continue
+        if span.begin < done:
+            span = ModeSpan(cost, done, span.end, span.mode)
+        if len(spans) > 0 and spans[-1].mode == span.mode:  # 境界で同じモードが続けば1つのセグメントにする
+            span = spans.pop().join(span, span.mode)
+        spans.append(span)
+
+    grouped = GroupedText(spans)
+    if grouped.get_segment_length(lattice.version) <= trivial.get_segment_length(lattice.version):
+        return grouped
+    return trivial
+
+
+def optimize_dynamic_programming_versions(
+        versions: Iterable[Version], text: str, cost: CostModel = None, budget: Budget = None
+) -> Dict[Version, GroupedText]:
+    """
+    最もビット数が短くなるように指定のテキストをグループ化する (複数の型番について1度の走査でまとめて求める)
+
+    | 予算を使い切った場合は、それまでに処理した文字の最良のグループ化に、残りの文字をモードごとにグループ化しただけの結果を繋げて返す
+    | (モードごとにグループ化しただけの結果より長くはならないが、最適であることは保証されない)
+
+    :param versions: 型番の一覧
+    :param text: テキスト
+    :param cost: テキストのコストモデル (省略すると作成する)
+    :param budget: 予算 (省略すると無制限)
+    :return: 型番ごとの、ビット数が最短となる区切りのグループ
+    """
+    logger.debug(f'[optimize by dynamic programming]')
+
+    if cost is None:
+        cost = CostModel(text)
+    lattices = [_Lattice(version) for version in versions]
+    for idx in range(len(text)):
+        if not consume(budget):
+            logger.info(f'budget exhausted at {idx}/{len(text)} characters')
+            return {lattice.version: _partial_grouping(lattice, cost) for lattice in lattices}
+
+        if len(cost.char_modes(idx)) == 0:
+            raise InvalidCharacterError(f'Invalid character', text[idx])
+        for lattice in lattices:
+            lattice.step(cost, idx)
+
+    result = {}
+    for lattice in lattices:
+        grouped = lattice.backtrack(cost)
+        grouped.is_optimal = True
+        logger.info(f'{lattice.version}: {lattice.best_cost}bits {list2str(grouped)}')
+        result[lattice.version] = grouped
+    return result
+
+
+def optimize_dynamic_programming(
+        version: Version, text: str, cost: CostModel = None, budget: Budget = None
+) -> GroupedText:
+    """
+    最もビット数が短くなるように指定のテキストをグループ化する
+
+    | 各文字をどのモードで符号化するかを、(モード, セグメントの文字数の剰余)を状態とする動的計画法で求める
+    | セグメントのビット数は状態ごとの増分の和に分解できるため、文字数に対して線形時間で厳密な最適解が求まる
+    | (8ビットバイトモードのバイト数が1文字ずつ符号化したときの和と一致する、状態を持たないエンコーディングを前提とする)
+
+    :param version: 型番
+    :param text: テキスト
+    :param cost: テキストのコストモデル (省略すると作成する)
+    :param budget: 予算 (省略すると無制限)
+    :return: ビット数が最短となる区切りのグループ
+    """
+    return optimize_dynamic_programming_versions([version], text, cost, budget)[version]
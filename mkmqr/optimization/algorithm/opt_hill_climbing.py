@@ -1,33 +1,88 @@
 import itertools
 from math import inf
+from typing import Dict, List, Tuple
 
-from ..text_model import SeparatedModeText, GroupedText
-from ..util import grouping
-from ...model import Version
+from ..budget import Budget, consume
+from ..cost_model import CostModel
+from ..text_model import ModeSpan, GroupedText, merge_modes
+from ..util import split_runs
+from ...model import Mode, Version
 
+_Range = Tuple[int, int]
+"""グループの範囲 (先頭のグループの番号, 末尾のグループの番号+1)"""
 
-def _opt_c_hc(version: Version, separated: SeparatedModeText) -> GroupedText:
-    if len(separated) <= 1:
-        return GroupedText([separated])  # 切るところがない場合
 
-    best_grouped: GroupedText = ...
+class _Evaluator:
+    """連続するグループをまとめたときのセグメント長を、コストモデルを用いて求める"""
+
+    def __init__(self, version: Version, cost: CostModel, runs: List[Tuple[int, int, Mode]], budget: Budget = None):
+        self.version = version
+        self.cost = cost
+        self.runs = runs
+        self.budget = budget
+        self._cache: Dict[_Range, int] = {}
+
+    def to_span(self, lo: int, hi: int) -> ModeSpan:
+        mode = merge_modes(mode for _, _, mode in self.runs[lo:hi])
+        return ModeSpan(self.cost, self.runs[lo][0], self.runs[hi-1][1], mode)
+
+    def segment_length(self, lo: int, hi: int) -> int:
+        if lo == hi:
+            return 0
+        length = self._cache.get((lo, hi))
+        if length is None:
+            length = self._cache[lo, hi] = self.to_span(lo, hi).get_segment_length(self.version)
+        return length
+
+
+def _opt_c_hc(evaluator: _Evaluator, lo: int, hi: int) -> List[_Range]:
+    if hi - lo <= 1:
+        return [(lo, hi)]  # 切るところがない場合
+
+    best_ranges: List[_Range] = ...
     best_bit_len = inf
 
-    for left, right in itertools.combinations(range(len(separated)), 2):
-        grouped = GroupedText(filter(
-            lambda x: len(x) != 0, [separated[:left], separated[left:right], separated[right:]]
-        ))
-        bit_len = grouped.get_segment_length(version)
+    for left, right in itertools.combinations(range(lo, hi), 2):
+        if not consume(evaluator.budget):
+            break  # 予算を使い切ったら、それまでに見つけた最良の切り方を用いる
+        ranges = [r for r in [(lo, left), (left, right), (right, hi)] if r[0] != r[1]]
+        bit_len = sum(evaluator.segment_length(*r) for r in ranges)
         if bit_len < best_bit_len:  # todo 等号のありなしを検討
-            best_grouped = grouped
+            best_ranges = ranges
             best_bit_len = bit_len
 
-    no_cut_bit_len = separated.get_segment_length(version)
+    no_cut_bit_len = evaluator.segment_length(lo, hi)
     if no_cut_bit_len <= best_bit_len:  # todo 等号のありなしを検討
-        return GroupedText([separated])  # 切らない方が良い場合
+        return [(lo, hi)]  # 切らない方が良い場合
+
+    return list(itertools.chain.from_iterable([_opt_c_hc(evaluator, *r) for r in best_ranges]))
+
+
+def optimize_hill_climbing(version: Version, text: str, cost: CostModel = None, budget: Budget = None) -> GroupedText:
+    """
+    最もビット数が短くなるように指定のテキストをグループ化する (山登り法)
 
-    return GroupedText(itertools.chain.from_iterable([_opt_c_hc(version, txt) for txt in best_grouped]))
+    | 予算を使い切った場合は、途中までの結果とモードごとにグループ化しただけの結果のうち、短い方を返す
+    | 最適であることは保証されない (グループが1つ以下の場合を除く)
 
+    :param version: 型番
+    :param text: テキスト
+    :param cost: テキストのコストモデル (省略すると作成する)
+    :param budget: 予算 (省略すると無制限)
+    :return: ビット数が短くなる区切りのグループ
+    """
+    if cost is None:
+        cost = CostModel(text)
+    runs = split_runs(text)
+    if len(runs) <= 1:
+        grouped = GroupedText([ModeSpan(cost, begin, end, mode) for begin, end, mode in runs])
+        grouped.is_optimal = True
+        return grouped
 
-def optimize_hill_climbing(version: Version, text: str) -> GroupedText:
-    return _opt_c_hc(version, SeparatedModeText(grouping(text)))
+    evaluator = _Evaluator(version, cost, runs, budget)
+    ranges = _opt_c_hc(evaluator, 0, len(runs))
+    if budget is not None and budget.exhausted:
+        trivial = [(i, i + 1) for i in range(len(runs))]
+        if sum(evaluator.segment_length(*r) for r in trivial) < sum(evaluator.segment_length(*r) for r in ranges):
+            ranges = trivial
+    return GroupedText([evaluator.to_span(lo, hi) for lo, hi in ranges])
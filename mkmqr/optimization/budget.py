@@ -0,0 +1,65 @@
+"""
+最適化に使用してもよい時間や反復回数を管理するプログラム
+"""
+
+from time import perf_counter
+from typing import Optional
+
+
+class Budget:
+    """
+    最適化に使用してもよい時間と反復回数の上限
+
+    | 生成した時点から時間の計測を始める
+    | 最適化のアルゴリズムは予算を使い切った時点で探索を打ち切り、それまでに見つけた最良の結果を返す
+    """
+
+    def __init__(self, seconds: float = None, iterations: int = None):
+        """
+        :param seconds: 時間の上限 (秒) (省略すると無制限)
+        :param iterations: 反復回数の上限 (省略すると無制限)
+        """
+        if seconds is not None and seconds < 0:
+            raise ValueError('seconds must be greater than or equal to 0', seconds)
+        if iterations is not None and iterations < 0:
+            raise ValueError('iterations must be greater than or equal to 0', iterations)
+
+        self._deadline = None if seconds is None else perf_counter() + seconds
+        self._iterations = iterations
+        self._used = 0
+
+        self.proven_optimal: Optional[bool] = None
+        """最後に最適化した結果が、最適であることが保証されているか？ (未実行ならNone)"""
+
+    @property
+    def used(self) -> int:
+        """消費した反復回数"""
+        return self._used
+
+    @property
+    def exhausted(self) -> bool:
+        """予算を使い切ったか？"""
+        if self._iterations is not None and self._used > self._iterations:
+            return True
+        return self._deadline is not None and perf_counter() >= self._deadline
+
+    def consume(self, iterations: int = 1) -> bool:
+        """
+        反復回数を消費する
+
+        :param iterations: 消費する反復回数
+        :return: まだ予算が残っているか？
+        """
+        self._used += iterations
+        return not self.exhausted
+
+
+def consume(budget: Optional[Budget], iterations: int = 1) -> bool:
+    """
+    予算が指定されていれば反復回数を消費する
+
+    :param budget: 予算 (Noneなら無制限)
+    :param iterations: 消費する反復回数
+    :return: まだ予算が残っているか？
+    """
+    return budget is None or budget.consume(iterations)
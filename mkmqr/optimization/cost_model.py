@@ -0,0 +1,123 @@
+"""
+テキストの任意の区間のセグメント長を定数時間で求めるためのプログラム
+"""
+
+from itertools import accumulate
+from typing import List, Optional
+
+from .util import classify_text, mask2modes
+from ..model import Mode, Version, values
+
+_modes = [Mode.Numeric, Mode.AlphaNumeric, Mode.Kanji, Mode.EightBitByte]
+"""低位から順に並べたモード"""
+
+
+class CostModel:
+    """
+    テキストを1度だけ走査して累積和を求めておき、任意の区間 [begin, end) のセグメント長を定数時間で求める
+
+    | 8ビットバイトモードのバイト数は、1文字ずつ符号化したときのバイト数の和とする
+    | (状態を持たないエンコーディングを前提とする)
+    """
+
+    def __init__(self, text: str):
+        """
+        :param text: テキスト
+        """
+        self._text = text
+        self._masks: List[int] = classify_text(text).tolist()
+        """各文字を符号化可能なモードのビットマスク"""
+
+        self._valid_counts = {
+            mode: [0] + list(accumulate(mask >> mode.mode_indicator_value & 1 for mask in self._masks))
+            for mode in _modes
+        }
+        """モードごとの、符号化可能な文字数の累積和"""
+
+        bit = 1 << Mode.EightBitByte.mode_indicator_value
+        self._byte_counts = [0] + list(accumulate(
+            Mode.EightBitByte.character_count(char) if mask & bit else 0
+            for char, mask in zip(text, self._masks)
+        ))
+        """8ビットバイトモードで符号化したときのバイト数の累積和 (符号化できない文字は0バイトとする)"""
+
+    @property
+    def text(self) -> str:
+        """テキスト"""
+        return self._text
+
+    def __len__(self) -> int:
+        return len(self._text)
+
+    def char_modes(self, idx: int) -> List[Mode]:
+        """
+        文字を符号化可能なモードを取得する
+
+        :param idx: 文字の位置
+        :return: 低位から順に並べたモードの一覧
+        """
+        return mask2modes(self._masks[idx])
+
+    def is_valid(self, mode: Mode, begin: int, end: int) -> bool:
+        """
+        区間の全ての文字をモードで符号化可能か？
+
+        :param mode: モード
+        :param begin: 区間の開始位置
+        :param end: 区間の終了位置
+        """
+        counts = self._valid_counts[mode]
+        return counts[end] - counts[begin] == end - begin
+
+    def lowest_mode(self, begin: int, end: int) -> Optional[Mode]:
+        """
+        区間の全ての文字を符号化可能な、最も低位のモードを取得する
+
+        :param begin: 区間の開始位置
+        :param end: 区間の終了位置
+        :return: モード (存在しなければNone)
+        """
+        for mode in _modes:
+            if self.is_valid(mode, begin, end):
+                return mode
+        return None
+
+    def character_count(self, mode: Mode, begin: int, end: int) -> int:
+        """
+        区間をモードで符号化したときの、マルチバイト文字を考慮した文字数
+
+        :param mode: モード
+        :param begin: 区間の開始位置
+        :param end: 区間の終了位置
+        """
+        if mode == Mode.EightBitByte:
+            return self._byte_counts[end] - self._byte_counts[begin]
+        return end - begin
+
+    def data_bit_length(self, mode: Mode, begin: int, end: int) -> int:
+        """
+        区間をモードで符号化したときの、2進データのビット数
+        (実際に符号化できるかは考慮しない)
+
+        :param mode: モード
+        :param begin: 区間の開始位置
+        :param end: 区間の終了位置
+        """
+        return mode.bit_length(self.character_count(mode, begin, end))
+
+    def segment_length(self, version: Version, mode: Mode, begin: int, end: int) -> int:
+        """
+        区間をモードで符号化したときのセグメント長 (空の区間は0)
+        (実際に符号化できるかは考慮しない)
+
+        :param version: 型番
+        :param mode: モード
+        :param begin: 区間の開始位置
+        :param end: 区間の終了位置
+        :raise InvalidPairError: 型番とモードの組み合わせが不適切なとき
+        """
+        if begin == end:
+            return 0
+        mi_len = version.mode_indicator_length
+        cci_len = values.get_character_count_indicator_length(version, mode)
+        return mi_len + cci_len + self.data_bit_length(mode, begin, end)
@@ -1,9 +1,12 @@
-from typing import Optional, Protocol, List, Generic, TypeVar
+from typing import TYPE_CHECKING, Iterable, Optional, Protocol, List, Generic, TypeVar
 
-from ..binary import bin2arr, concat_arr, BinaryArray
-from ..factory import text2segment
+from ..binary import BinaryArray, BitWriter
+from ..factory import write_text_segment
 from ..model import Mode, Version, values
 
+if TYPE_CHECKING:
+    from .cost_model import CostModel
+
 
 def mode2char(mode: Optional[Mode]) -> str:  # todo 設置場所を考える
     """
@@ -24,9 +27,34 @@ def mode2char(mode: Optional[Mode]) -> str:  # todo 設置場所を考える
         return 'x'
 
 
+def merge_modes(modes: Iterable[Mode]) -> Optional[Mode]:
+    """
+    複数のモードのテキストを1つのセグメントにまとめるときのモードを取得する
+
+    :param modes: まとめるテキストのモード
+    :return: まとめた後のモード (空ならNone)
+    """
+    modes = set(modes)
+    if Mode.EightBitByte in modes:
+        return Mode.EightBitByte
+    elif Mode.Kanji in modes:
+        if len(modes - {Mode.Kanji}) > 0:
+            return Mode.EightBitByte
+        else:
+            return Mode.Kanji
+    elif Mode.AlphaNumeric in modes:
+        return Mode.AlphaNumeric
+    elif Mode.Numeric in modes:
+        return Mode.Numeric
+    else:
+        return None  # len(...) == 0
+
+
 class SupportsMode(Protocol):
     """モード取得可能"""
 
+    __slots__ = ()
+
     @property
     def mode(self) -> Mode:
         return ...
@@ -39,12 +67,24 @@ class SupportsMode(Protocol):
 class SupportsSegment(Protocol):
     """セグメント化可能"""
 
+    __slots__ = ()
+
     def get_segment_length(self, version: Version) -> int:
         return ...
 
     def get_segment(self, version: Version) -> BinaryArray:
         return ...
 
+    def write_segment(self, version: Version, writer: BitWriter) -> None:
+        return ...
+
+
+def _get_segment(item: SupportsSegment, version: Version) -> BinaryArray:
+    """セグメント長の分だけ確保したバッファに書き込んでセグメントを作成する"""
+    writer = BitWriter(item.get_segment_length(version))
+    item.write_segment(version, writer)
+    return writer.to_arr()
+
 
 class ModeText(SupportsSegment, SupportsMode):
     """モードが付与されたテキスト"""
@@ -82,7 +122,7 @@ class ModeText(SupportsSegment, SupportsMode):
         return hash((self.mode, self.text))
 
     def __eq__(self, other):
-        if not isinstance(other, ModeText):
+        if not isinstance(other, (ModeText, ModeSpan)):
             return False
         return self.mode == other.mode and self.text == other.text
 
@@ -96,7 +136,91 @@ class ModeText(SupportsSegment, SupportsMode):
         return mi_len + cci_len + data_len
 
     def get_segment(self, version: Version) -> BinaryArray:
-        return text2segment(version, self.mode, self.text)
+        return _get_segment(self, version)
+
+    def write_segment(self, version: Version, writer: BitWriter) -> None:
+        write_text_segment(writer, version, self.mode, self.text)
+
+
+class ModeSpan(SupportsSegment, SupportsMode):
+    """
+    モードが付与された、元のテキストの区間 [begin, end)
+
+    | 部分文字列を保持せずに位置のみを保持し、文字列はセグメントを作成するときに初めて切り出す
+    | セグメント長はコストモデルから求める
+    """
+
+    __slots__ = ('_cost', '_begin', '_end', '_mode')
+
+    def __init__(self, cost: 'CostModel', begin: int, end: int, mode: Mode):
+        """
+        :param cost: 元のテキストのコストモデル
+        :param begin: 区間の開始位置
+        :param end: 区間の終了位置
+        :param mode: 符号化のモード
+        """
+        if not 0 <= begin <= end <= len(cost):
+            raise ValueError(f'invalid span [{begin}, {end}) of {len(cost)} characters')
+        self._cost = cost
+        self._begin = begin
+        self._end = end
+        self._mode = mode
+
+    @property
+    def mode(self) -> Mode:
+        return self._mode
+
+    @property
+    def text(self) -> str:
+        return self._cost.text[self._begin:self._end]
+
+    @property
+    def begin(self) -> int:
+        """区間の開始位置"""
+        return self._begin
+
+    @property
+    def end(self) -> int:
+        """区間の終了位置"""
+        return self._end
+
+    def join(self, other: 'ModeSpan', mode: Mode) -> 'ModeSpan':
+        """
+        直後の区間と結合する
+
+        :param other: 直後の区間
+        :param mode: 結合後のモード
+        :return: 結合した区間
+        """
+        if self._cost is not other._cost or self._end != other._begin:
+            raise ValueError(f'span [{other._begin}, {other._end}) does not follow [{self._begin}, {self._end})')
+        return ModeSpan(self._cost, self._begin, other._end, mode)
+
+    def __len__(self):
+        return self._end - self._begin
+
+    def __str__(self):
+        c = mode2char(self.mode)
+        return f'({c}:{self.text})'
+
+    def __hash__(self):
+        return hash((self.mode, self.text))
+
+    def __eq__(self, other):
+        if not isinstance(other, (ModeSpan, ModeText)):
+            return False
+        return self.mode == other.mode and self.text == other.text
+
+    def get_segment_length(self, version: Version) -> int:
+        return self._cost.segment_length(version, self._mode, self._begin, self._end)
+
+    def get_segment(self, version: Version) -> BinaryArray:
+        return _get_segment(self, version)
+
+    def write_segment(self, version: Version, writer: BitWriter) -> None:
+        if self._begin == self._end:
+            return
+        write_text_segment(writer, version, self.mode, self.text)
 
 
 class SeparatedModeText(List[ModeText], SupportsSegment):
@@ -107,20 +231,7 @@ class SeparatedModeText(List[ModeText], SupportsSegment):
 
     @property
     def mode(self) -> Optional[Mode]:
-        modes = {item.mode for item in self}
-        if Mode.EightBitByte in modes:
-            return Mode.EightBitByte
-        elif Mode.Kanji in modes:
-            if len(modes - {Mode.Kanji}) > 0:
-                return Mode.EightBitByte
-            else:
-                return Mode.Kanji
-        elif Mode.AlphaNumeric in modes:
-            return Mode.AlphaNumeric
-        elif Mode.Numeric in modes:
-            return Mode.Numeric
-        else:
-            return None  # len(...) == 0
+        return merge_modes(item.mode for item in self)
 
     @property
     def text(self) -> str:
@@ -135,9 +246,12 @@ class SeparatedModeText(List[ModeText], SupportsSegment):
         return mi_len + cci_len + data_len
 
     def get_segment(self, version: Version) -> BinaryArray:
+        return _get_segment(self, version)
+
+    def write_segment(self, version: Version, writer: BitWriter) -> None:
         if len(self) == 0:
-            return bin2arr(0, 0)
-        return text2segment(version, self.mode, self.text)
+            return
+        write_text_segment(writer, version, self.mode, self.text)
 
     def __str__(self) -> str:
         # x = ', '.join((str(sub_text) for sub_text in self))
@@ -158,11 +272,18 @@ T = TypeVar('T', bound=SupportsSegment)
 class GroupedText(Generic[T], List[T], SupportsSegment):
     """セグメント化するグループに分けられたテキスト"""
 
+    is_optimal = False
+    """ビット数が最短となる区切りであることが保証されているか？ (最適化のアルゴリズムが設定する)"""
+
     def get_segment_length(self, version: Version) -> int:
         return sum((item.get_segment_length(version) for item in self))
 
     def get_segment(self, version: Version) -> BinaryArray:
-        return concat_arr([item.get_segment(version) for item in self])
+        return _get_segment(self, version)
+
+    def write_segment(self, version: Version, writer: BitWriter) -> None:
+        for item in self:
+            item.write_segment(version, writer)
 
     def __str__(self) -> str:
         x = ', '.join((str(item) for item in self))
@@ -1,8 +1,148 @@
-from typing import Iterable
+from typing import Dict, Iterable, List, Tuple
 
 from .text_model import GroupedText, ModeText
+from ..binary import ByteArray, empty_byte_arr, str2codepoints, to_byte_arr
 from ..model import Mode, InvalidCharacterError
 
+_modes = [
+    Mode.Numeric,
+    Mode.AlphaNumeric,
+    Mode.Kanji,
+    Mode.EightBitByte,
+]
+"""低位から順に並べたモード"""
+
+_mask2modes: List[List[Mode]] = [
+    [mode for mode in _modes if mask & (1 << mode.mode_indicator_value)]
+    for mask in range(1 << len(_modes))
+]
+"""符号化可能なモードのビットマスクから、符号化可能なモードの一覧への変換表"""
+
+_invalid = 0xFF
+"""対応するモードがないことを表す値"""
+
+_mask2lowest = to_byte_arr([
+    modes[0].mode_indicator_value if len(modes) > 0 else _invalid
+    for modes in _mask2modes
+])
+"""符号化可能なモードのビットマスクから、最も低位のモードのモード指示子の値への変換表"""
+
+_indicator2mode = {mode.mode_indicator_value: mode for mode in _modes}
+"""モード指示子の値からモードへの変換表"""
+
+
+def _calc_mode_mask(char: str) -> int:
+    """
+    文字を符号化可能なモードのビットマスク (1 << モード指示子の値 の和) を求める
+
+    :param char: 文字
+    :return: ビットマスク
+    """
+    mask = 0
+    for mode in _modes:
+        if mode.is_valid(char):
+            mask |= 1 << mode.mode_indicator_value
+    return mask
+
+
+class _ModeTable:
+    """
+    基本多言語面(U+0000～U+FFFF)の各文字を符号化可能なモードの表
+
+    8ビットバイトモードのエンコーディングごとに作成する
+    表全体を作るのは時間がかかるため、256文字ずつのページ単位で必要になった時点で作成する
+    """
+
+    _page_size = 0x100
+
+    def __init__(self):
+        self.masks: ByteArray = empty_byte_arr(0x10000)
+        """コードポイントごとの、符号化可能なモードのビットマスク"""
+        self.built: ByteArray = empty_byte_arr(0x10000 // self._page_size)
+        """ページごとの、作成済みか否か"""
+
+    def lookup(self, codepoints) -> ByteArray:
+        """
+        コードポイントの配列について、符号化可能なモードのビットマスクを取得する
+
+        :param codepoints: コードポイントの配列 (全て基本多言語面であること)
+        :return: ビットマスクの配列
+        """
+        pages = codepoints >> 8
+        for page in set(pages[self.built[pages] == 0].tolist()):
+            begin = page * self._page_size
+            self.masks[begin:begin + self._page_size] = [
+                _calc_mode_mask(chr(cp)) for cp in range(begin, begin + self._page_size)
+            ]
+            self.built[page] = 1
+        return self.masks[codepoints]
+
+
+_mode_tables: Dict[str, _ModeTable] = {}
+"""8ビットバイトモードのエンコーディングごとの表"""
+
+
+def _get_mode_table() -> _ModeTable:
+    """現在の8ビットバイトモードのエンコーディングに対応する表を取得"""
+    encoding = Mode.EightBitByte.value.encoding
+    table = _mode_tables.get(encoding)
+    if table is None:
+        table = _mode_tables[encoding] = _ModeTable()
+    return table
+
+
+def classify_text(text: str) -> ByteArray:
+    """
+    テキストの各文字を符号化可能なモードを、まとめて求める
+
+    :param text: テキスト
+    :return: 各文字を符号化可能なモードのビットマスク (1 << モード指示子の値 の和、符号化できなければ0) の配列
+    """
+    codepoints = str2codepoints(text)
+    is_bmp = codepoints <= 0xFFFF
+    if is_bmp.all():
+        return _get_mode_table().lookup(codepoints)
+
+    # 基本多言語面以外の文字は表に載せていないため個別に求める
+    masks = empty_byte_arr(len(text))
+    masks[is_bmp] = _get_mode_table().lookup(codepoints[is_bmp])
+    for idx in (~is_bmp).nonzero()[0].tolist():
+        masks[idx] = _calc_mode_mask(text[idx])
+    return masks
+
+
+def mask2modes(mask: int) -> List[Mode]:
+    """
+    classify_textが返すビットマスクを、符号化可能なモードの一覧に変換する
+
+    :param mask: ビットマスク
+    :return: 低位から順に並べたモードの一覧
+    """
+    return _mask2modes[mask]
+
+
+def split_runs(text: str) -> List[Tuple[int, int, Mode]]:
+    """
+    テキストを、対応している最も低位のモードが連続する区間に分ける
+
+    :param text: テキスト
+    :return: 区間の (開始位置, 終了位置, モード) の一覧
+    :raise InvalidCharacterError: 符号化できない文字が含まれていたとき
+    """
+    if len(text) == 0:
+        return []
+
+    lowest = _mask2lowest[classify_text(text)]
+    invalid = (lowest == _invalid).nonzero()[0]
+    if len(invalid) > 0:
+        raise InvalidCharacterError(f'Invalid character', text[invalid[0]])
+
+    boundaries = [0] + ((lowest[1:] != lowest[:-1]).nonzero()[0] + 1).tolist() + [len(text)]
+    return [
+        (begin, end, _indicator2mode[int(lowest[begin])])
+        for begin, end in zip(boundaries[:-1], boundaries[1:])
+    ]
+
 
 def char2mode(char: str) -> Mode:
     """
@@ -11,16 +151,10 @@ def char2mode(char: str) -> Mode:
     :param char: 文字
     :return: 対応するモード
     """
-    modes = [
-        Mode.Numeric,
-        Mode.AlphaNumeric,
-        Mode.Kanji,
-        Mode.EightBitByte,
-    ]
-    for mode in modes:
-        if mode.is_valid(char):
-            return mode
-    raise InvalidCharacterError(f'Invalid character', char)
+    modes = mask2modes(int(classify_text(char)[0]))
+    if len(modes) == 0:
+        raise InvalidCharacterError(f'Invalid character', char)
+    return modes[0]
 
 
 def grouping(text: str) -> GroupedText:
@@ -30,25 +164,7 @@ def grouping(text: str) -> GroupedText:
     :param text: グループ化するテキスト
     :return: グループ化したテキスト
     """
-
-    modes = [char2mode(c) for c in text]
-    if len(modes) == 0:
-        return GroupedText()
-
-    # 下のループのために番兵を仕込む
-    modes += [...]
-    text += '$'
-
-    # モードが連続する箇所をまとめる
-    result = GroupedText()
-    prev = ModeText(modes[0], text[0])
-    for mode, char in zip(modes[1:], text[1:]):
-        if mode == prev.mode:
-            prev.text += char
-        else:
-            result.append(prev)
-            prev = ModeText(mode, char)
-    return result
+    return GroupedText([ModeText(mode, text[begin:end]) for begin, end, mode in split_runs(text)])
 
 
 def list2str(lst: Iterable):
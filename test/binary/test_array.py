@@ -35,6 +35,23 @@ class TestArray(unittest.TestCase):
         with self.assertRaises(ValueError):
             bin2arr(binary, 4)
 
+    def test_bins2arr(self):
+        binaries = [0b1010, 0b0011]
+        excepted = np.array([t, f, t, f, f, f, t, t])
+        actual = bins2arr(binaries, 4)
+        self.assertTrue((excepted == actual).all())
+
+    def test_bins2arr_overflow(self):
+        with self.assertRaises(ValueError):
+            bins2arr([0b1010, 0b10000], 4)
+        with self.assertRaises(ValueError):
+            bins2arr([-1], 4)
+
+    def test_bytes2arr(self):
+        excepted = np.array([f, f, f, f, f, f, f, t] + [t, f, t, f, t, f, t, f])
+        actual = bytes2arr(b'\x01\xaa')
+        self.assertTrue((excepted == actual).all())
+
     def test_arr2str(self):
         arr = np.array([t, f, t, f])
         excepted = '1010'
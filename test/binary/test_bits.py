@@ -0,0 +1,55 @@
+import unittest
+import numpy as np
+from mkmqr.binary import *
+
+
+class TestSymbolBits(unittest.TestCase):
+    matrix = bin2mat([
+        0b101,
+        0b011,
+        0b110,
+    ], 3)
+
+    def test_from_matrix(self):
+        """i行j列の要素が (i * size + j) ビット目となる"""
+        bits = SymbolBits.from_matrix(self.matrix)
+        self.assertEqual(3, bits.size)
+        self.assertEqual(0b011_110_101, bits.value)
+        self.assertEqual(0b110, bits.row(1))
+
+    def test_to_matrix(self):
+        rnd = np.random.default_rng(0)
+        for n in [0, 1, 11, 13, 15, 17]:
+            mat = rnd.integers(0, 2, (n, n)).astype(bool)
+            with self.subTest(f'{n}x{n}'):
+                actual = SymbolBits.from_matrix(mat).to_matrix()
+                self.assertEqual(mat.dtype, actual.dtype)
+                self.assertTrue((mat == actual).all())
+
+    def test_xor(self):
+        a = SymbolBits.from_matrix(self.matrix)
+        b = SymbolBits.from_matrix(toggle_matrix(self.matrix))
+        self.assertEqual(SymbolBits(3, 0b111_111_111), a ^ b)
+        self.assertEqual(SymbolBits(3, 0), a & b)
+        with self.assertRaises(ValueError):
+            a ^ SymbolBits(4)
+
+    def test_count_edges(self):
+        bits = SymbolBits.from_matrix(self.matrix)
+        self.assertEqual(6, bits.count())
+        self.assertEqual((1, 1), bits.count_edges())  # 下端 [_, 1, 0], 右端 [_, 1, 0]
+
+    def test_popcount(self):
+        for x in [0, 1, 0b1011, (1 << 289) - 1]:
+            with self.subTest(f'{x:b}'):
+                self.assertEqual(bin(x).count('1'), popcount(x))
+
+    def test_invalid_value(self):
+        with self.assertRaises(ValueError):
+            SymbolBits(2, 0b1_0000)
+        with self.assertRaises(ValueError):
+            SymbolBits(2, -1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -71,6 +71,17 @@ class TestMatrix(unittest.TestCase):
         with self.assertRaises(ValueError):
             empty_matrix(-1)
 
+    def test_matrix_runs(self):
+        matrix = np.array([
+            [t, t, f, t],
+            [f, f, f, f],
+            [f, t, t, t],
+        ])
+        self.assertEqual([(0, 0, 2), (0, 3, 4), (2, 1, 4)], matrix_runs(matrix))
+
+    def test_matrix_runs_empty(self):
+        self.assertEqual([], matrix_runs(empty_matrix((2, 3))))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,112 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from mkmqr.binary import *
+
+
+def _reference(matrix, module_size, quiet_zone):
+    """反転・クワイエットゾーンの追加・拡大を順に行う"""
+    padded = np.pad(~matrix, quiet_zone, constant_values=True)
+    return padded.repeat(module_size, axis=0).repeat(module_size, axis=1)
+
+
+class TestAllocateRaster(unittest.TestCase):
+    def test_memory(self):
+        raster = allocate_raster((3, 5))
+        self.assertEqual((3, 5), raster.shape)
+        self.assertEqual(bool, raster.dtype)
+        flush_raster(raster)
+
+    def test_memmap(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'raster.npy')
+            raster = allocate_raster((3, 5), path)
+            raster[...] = True
+            raster[1, 2] = False
+            flush_raster(raster)
+            actual = np.load(path)
+            del raster
+            self.assertEqual((3, 5), actual.shape)
+            self.assertEqual(14, actual.sum())
+
+
+class TestRenderRaster(unittest.TestCase):
+    matrix = bin2mat([
+        0b101,
+        0b011,
+        0b110,
+    ], 3)
+
+    def test_render(self):
+        rnd = np.random.default_rng(0)
+        for n, module_size, quiet_zone in [(3, 1, 0), (3, 2, 1), (11, 10, 2), (17, 3, 4), (13, 1, 2)]:
+            mat = rnd.integers(0, 2, (n, n)).astype(bool)
+            with self.subTest(f'{n}x{n} module_size={module_size} quiet_zone={quiet_zone}'):
+                actual = render_raster(mat, module_size, quiet_zone)
+                self.assertEqual(bool, actual.dtype)
+                self.assertTrue((_reference(mat, module_size, quiet_zone) == actual).all())
+
+    def test_out(self):
+        """確保済みの配列に描画する (連続していない配列を含む)"""
+        expected = _reference(self.matrix, 2, 1)
+        with self.subTest('contiguous'):
+            out = np.zeros((10, 10), dtype=bool)
+            actual = render_raster(self.matrix, 2, 1, out)
+            self.assertIs(out, actual)
+            self.assertTrue((expected == out).all())
+        with self.subTest('view'):
+            sheet = np.zeros((12, 30), dtype=bool)
+            render_raster(self.matrix, 2, 1, sheet[1:11, 5:15])
+            self.assertTrue((expected == sheet[1:11, 5:15]).all())
+            self.assertFalse(sheet[0].any() or sheet[:, :5].any() or sheet[:, 15:].any())
+        with self.subTest('transposed'):
+            out = np.zeros((10, 10), dtype=bool).T
+            render_raster(self.matrix, 2, 1, out)
+            self.assertTrue((expected == out).all())
+
+    def test_invalid(self):
+        for module_size, quiet_zone, out in [
+            (0, 2, None),
+            (1, -1, None),
+            (2, 1, np.zeros((9, 10), dtype=bool)),
+            (2, 1, np.zeros((10, 10), dtype=np.uint8)),
+        ]:
+            with self.subTest(f'module_size={module_size} quiet_zone={quiet_zone}'), self.assertRaises(ValueError):
+                render_raster(self.matrix, module_size, quiet_zone, out)
+
+
+class TestRenderRasterRows(unittest.TestCase):
+    def test_render(self):
+        rnd = np.random.default_rng(0)
+        for n, module_size, quiet_zone in [(3, 1, 0), (3, 2, 1), (11, 10, 2), (17, 3, 4)]:
+            mat = rnd.integers(0, 2, (n, n)).astype(bool)
+            with self.subTest(f'{n}x{n} module_size={module_size} quiet_zone={quiet_zone}'):
+                expected = _reference(mat, module_size, quiet_zone)[quiet_zone * module_size::module_size][:n]
+                actual = render_raster_rows(mat, module_size, quiet_zone)
+                self.assertEqual(bool, actual.dtype)
+                self.assertTrue((expected == actual).all())
+
+    def test_invalid(self):
+        for module_size, quiet_zone in [(0, 2), (1, -1)]:
+            with self.subTest(f'module_size={module_size} quiet_zone={quiet_zone}'), self.assertRaises(ValueError):
+                render_raster_rows(bin2mat([0b1], 1), module_size, quiet_zone)
+
+
+class TestPackRaster(unittest.TestCase):
+    def test_pack(self):
+        raster = render_raster(bin2mat([0b10, 0b01], 2), 3, 1)  # 12 x 12
+        packed = pack_raster(raster)
+        self.assertEqual((12, 2), packed.shape)
+        self.assertEqual(np.uint8, packed.dtype)
+        self.assertEqual([0b11111111, 0b11110000], packed[0].tolist())
+        self.assertEqual([0b11100011, 0b11110000], packed[3].tolist())
+
+    def test_scanlines(self):
+        raster = render_raster(bin2mat([0b10, 0b01], 2), 3, 1)  # 12 x 12
+        self.assertEqual([b'\xff\xf0', b'\xe3\xf0'], pack_scanlines(raster)[2:4])
+        self.assertEqual([b'\x00\xff\xf0'] * 3, pack_scanlines(raster, b'\x00')[:3])
+
+
+if __name__ == '__main__':
+    unittest.main()
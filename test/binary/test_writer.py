@@ -0,0 +1,54 @@
+import unittest
+import numpy as np
+from mkmqr.binary import *
+
+
+t = True
+f = False
+
+
+class TestBitWriter(unittest.TestCase):
+    def test_write(self):
+        writer = BitWriter(20)
+        writer.write(0b101, 3).write(0b0110_0111_1, 9).write(0b11, 2)
+        excepted = bin2arr(0b101_0110_0111_1_11, 14)
+        self.assertEqual(14, len(writer))
+        self.assertTrue((excepted == writer.to_arr()).all())
+        self.assertEqual(bytes([0b1010_1100, 0b1111_1100]), writer.to_bytes())
+
+    def test_write_arr(self):
+        writer = BitWriter(16)
+        writer.write(0b1, 1).write_arr(np.array([f, t, t, f, f, f, t, t, t, f]))
+        excepted = bin2arr(0b1_0110001110, 11)
+        self.assertTrue((excepted == writer.to_arr()).all())
+
+    def test_overflow(self):
+        writer = BitWriter(8)
+        with self.assertRaises(ValueError):
+            writer.write(0b10000, 4)
+        with self.assertRaises(ValueError):
+            writer.write(-1, 4)
+        writer.write(0, 6)
+        with self.assertRaises(ValueError):
+            writer.write(0, 3)
+
+    def test_padding(self):
+        """M1 (容量20ビット) 相当の埋め草"""
+        writer = BitWriter(20)
+        writer.write(0b11, 2).write_zeros(3)
+        self.assertEqual(5, len(writer))
+        writer.pad_to_byte()
+        self.assertEqual(8, len(writer))
+        writer.pad_codewords([0b1110_1100, 0b0001_0001])
+        self.assertEqual(20, len(writer))
+        self.assertEqual(bytes([0b1100_0000, 0b1110_1100, 0b0000_0000]), writer.to_bytes())
+
+    def test_write_zeros_over_capacity(self):
+        """終端パターンは容量を超える分を省略する"""
+        writer = BitWriter(10)
+        writer.write(0, 8).write_zeros(5)
+        self.assertEqual(10, len(writer))
+
+
+if __name__ == '__main__':
+    unittest.main()
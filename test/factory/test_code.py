@@ -1,3 +1,5 @@
+import itertools
+import random
 import unittest
 
 from mkmqr.model import Version, Mode, ErrorCorrectionLevel, Mask, values
@@ -50,6 +52,14 @@ class TestCodewordMatrix(unittest.TestCase):
         actual = concat_arr([mi, cci, data, terminator])
         self.assertTrue((excepted == actual).all())
 
+    def test_1_5_terminator(self):
+        """終端パターンを追加"""
+        excepted = bin2arr(0b0_1000_0000001100_0101011001_1000011_00000, 37)
+        arr = bin2arr(0b0_1000_0000001100_0101011001_1000011, 32)
+        capacity = values.get_data_bit_capacity(self.version, self.ecl)
+        actual = add_terminator(self.version, arr, capacity)
+        self.assertTrue((excepted == actual).all())
+
     def test_1_6(self):
         """埋め草ビットを追加"""
         excepted = bin2arr(0b01000000_00011000_10101100_11000011_00000000, 40)
@@ -68,10 +78,10 @@ class TestCodewordMatrix(unittest.TestCase):
 
     def test_2(self):
         """誤り訂正コード語"""
-        excepted = bin2arr(0b10000110_00001101_00100010_10101110_00110000, 40)
-        arr = bin2arr(0b01000000_00011000_10101100_11000011_00000000, 40)
-        actual = get_error_correction_codeword(self.version, self.ecl, arr)
-        self.assertTrue((excepted == actual).all())
+        excepted = bytes([0b10000110, 0b00001101, 0b00100010, 0b10101110, 0b00110000])
+        data = bytes([0b01000000, 0b00011000, 0b10101100, 0b11000011, 0b00000000])
+        actual = get_error_correction_codeword(self.version, self.ecl, data)
+        self.assertEqual(excepted, actual)
 
     def test_3(self):
         """マトリックスにモジュールを配置"""
@@ -167,6 +177,165 @@ class TestCodewordMatrix(unittest.TestCase):
         actual = merge_matrix([mat_cw, mat_msk, mat_fi])
         self.assertTrue((excepted == actual).all())
 
+    def test_6_template(self):
+        """ひな形を用いた最終的なシンボル"""
+        mat_cw = place_codeword(self.version, concat_arr([
+            bin2arr(0b01000000_00011000_10101100_11000011_00000000, 40),
+            bin2arr(0b10000110_00001101_00100010_10101110_00110000, 40),
+        ]))
+        mat_msk = get_mask_matrix(Mask.Mask01, mat_cw.shape)
+        excepted = merge_matrix([
+            get_function_pattern_matrix(self.version),
+            place_format_information(self.version, bin2arr(0b101000010011001, 15)),
+            mat_cw,
+            mat_msk,
+        ])
+        actual = get_template_matrix(self.version, self.ecl, Mask.Mask01) ^ (mat_cw ^ mat_msk)
+        self.assertTrue((excepted == actual).all())
+
+
+class TestEncode(unittest.TestCase):
+    """各モードの符号化結果を、1文字(1グループ)ずつ変換した結果と比較する"""
+
+    def test_numeric(self):
+        text = '0123456789012'
+        for n in range(len(text) + 1):
+            txt = text[:n]
+            excepted = [bin2arr(int(txt[i:i+3]), {1: 4, 2: 7, 3: 10}[len(txt[i:i+3])]) for i in range(0, n, 3)]
+            with self.subTest(txt):
+                self.assertEqual(concat_arr(excepted + [bin2arr(0, 0)]).tolist(), Mode.Numeric.encode(txt).tolist())
+
+    def test_alphanumeric(self):
+        table = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ $%*+-./:'
+        text = 'AC-42 $%*+./:Z'
+        for n in range(len(text) + 1):
+            txt = text[:n]
+            idx = [table.index(c) for c in txt]
+            excepted = [
+                bin2arr(idx[i] * 45 + idx[i+1], 11) if i + 1 < n else bin2arr(idx[i], 6)
+                for i in range(0, n, 2)
+            ]
+            with self.subTest(txt):
+                excepted = concat_arr(excepted + [bin2arr(0, 0)])
+                self.assertEqual(excepted.tolist(), Mode.AlphaNumeric.encode(txt).tolist())
+
+    def test_alpha_numeric_invalid(self):
+        for txt in ['a', 'AB_', '!', '\x00', '漢']:
+            with self.subTest(repr(txt)), self.assertRaises(ValueError):
+                Mode.AlphaNumeric.encode(txt)
+
+    def test_eight_bit_byte(self):
+        text = 'aｱ漢~'
+        excepted = concat_arr([bin2arr(b, 8) for b in text.encode('shift-jis')])
+        self.assertEqual(excepted.tolist(), Mode.EightBitByte.encode(text).tolist())
+
+    def test_kanji(self):
+        """P27 (PDF 30) 7.4.6の例 (点 0x935F, 茗 0xE4AA)"""
+        excepted = concat_arr([bin2arr(0x0D9F, 13), bin2arr(0x1AAA, 13)])
+        actual = Mode.Kanji.encode('点茗')
+        self.assertEqual(excepted.tolist(), actual.tolist())
+
+
+class TestDataCodeword(unittest.TestCase):
+    def test_half_byte(self):
+        """M1とM3の最後のデータコード語は4ビットで、下位4ビットを0とした1バイトとして扱う"""
+        segment = bin2arr(0b011_0000001100_0101011, 20)  # 容量ちょうどのセグメント
+        data = segment2data_codeword(Version.M1, ErrorCorrectionLevel.NONE, segment)
+        self.assertEqual(3, len(data))
+        self.assertEqual(0, data[-1] & 0x0F)
+
+        ec = get_error_correction_codeword(Version.M1, ErrorCorrectionLevel.NONE, data)
+        self.assertEqual(2, len(ec))
+
+        cw = codeword2arr(Version.M1, ErrorCorrectionLevel.NONE, data, ec)
+        self.assertEqual(20 + 16, len(cw))
+        self.assertTrue((segment == cw[:20]).all())
+        self.assertTrue((bin2arr(int.from_bytes(ec, 'big'), 16) == cw[20:]).all())
+
+    def test_invalid_length(self):
+        with self.assertRaises(ValueError):
+            get_error_correction_codeword(Version.M2, ErrorCorrectionLevel.L, bytes(4))
+
+
+class TestPlaceCodeword(unittest.TestCase):
+    def test_batch(self):
+        """まとめて配置した結果が1つずつ配置した結果と一致し、取り出すと元に戻るか検証"""
+        rnd = random.Random(0)
+        for version in Version:
+            n = version.size
+            length = (n-1)**2 - 8**2
+            codewords = [bin2arr(rnd.getrandbits(length), length) for _ in range(5)]
+            batch = concat_arr(codewords).reshape(5, length)
+
+            with self.subTest(f'{version}'):
+                actual = place_codeword(version, batch)
+                self.assertEqual((5, n, n), actual.shape)
+                for cw, mat in zip(codewords, actual):
+                    self.assertTrue((place_codeword(version, cw) == mat).all())
+                self.assertTrue((extract_codeword(version, actual) == batch).all())
+
+    def test_invalid_length(self):
+        with self.assertRaises(ValueError):
+            place_codeword(Version.M1, bin2arr(0, 35))
+
+    def test_bits(self):
+        """SymbolBitsへの配置とマスクの選択が、行列の場合と一致するか検証"""
+        rnd = random.Random(0)
+        for version, ecl in itertools.product(Version, ErrorCorrectionLevel):
+            if not values.check_combination(version=version, ecl=ecl):
+                continue
+            data_num = (values.get_data_bit_capacity(version, ecl) + 7) // 8
+            ec_num = values.get_error_correction_codeword_num(version, ecl)
+            for _ in range(5):
+                data = bytearray(rnd.getrandbits(8) for _ in range(data_num))
+                if values.get_data_bit_capacity(version, ecl) % 8 != 0:
+                    data[-1] &= 0xF0
+                ec = bytes(rnd.getrandbits(8) for _ in range(ec_num))
+                with self.subTest(f'{version}-{ecl}: {data.hex()} {ec.hex()}'):
+                    mat = place_codeword(version, codeword2arr(version, ecl, bytes(data), ec))
+                    bits = place_codeword_bits(version, ecl, bytes(data) + ec)
+                    self.assertTrue((mat == bits.to_matrix()).all())
+
+                    mask, mat_mask = get_optimal_mask(mat)
+                    mask_bits, bits_mask = get_optimal_mask_bits(bits)
+                    self.assertEqual(mask, mask_bits)
+                    self.assertTrue((mat_mask == bits_mask.to_matrix()).all())
+
+
+class TestMaskMatrix(unittest.TestCase):
+    def test_pattern(self):
+        """マスクの行列が各座標についてマスクパターンの関数を評価した結果と一致するか検証"""
+        for version, mask in itertools.product(Version, Mask):
+            n = version.size
+            with self.subTest(f'{version} {mask}'):
+                actual = get_mask_matrix(mask, n)
+                for i, j in itertools.product(range(n), range(n)):
+                    in_data_area = i != 0 and j != 0 and not (i <= 8 and j <= 8)
+                    self.assertEqual(in_data_area and mask.function(i, j), actual[i, j])
+
+    def test_select_mask_batch(self):
+        """配置前のコード語列の端のビットからまとめて選んだマスクが、1つずつ選んだマスクと一致するか検証"""
+        rnd = random.Random(0)
+        for version in Version:
+            n = version.size
+            length = (n-1)**2 - 8**2
+            batch = concat_arr([bin2arr(rnd.getrandbits(length), length) for _ in range(20)]).reshape(20, length)
+            bottom_idx, right_idx = get_edge_codeword_index(version)
+
+            with self.subTest(f'{version}'):
+                actual = select_mask(batch[:, bottom_idx], batch[:, right_idx])
+                self.assertEqual((20,), actual.shape)
+                for cw, value in zip(batch, actual):
+                    mat_cw = place_codeword(version, cw)
+                    scores = [calc_mask_score(get_mask_matrix(mask, n) ^ mat_cw) for mask in Mask]
+                    self.assertEqual(scores.index(max(scores)), value)
+
+    def test_read_only(self):
+        mat = get_mask_matrix(Mask.Mask00, 11)
+        self.assertIs(mat, get_mask_matrix(Mask.Mask00, (11, 11)))
+        with self.assertRaises(ValueError):
+            mat[1, 1] = False
+
 
 if __name__ == '__main__':
     unittest.main()
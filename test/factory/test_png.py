@@ -0,0 +1,66 @@
+import struct
+import unittest
+import zlib
+from io import BytesIO
+
+import numpy as np
+from PIL import Image
+
+from mkmqr import create_symbol_matrix, symbol_matrix2image, symbol_matrix2png, write_symbol_png
+
+
+def _read_chunks(png: bytes):
+    """チャンクの種類とデータの一覧 (CRCを検証する)"""
+    chunks = []
+    pos = 8
+    while pos < len(png):
+        length, = struct.unpack('>I', png[pos:pos + 4])
+        chunk_type, data = png[pos + 4:pos + 8], png[pos + 8:pos + 8 + length]
+        crc, = struct.unpack('>I', png[pos + 8 + length:pos + 12 + length])
+        assert crc == zlib.crc32(chunk_type + data)
+        chunks.append((chunk_type, data))
+        pos += 12 + length
+    return chunks
+
+
+class TestPng(unittest.TestCase):
+    def test_same_as_image(self):
+        """PILで読み込んだ画像が、symbol_matrix2imageの画像と一致する"""
+        for text in ['1', 'HELLO', 'aあ1', 'A' * 21]:
+            matrix = create_symbol_matrix(text)
+            for module_size, quiet_zone in [(1, 0), (3, 2), (10, 2), (7, 4)]:
+                with self.subTest(f'{text} module_size={module_size} quiet_zone={quiet_zone}'):
+                    cells = matrix.shape[0] + 2 * quiet_zone
+                    expected = symbol_matrix2image(matrix, cells * module_size, quiet_zone)
+                    actual = Image.open(BytesIO(symbol_matrix2png(matrix, module_size, quiet_zone)))
+                    self.assertEqual('1', actual.mode)
+                    self.assertEqual(expected.size, actual.size)
+                    self.assertTrue((np.asarray(expected) == np.asarray(actual)).all())
+
+    def test_chunks(self):
+        """巨大な画像はIDATチャンクを分割して書き込む"""
+        matrix = create_symbol_matrix('12345')
+        file = BytesIO()
+        write_symbol_png(file, matrix, 200, 2, 0)
+        png = file.getvalue()
+        self.assertEqual(b'\x89PNG\r\n\x1a\n', png[:8])
+
+        chunks = _read_chunks(png)
+        types = [t for t, _ in chunks]
+        self.assertEqual(b'IHDR', types[0])
+        self.assertEqual(b'IEND', types[-1])
+        self.assertGreater(types.count(b'IDAT'), 1)
+        self.assertEqual(struct.pack('>IIBBBBB', 3000, 3000, 1, 0, 0, 0, 0), chunks[0][1])
+
+        raw = zlib.decompress(b''.join(data for t, data in chunks if t == b'IDAT'))
+        self.assertEqual(3000 * (1 + 375), len(raw))
+
+    def test_invalid(self):
+        matrix = create_symbol_matrix('1')
+        for module_size, quiet_zone in [(0, 2), (1, -1)]:
+            with self.subTest(f'module_size={module_size} quiet_zone={quiet_zone}'), self.assertRaises(ValueError):
+                symbol_matrix2png(matrix, module_size, quiet_zone)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import re
+import unittest
+
+import numpy as np
+
+from mkmqr import (
+    create_symbol_matrix, render_raster, symbol_matrix2zpl, symbol_matrix2zpl_label, symbol_matrix2escpos,
+    ErrorCorrectionLevel as ECL,
+)
+from mkmqr.factory.printer import _zpl_repeat
+
+
+def _count(prefix: str) -> int:
+    """ZPLの圧縮形式の繰り返し回数"""
+    n = 0
+    for c in prefix:
+        n += (ord(c) - ord('f')) * 20 if c.islower() else ord(c) - ord('F')
+    return n
+
+
+def _decode_zpl(data: str, row_bytes: int) -> str:
+    """ZPLの圧縮形式を16進数に戻す"""
+    rows = []
+    row = ''
+    for prefix, c in re.findall(r'([G-Yg-z]*)([0-9A-F,!:])', data):
+        if c == ':':
+            rows.append(rows[-1])
+            continue
+        if c in ',!':
+            row = row.ljust(2 * row_bytes, '0' if c == ',' else 'F')
+        else:
+            row += c * (_count(prefix) if prefix else 1)
+        if len(row) == 2 * row_bytes:
+            rows.append(row)
+            row = ''
+    return ''.join(rows)
+
+
+def _expected_hex(matrix, dot_size, quiet_zone) -> str:
+    return np.packbits(~render_raster(matrix, dot_size, quiet_zone), axis=-1).tobytes().hex().upper()
+
+
+class TestZpl(unittest.TestCase):
+    def test_repeat_count(self):
+        for n in [1, 2, 19, 20, 21, 400, 419, 420, 1000]:
+            with self.subTest(n):
+                data = _zpl_repeat('A', n)
+                self.assertEqual(n, sum(_count(p) or 1 for p, _ in re.findall(r'([G-Yg-z]*)(A)', data)))
+
+    def test_graphic_field(self):
+        for text, ecl in [('1', ECL.NONE), ('HELLO', ECL.L), ('A' * 21, ECL.L)]:
+            matrix = create_symbol_matrix(text, ecl)
+            for dot_size, quiet_zone in [(1, 0), (3, 2), (8, 2)]:
+                expected = _expected_hex(matrix, dot_size, quiet_zone)
+                for compress in [False, True]:
+                    with self.subTest(f'{text} dot_size={dot_size} quiet_zone={quiet_zone} compress={compress}'):
+                        zpl = symbol_matrix2zpl(matrix, dot_size, quiet_zone, compress)
+                        _, total, count, row_bytes, data = zpl.split(',', 4)
+                        row_bytes = int(row_bytes)
+                        self.assertEqual('^GFA', _)
+                        self.assertEqual(len(expected) // 2, int(total))
+                        self.assertEqual(total, count)
+                        if compress:
+                            data = _decode_zpl(data, row_bytes)
+                        self.assertEqual(expected, data)
+
+    def test_compressed_size(self):
+        matrix = create_symbol_matrix('A' * 21, ECL.L)
+        self.assertLess(len(symbol_matrix2zpl(matrix, 8)), len(symbol_matrix2zpl(matrix, 8, compress=False)) // 4)
+
+    def test_label(self):
+        matrix = create_symbol_matrix('12345')
+        label = symbol_matrix2zpl_label(matrix, 4, 2, (10, 20))
+        self.assertEqual(f'^XA^FO10,20{symbol_matrix2zpl(matrix, 4, 2)}^FS^XZ', label)
+
+
+class TestEscPos(unittest.TestCase):
+    def test_raster(self):
+        matrix = create_symbol_matrix('HELLO', ECL.L)  # M2 (13 x 13)
+        command = symbol_matrix2escpos(matrix, 3, 2)
+        self.assertEqual(b'\x1d\x76\x30\x00', command[:4])
+        self.assertEqual(bytes([7, 0, 51, 0]), command[4:8])  # 51ドット -> 7バイト
+        self.assertEqual(_expected_hex(matrix, 3, 2), command[8:].hex().upper())
+
+    def test_invalid(self):
+        matrix = create_symbol_matrix('1')
+        with self.assertRaises(ValueError):
+            symbol_matrix2escpos(matrix, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
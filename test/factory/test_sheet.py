@@ -0,0 +1,65 @@
+import os
+import tempfile
+import unittest
+from io import BytesIO
+
+import numpy as np
+from PIL import Image
+
+from mkmqr import (
+    create_symbol_matrix, render_raster, get_sheet_shape, create_sheet_raster, write_raster_png,
+    ErrorCorrectionLevel as ECL,
+)
+
+
+class TestSheet(unittest.TestCase):
+    texts = ['1', 'HELLO', 'A' * 21, '12345', 'aあ1']
+
+    def assertSheet(self, sheet, matrices, columns, module_size, quiet_zone, cell_size):
+        self.assertEqual(get_sheet_shape(len(matrices), columns, cell_size), sheet.shape)
+        expected = np.ones(sheet.shape, dtype=bool)
+        for i, matrix in enumerate(matrices):
+            row, col = divmod(i, columns)
+            raster = render_raster(matrix, module_size, quiet_zone)
+            size = raster.shape[0]
+            expected[row * cell_size:row * cell_size + size, col * cell_size:col * cell_size + size] = raster
+        self.assertTrue((expected == sheet).all())
+
+    def test_sheet(self):
+        matrices = [create_symbol_matrix(text, ECL.L) for text in self.texts]
+        symbols = [matrices[0]] + self.texts[1:]  # テキストと行列の混在
+        settings = [(1, 1, 0, None), (2, 3, 2, None), (3, 2, 2, 50), (5, 4, 1, None)]
+        for columns, module_size, quiet_zone, cell_size in settings:
+            with self.subTest(f'columns={columns} module_size={module_size} quiet_zone={quiet_zone} cell={cell_size}'):
+                sheet = create_sheet_raster(symbols, columns, module_size, quiet_zone, cell_size, ECL.L)
+                if cell_size is None:
+                    cell_size = (17 + 2 * quiet_zone) * module_size  # M4
+                self.assertSheet(sheet, matrices, columns, module_size, quiet_zone, cell_size)
+
+    def test_memmap(self):
+        matrices = [create_symbol_matrix(text) for text in self.texts]
+        with tempfile.TemporaryDirectory() as dir_name:
+            path = os.path.join(dir_name, 'sheet.npy')
+            sheet = create_sheet_raster(matrices, 2, 2, 2, path=path)
+            self.assertIsInstance(sheet, np.memmap)
+            loaded = np.load(path)
+            self.assertSheet(loaded, matrices, 2, 2, 2, sheet.shape[1] // 2)
+            del sheet
+
+    def test_png(self):
+        sheet = create_sheet_raster(self.texts, 3, 8)  # 複数回に分けて走査線に変換する高さ
+        file = BytesIO()
+        write_raster_png(file, sheet)
+        image = Image.open(BytesIO(file.getvalue()))
+        self.assertEqual('1', image.mode)
+        self.assertTrue((np.asarray(image) == sheet).all())
+
+    def test_invalid(self):
+        with self.subTest('columns'), self.assertRaises(ValueError):
+            create_sheet_raster(self.texts, 0)
+        with self.subTest('cell_size'), self.assertRaises(ValueError):
+            create_sheet_raster(self.texts, 2, 10, 2, cell_size=100)
+
+
+if __name__ == '__main__':
+    unittest.main()
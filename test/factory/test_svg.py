@@ -0,0 +1,66 @@
+import re
+import unittest
+import xml.etree.ElementTree as ET
+
+import numpy as np
+
+from mkmqr import create_symbol_matrix, symbol_matrix2path, symbol_matrix2svg, ErrorCorrectionLevel as ECL
+
+
+def _path2matrix(path: str, size: int) -> np.ndarray:
+    """水平線のパスデータを行列に戻す"""
+    mat = np.zeros((size, size), dtype=bool)
+    x = y = 0
+    for command, a, b in re.findall(r'([Mmh])(-?[\d.]+)(?: (-?[\d.]+))?', path):
+        if command == 'M':
+            x, y = int(a), int(float(b))
+        elif command == 'm':
+            x += int(a)
+        else:  # h
+            mat[y, x:x + int(a)] = True
+            x += int(a)
+    return mat
+
+
+class TestSvg(unittest.TestCase):
+    def test_path(self):
+        """パスデータが行列の暗モジュールと一致する"""
+        for text in ['1', 'HELLO', 'aあ1', 'A' * 21]:
+            matrix = create_symbol_matrix(text)
+            for quiet_zone in [0, 2, 4]:
+                with self.subTest(f'{text} quiet_zone={quiet_zone}'):
+                    path = symbol_matrix2path(matrix, quiet_zone)
+                    actual = _path2matrix(path, matrix.shape[0] + 2 * quiet_zone)
+                    expected = np.pad(matrix, quiet_zone)
+                    self.assertTrue((expected == actual).all())
+
+    def test_empty(self):
+        matrix = np.zeros((11, 11), dtype=bool)
+        self.assertEqual('', symbol_matrix2path(matrix))
+        root = ET.fromstring(symbol_matrix2svg(matrix))
+        self.assertEqual(1, len(root))
+
+    def test_svg(self):
+        matrix = create_symbol_matrix('A' * 21, ECL.L)  # M4
+        svg = symbol_matrix2svg(matrix, 1.5, 2, 'mm', light=None)
+        self.assertLess(len(svg), 1000)
+
+        root = ET.fromstring(svg)
+        self.assertEqual('{http://www.w3.org/2000/svg}svg', root.tag)
+        self.assertEqual('31.5mm', root.get('width'))
+        self.assertEqual('0 0 21 21', root.get('viewBox'))
+        self.assertEqual(1, len(root))  # 背景なし
+        self.assertEqual(symbol_matrix2path(matrix, 2), root[0].get('d'))
+        self.assertEqual('none', root[0].get('fill'))  # 塗りつぶさずに線だけを描く
+        self.assertEqual('1', root[0].get('stroke-width'))
+
+    def test_invalid(self):
+        matrix = create_symbol_matrix('1')
+        with self.subTest('scale'), self.assertRaises(ValueError):
+            symbol_matrix2svg(matrix, 0)
+        with self.subTest('quiet_zone'), self.assertRaises(ValueError):
+            symbol_matrix2path(matrix, -1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,165 @@
+import itertools
+import unittest
+
+from mkmqr import Version, ErrorCorrectionLevel as ECL, Mode, Mask, values, InvalidPairError, arr2bin
+
+# 規格の表 (変換前の実装の値)
+data_bit_capacity = {
+    (Version.M1, ECL.NONE): 20,
+    (Version.M2, ECL.L): 40,
+    (Version.M2, ECL.M): 32,
+    (Version.M3, ECL.L): 84,
+    (Version.M3, ECL.M): 68,
+    (Version.M4, ECL.L): 128,
+    (Version.M4, ECL.M): 112,
+    (Version.M4, ECL.Q): 80,
+}
+"""P31 (PDF 34) 表7"""
+
+error_correction_codeword_num = {
+    (Version.M1, ECL.NONE): 2,
+    (Version.M2, ECL.L): 5,
+    (Version.M2, ECL.M): 6,
+    (Version.M3, ECL.L): 6,
+    (Version.M3, ECL.M): 8,
+    (Version.M4, ECL.L): 8,
+    (Version.M4, ECL.M): 10,
+    (Version.M4, ECL.Q): 14,
+}
+"""P36 (PDF 39) 表9"""
+
+symbol_number = {
+    (Version.M1, ECL.NONE): 0,
+    (Version.M2, ECL.L): 1,
+    (Version.M2, ECL.M): 2,
+    (Version.M3, ECL.L): 3,
+    (Version.M3, ECL.M): 4,
+    (Version.M4, ECL.L): 5,
+    (Version.M4, ECL.M): 6,
+    (Version.M4, ECL.Q): 7,
+}
+"""P55 (PDF 58) 表13"""
+
+character_count_indicator_length = {
+    (Version.M1, Mode.Numeric): 3,
+    (Version.M2, Mode.Numeric): 4,
+    (Version.M2, Mode.AlphaNumeric): 3,
+    (Version.M3, Mode.Numeric): 5,
+    (Version.M3, Mode.AlphaNumeric): 4,
+    (Version.M3, Mode.EightBitByte): 4,
+    (Version.M3, Mode.Kanji): 3,
+    (Version.M4, Mode.Numeric): 6,
+    (Version.M4, Mode.AlphaNumeric): 5,
+    (Version.M4, Mode.EightBitByte): 5,
+    (Version.M4, Mode.Kanji): 4,
+}
+"""P21 (PDF 24) 表3"""
+
+format_information = [
+    # マスク 00, 01, 10, 11
+    [0b100010001000101, 0b100000101110010, 0b100111000101011, 0b100101100011100],  # 0: M1
+    [0b101010110101110, 0b101000010011001, 0b101111111000000, 0b101101011110111],  # 1: M2-L
+    [0b110011110010011, 0b110001010100100, 0b110110111111101, 0b110100011001010],  # 2: M2-M
+    [0b111011001111000, 0b111001101001111, 0b111110000010110, 0b111100100100001],  # 3: M3-L
+    [0b000011011011110, 0b000001111101001, 0b000110010110000, 0b000100110000111],  # 4: M3-M
+    [0b001011100110101, 0b001001000000010, 0b001110101011011, 0b001100001101100],  # 5: M4-L
+    [0b010010100001000, 0b010000000111111, 0b010111101100110, 0b010101001010001],  # 6: M4-M
+    [0b011010011100011, 0b011000111010100, 0b011111010001101, 0b011101110111010],  # 7: M4-Q
+]
+"""シンボル番号とマスクごとの形式情報 P55 (PDF 58) 7.9.2"""
+
+
+class TestVersionEcl(unittest.TestCase):
+    def test_values(self):
+        for version, ecl in itertools.product(Version, ECL):
+            if (version, ecl) not in symbol_number:
+                continue
+            with self.subTest(f'{version} {ecl}'):
+                self.assertEqual(data_bit_capacity[version, ecl], values.get_data_bit_capacity(version, ecl))
+                self.assertEqual(
+                    error_correction_codeword_num[version, ecl], values.get_error_correction_codeword_num(version, ecl)
+                )
+                self.assertEqual(symbol_number[version, ecl], values.get_symbol_number(version, ecl))
+
+    def test_format_information(self):
+        for (version, ecl), number in symbol_number.items():
+            for mask in Mask:
+                with self.subTest(f'{number} ({version} {ecl}) {mask}'):
+                    actual = values.get_format_information(version, ecl, mask)
+                    self.assertEqual(15, len(actual))
+                    self.assertEqual(format_information[number][mask.mask_pattern_value], arr2bin(actual))
+
+    def test_invalid(self):
+        """
+        不適切な組み合わせはInvalidPairErrorとなる
+        (get_symbol_numberは以前はValueErrorだったが、InvalidPairErrorはValueErrorのサブクラスなので互換性がある)
+        """
+        functions = [
+            values.get_data_bit_capacity,
+            values.get_error_correction_codeword_num,
+            values.get_symbol_number,
+            lambda v, e: values.get_format_information(v, e, Mask.Mask00),
+        ]
+        for version, ecl in itertools.product(Version, ECL):
+            if (version, ecl) in symbol_number:
+                continue
+            for i, function in enumerate(functions):
+                with self.subTest(f'{version} {ecl} #{i}'):
+                    with self.assertRaises(InvalidPairError) as cm:
+                        function(version, ecl)
+                    self.assertIsInstance(cm.exception, ValueError)
+
+
+class TestVersionMode(unittest.TestCase):
+    def test_values(self):
+        for (version, mode), length in character_count_indicator_length.items():
+            with self.subTest(f'{version} {mode}'):
+                self.assertEqual(length, values.get_character_count_indicator_length(version, mode))
+                mode_indicator = values.get_mode_indicator(version, mode)
+                self.assertEqual(version.mode_indicator_length, len(mode_indicator))
+                if len(mode_indicator) > 0:
+                    self.assertEqual(mode.mode_indicator_value, arr2bin(mode_indicator))
+
+    def test_invalid(self):
+        for version, mode in itertools.product(Version, Mode):
+            if (version, mode) in character_count_indicator_length:
+                continue
+            with self.subTest(f'{version} {mode}'):
+                with self.assertRaises(InvalidPairError):
+                    values.get_character_count_indicator_length(version, mode)
+                with self.assertRaises(InvalidPairError):
+                    values.get_mode_indicator(version, mode)
+                with self.assertRaises(InvalidPairError):
+                    values.get_character_count_indicator(version, mode, 1)
+
+
+class TestCheckCombination(unittest.TestCase):
+    def test_version_ecl(self):
+        for version, ecl in itertools.product(Version, ECL):
+            with self.subTest(f'{version} {ecl}'):
+                self.assertEqual((version, ecl) in symbol_number, values.check_combination(version=version, ecl=ecl))
+                self.assertTrue(values.check_combination(ecl=ecl))
+
+    def test_version_mode(self):
+        """単一のモードとモードの集合 (空集合を含む)"""
+        for version in Version:
+            valid = {mode for mode in Mode if (version, mode) in character_count_indicator_length}
+            for mode in Mode:
+                with self.subTest(f'{version} {mode}'):
+                    self.assertEqual(mode in valid, values.check_combination(version=version, mode=mode))
+            for n in range(len(Mode) + 1):
+                for modes in itertools.combinations(Mode, n):
+                    with self.subTest(f'{version} {set(modes)}'):
+                        actual = values.check_combination(version=version, mode=set(modes))
+                        self.assertEqual(set(modes) <= valid, actual)
+
+    def test_all(self):
+        for version, ecl, mode in itertools.product(Version, ECL, Mode):
+            expected = (version, ecl) in symbol_number and (version, mode) in character_count_indicator_length
+            with self.subTest(f'{version} {ecl} {mode}'):
+                self.assertEqual(expected, values.check_combination(version=version, ecl=ecl, mode=mode))
+        self.assertTrue(values.check_combination())
+
+
+if __name__ == '__main__':
+    unittest.main()
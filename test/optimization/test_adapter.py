@@ -0,0 +1,93 @@
+import itertools
+import unittest
+
+from mkmqr import Mode, Version, ErrorCorrectionLevel as ECL, values, text2segment
+from mkmqr import OverCapacityError, InvalidPairError, InvalidCharacterError
+from mkmqr.optimization import analyze_text
+from mkmqr.optimization.algorithm import optimize
+
+
+class TestSingleMode(unittest.TestCase):
+    """1つのモードのみから成るテキストについて、表による判定が最適化による判定と一致するか検証"""
+
+    chars = {
+        Mode.Numeric: '1',
+        Mode.AlphaNumeric: 'A',
+        Mode.EightBitByte: 'a',
+        Mode.Kanji: 'あ',
+    }
+
+    def test_max_character_count(self):
+        for version, ecl, (mode, char) in itertools.product(Version, ECL, self.chars.items()):
+            if not values.check_combination(version=version, ecl=ecl, mode=mode):
+                continue
+            capacity = values.get_data_bit_capacity(version, ecl)
+            max_count = values.get_max_character_count(version, ecl, mode)
+            for n in range(1, max_count + 3):
+                text = char * n
+                grouped = optimize(version, text)
+                with self.subTest(f'{version} {ecl} {text}'):
+                    self.assertEqual(n <= max_count, grouped.get_segment_length(version) <= capacity)
+                    if n <= max_count:
+                        self.assertTrue((grouped.get_segment(version) == text2segment(version, mode, text)).all())
+
+    def test_jis(self):
+        """P31 (PDF 34) 表7"""
+        self.assertEqual(5, values.get_max_character_count(Version.M1, ECL.NONE, Mode.Numeric))
+        self.assertEqual(6, values.get_max_character_count(Version.M2, ECL.L, Mode.AlphaNumeric))
+        self.assertEqual(9, values.get_max_character_count(Version.M3, ECL.L, Mode.EightBitByte))
+        self.assertEqual(5, values.get_max_character_count(Version.M4, ECL.Q, Mode.Kanji))
+
+
+class TestAdmission(unittest.TestCase):
+    def test_min_bit_length(self):
+        """どのようなテキストでも、最適化したビット数が下限を下回らないか検証"""
+        for version, text in itertools.product(Version, ['1' * 7, 'A1' * 5, '1a1', 'ああ1', 'AあA']):
+            if not values.check_combination(version=version, mode={Mode.EightBitByte, Mode.Kanji}):
+                continue
+            with self.subTest(f'{version} {text}'):
+                length = optimize(version, text).get_segment_length(version)
+                self.assertLessEqual(values.get_min_bit_length(version, len(text)), length)
+
+    def test_over_capacity(self):
+        analyze_text('1' * 35)
+        for text in ['1' * 36, 'あ' * 10000, '1' * 9999 + 'a']:
+            with self.subTest(f'{text[:10]}... ({len(text)})'), self.assertRaises(OverCapacityError):
+                analyze_text(text)
+
+    def test_error_priority(self):
+        """文字数のみで収まらないと分かるテキスト以外は、容量の判定より先に符号化できない文字と不適切な組み合わせを判定する"""
+        for text in ['1' * 20 + '\U0001F600', 'a' * 34 + '\U0001F600']:
+            with self.subTest(f'{text[:10]}... ({len(text)})'), self.assertRaises(InvalidCharacterError):
+                analyze_text(text)
+        for text, version in [('a' * 5, Version.M2), ('hello world', Version.M2), ('12345A', Version.M1)]:
+            with self.subTest(f'{text} {version}'), self.assertRaises(InvalidPairError):
+                analyze_text(text, version)
+        for text in ['1' * 36 + '\U0001F600', '1' * 10000 + '\U0001F600']:
+            with self.subTest(f'{text[:10]}... ({len(text)})'), self.assertRaises(OverCapacityError):
+                analyze_text(text)  # どの型番・モードにも収まらない長さなら、文字の種類を調べる前に除外する
+        with self.assertRaises(OverCapacityError):
+            analyze_text('a' * 10000, Version.M2)
+
+    def test_m1(self):
+        """M1のみを使用できる場合も、容量に収まらなければOverCapacityErrorとする"""
+        self.assertEqual((Version.M1, ECL.NONE), analyze_text('1' * 5, Version.M1)[:2])
+        for text in ['1' * 6, '1' * 10000]:
+            with self.subTest(len(text)), self.assertRaises(OverCapacityError):
+                analyze_text(text, Version.M1)
+        with self.assertRaises(InvalidPairError):
+            analyze_text('A', Version.M1)
+
+    def test_no_valid_pair(self):
+        """型番と誤り訂正レベルの指定で有効な組み合わせが残らない場合は、文字数に依らずInvalidPairErrorとする"""
+        for text, version, ecl in [
+            ('1', Version.M1, ECL.L),
+            ('1' * 10000, Version.M1, ECL.L),
+            ('1' * 10000, {Version.M2, Version.M3}, {ECL.NONE, ECL.Q}),
+        ]:
+            with self.subTest(f'{len(text)} {version} {ecl}'), self.assertRaises(InvalidPairError):
+                analyze_text(text, version, ecl)
+
+
+if __name__ == '__main__':
+    unittest.main()
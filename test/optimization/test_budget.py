@@ -0,0 +1,102 @@
+import unittest
+
+from mkmqr import Version
+from mkmqr.optimization import analyze_text
+from mkmqr.optimization.budget import Budget
+from mkmqr.optimization.util import grouping
+from mkmqr.optimization.algorithm import optimize
+from mkmqr.optimization.algorithm.opt_brute_force import optimize_brute_force
+from mkmqr.optimization.algorithm.opt_hill_climbing import optimize_hill_climbing
+from mkmqr.optimization.algorithm.opt_dynamic_programming import optimize_dynamic_programming
+
+
+class TestBudget(unittest.TestCase):
+    text = 'A1A1A1aaa1A'
+    version = Version.M4
+
+    def test_iterations(self):
+        budget = Budget(iterations=2)
+        self.assertTrue(budget.consume())
+        self.assertTrue(budget.consume())
+        self.assertFalse(budget.consume())
+        self.assertTrue(budget.exhausted)
+        self.assertEqual(3, budget.used)
+
+    def test_seconds(self):
+        budget = Budget(seconds=0)
+        self.assertFalse(budget.consume())
+        self.assertTrue(budget.exhausted)
+
+        budget = Budget(seconds=60)
+        self.assertFalse(budget.exhausted)
+        self.assertTrue(budget.consume())
+
+    def test_invalid(self):
+        for kwargs in [{'iterations': -1}, {'seconds': -1}]:
+            with self.subTest(kwargs), self.assertRaises(ValueError):
+                Budget(**kwargs)
+
+    def test_exhausted(self):
+        """予算がなくてもモードごとにグループ化しただけの結果以上となり、最適であることは保証されない"""
+        trivial = grouping(self.text).get_segment_length(self.version)
+        for optimizer in [optimize_brute_force, optimize_dynamic_programming, optimize_hill_climbing]:
+            with self.subTest(optimizer.__name__):
+                grouped = optimizer(self.version, self.text, budget=Budget(iterations=0))
+                self.assertEqual(self.text, ''.join(sub.text for sub in grouped))
+                self.assertLessEqual(grouped.get_segment_length(self.version), trivial)
+                self.assertFalse(grouped.is_optimal)
+
+    def test_dynamic_programming_partial(self):
+        """予算を使い切るまでに処理した文字は、最良のグループ化を用いる"""
+        text = '1A' * 8
+        trivial = grouping(text).get_segment_length(self.version)
+        best = optimize_dynamic_programming(self.version, text).get_segment_length(self.version)
+        prev = trivial
+        for iterations in range(len(text)):
+            with self.subTest(iterations):
+                grouped = optimize_dynamic_programming(self.version, text, budget=Budget(iterations=iterations))
+                self.assertEqual(text, ''.join(sub.text for sub in grouped))
+                self.assertFalse(grouped.is_optimal)
+                length = grouped.get_segment_length(self.version)
+                self.assertLessEqual(length, prev)
+                self.assertLessEqual(best, length)
+                prev = length
+        self.assertLess(prev, trivial)
+
+    def test_anytime(self):
+        """予算を増やすほど結果が改善し、予算内に終われば最適であることが保証される"""
+        best = optimize_brute_force(self.version, self.text)
+        self.assertTrue(best.is_optimal)
+
+        lengths = []
+        for iterations in [0, 1, 4, 16, 64, 256, 1024]:
+            grouped = optimize_brute_force(self.version, self.text, budget=Budget(iterations=iterations))
+            lengths.append(grouped.get_segment_length(self.version))
+        self.assertEqual(sorted(lengths, reverse=True), lengths)
+        self.assertEqual(best.get_segment_length(self.version), lengths[-1])
+
+    def test_analyze_text(self):
+        for text, iterations, excepted in [
+            ('12345', 0, True),  # 1つのモードのみなら最適化しない
+            ('AAA111aaa', None, True),
+            ('AAA111aaa', 0, False),
+            ('1A1A1A1A1', None, True),  # 動的計画法
+            ('1A1A1A1A1', 5, False),
+        ]:
+            budget = Budget(iterations=iterations)
+            with self.subTest(f'{text} {iterations}'):
+                analyze_text(text, budget=budget)
+                self.assertEqual(excepted, budget.proven_optimal)
+
+    def test_adaptive(self):
+        """グループ数によらず、最適解が求まるか検証"""
+        for text in ['1A', self.text, self.text * 3]:
+            with self.subTest(text):
+                grouped = optimize(self.version, text)
+                self.assertTrue(grouped.is_optimal)
+                excepted = optimize_dynamic_programming(self.version, text).get_segment_length(self.version)
+                self.assertEqual(excepted, grouped.get_segment_length(self.version))
+
+
+if __name__ == '__main__':
+    unittest.main()
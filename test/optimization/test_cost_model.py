@@ -0,0 +1,72 @@
+import itertools
+import unittest
+
+from mkmqr import Mode, Version, InvalidPairError
+from mkmqr.optimization.cost_model import CostModel
+from mkmqr.optimization.text_model import ModeSpan, ModeText
+
+
+class TestCostModel(unittest.TestCase):
+    text = '12AB:abｱあ漢34'
+
+    def test_segment_length(self):
+        """全ての区間とモードについて、テキストを切り出して求めた場合と一致するか検証"""
+        cost = CostModel(self.text)
+        for version, mode in itertools.product([Version.M3, Version.M4], Mode):
+            for begin, end in itertools.combinations(range(len(self.text) + 1), 2):
+                sub_text = self.text[begin:end]
+                if not mode.is_valid(sub_text):
+                    self.assertFalse(cost.is_valid(mode, begin, end))
+                    continue
+                with self.subTest(f'{version} {mode} {sub_text}'):
+                    self.assertTrue(cost.is_valid(mode, begin, end))
+                    excepted = ModeText(mode, sub_text).get_segment_length(version)
+                    self.assertEqual(excepted, cost.segment_length(version, mode, begin, end))
+
+    def test_lowest_mode(self):
+        cost = CostModel(self.text)
+        self.assertEqual(Mode.Numeric, cost.lowest_mode(0, 2))
+        self.assertEqual(Mode.AlphaNumeric, cost.lowest_mode(0, 5))
+        self.assertEqual(Mode.Kanji, cost.lowest_mode(8, 10))
+        self.assertEqual(Mode.EightBitByte, cost.lowest_mode(0, len(self.text)))
+        self.assertIsNone(CostModel('\U0001F600').lowest_mode(0, 1))
+
+    def test_empty(self):
+        cost = CostModel(self.text)
+        self.assertEqual(0, cost.segment_length(Version.M1, Mode.Kanji, 3, 3))
+        with self.assertRaises(InvalidPairError):
+            cost.segment_length(Version.M1, Mode.Kanji, 3, 4)
+
+
+class TestModeSpan(unittest.TestCase):
+    text = '12AB:abｱあ漢34'
+
+    def test_segment(self):
+        """テキストを切り出したModeTextとセグメントが一致するか検証"""
+        cost = CostModel(self.text)
+        spans = [(0, 2, Mode.Numeric), (2, 5, Mode.AlphaNumeric), (0, 9, Mode.EightBitByte), (8, 10, Mode.Kanji)]
+        for version, (begin, end, mode) in itertools.product([Version.M3, Version.M4], spans):
+            span = ModeSpan(cost, begin, end, mode)
+            excepted = ModeText(mode, self.text[begin:end])
+            with self.subTest(f'{version} {excepted}'):
+                self.assertEqual(excepted, span)
+                self.assertEqual(str(excepted), str(span))
+                self.assertEqual(excepted.get_segment_length(version), span.get_segment_length(version))
+                self.assertTrue((excepted.get_segment(version) == span.get_segment(version)).all())
+
+    def test_join(self):
+        cost = CostModel(self.text)
+        span = ModeSpan(cost, 0, 2, Mode.Numeric).join(ModeSpan(cost, 2, 5, Mode.AlphaNumeric), Mode.AlphaNumeric)
+        self.assertEqual((0, 5, '12AB:'), (span.begin, span.end, span.text))
+        with self.assertRaises(ValueError):
+            ModeSpan(cost, 0, 2, Mode.Numeric).join(ModeSpan(cost, 3, 5, Mode.AlphaNumeric), Mode.AlphaNumeric)
+        with self.assertRaises(ValueError):
+            ModeSpan(cost, 0, len(self.text) + 1, Mode.EightBitByte)
+
+    def test_slots(self):
+        span = ModeSpan(CostModel(self.text), 0, 2, Mode.Numeric)
+        self.assertFalse(hasattr(span, '__dict__'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,5 @@
 """
-総当たりの実装が正しいと仮定し、山登り法について次の点を確認する
+総当たりの実装が正しいと仮定し、山登り法と動的計画法について次の点を確認する
 
 * 例外が発生しないこと
 * 総当たりと同じ品質の解が出ること
@@ -19,9 +19,27 @@ aaaa11111AAAAみたいなパターンにおいて、2つに切ってそれぞれ
 import itertools
 import unittest
 
-from mkmqr import Version
+from mkmqr import Version, InvalidPairError, InvalidCharacterError, values
+from mkmqr.optimization import analyze_text
+from mkmqr.optimization.algorithm import optimize, optimize_versions
 from mkmqr.optimization.algorithm.opt_brute_force import optimize_brute_force
 from mkmqr.optimization.algorithm.opt_hill_climbing import optimize_hill_climbing
+from mkmqr.optimization.algorithm.opt_dynamic_programming import (
+    optimize_dynamic_programming,
+    optimize_dynamic_programming_versions,
+)
+from mkmqr.optimization.util import split_runs
+
+
+def _fixture_texts():
+    """TestOptimizationで使用しているテキスト"""
+    yield '11111'
+    for cl, ch in [('1', 'A'), ('1', 'a'), ('A', 'a')]:
+        for n in range(1, 11):
+            yield from [cl * n + ch, ch + cl * n, ch + cl * n + ch]
+    for lo, li, ri, ro in itertools.product(['1', 'A', 'a'], repeat=4):
+        yield from [f'{lo}{li}あ{ri}{ro}', f'{lo}{li}ああ{ri}{ro}']
+    yield from ['a11あAAa', '1AあA1AAあA1', '1AああA1AあA1', '1AあA1AああA1', '12月31日(火)', '1あ1a1あ1']
 
 
 class TestOptimization(unittest.TestCase):
@@ -34,6 +52,12 @@ class TestOptimization(unittest.TestCase):
             ct_len = ct.get_segment_length(version)
             self.assertEqual(bf_len, ct_len)
 
+        with self.subTest(f'{version} {text} - dynamic programming'):
+            dp = optimize_dynamic_programming(version, text)
+            dp_len = dp.get_segment_length(version)
+            self.assertEqual(text, ''.join((sub.text for sub in dp)))
+            self.assertEqual(bf_len, dp_len)
+
     def two_modes(self, version: Version, cl: str, ch: str, n_max: int):
         # テストの設定が妥当か？
         # nが小さいうちは結合した方(len(...)==1)が得であり、nが大きくなると分けた方が得となる
@@ -82,6 +106,37 @@ class TestOptimization(unittest.TestCase):
         self.is_equals_to_brute_force(Version.M4, '12月31日(火)')
         self.is_equals_to_brute_force(Version.M4, '1あ1a1あ1')
 
+    def test_versions(self):
+        """複数の型番についてまとめて求めた結果が、型番ごとに求めた結果と同じ長さになるか検証"""
+        for text in _fixture_texts():
+            modes = {mode for _, _, mode in split_runs(text)}
+            versions = [version for version in Version if values.check_combination(version=version, mode=modes)]
+            dp = optimize_dynamic_programming_versions(versions, text)
+            adaptive = optimize_versions(versions, text)
+            self.assertEqual(versions, list(dp))
+            for version in versions:
+                with self.subTest(f'{version} {text}'):
+                    expected = optimize(version, text).get_segment_length(version)
+                    self.assertEqual(expected, dp[version].get_segment_length(version))
+                    self.assertEqual(expected, optimize_dynamic_programming(version, text).get_segment_length(version))
+                    self.assertEqual(expected, adaptive[version].get_segment_length(version))
+                    self.assertEqual(text, ''.join(sub.text for sub in dp[version]))
+
+    def test_analyze_text(self):
+        """analyze_textのセグメントが、選択した型番について最適化したセグメント長と一致するか検証"""
+        for text in _fixture_texts():
+            with self.subTest(text):
+                version, ecl, segment = analyze_text(text)
+                self.assertEqual(optimize(version, text).get_segment_length(version), len(segment))
+
+    def test_dynamic_programming_invalid(self):
+        with self.subTest('invalid pair'), self.assertRaises(InvalidPairError):
+            optimize_dynamic_programming(Version.M2, '1a')
+        with self.subTest('invalid character'), self.assertRaises(InvalidCharacterError):
+            optimize_dynamic_programming(Version.M4, '1\U0001F600')
+        with self.subTest('empty'):
+            self.assertEqual(0, len(optimize_dynamic_programming(Version.M4, '')))
+
 
 if __name__ == '__main__':
     unittest.main()
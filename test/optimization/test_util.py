@@ -0,0 +1,64 @@
+import unittest
+
+from mkmqr import Mode, InvalidCharacterError, set_encoding
+from mkmqr.optimization.util import char2mode, classify_text, grouping, mask2modes, split_runs
+
+
+def naive_char2mode(char: str):
+    for mode in [Mode.Numeric, Mode.AlphaNumeric, Mode.Kanji, Mode.EightBitByte]:
+        if mode.is_valid(char):
+            return mode
+    return None
+
+
+class TestClassify(unittest.TestCase):
+    chars = ''.join(chr(cp) for cp in [
+        *range(0x00, 0x100), *range(0x3000, 0x3100), *range(0x4E00, 0x4F00),
+        0xFF61, 0xFFFD, 0xD800, 0x1F600,
+    ])
+
+    def check_chars(self):
+        masks = classify_text(self.chars).tolist()
+        for char, mask in zip(self.chars, masks):
+            with self.subTest(f'U+{ord(char):04X}'):
+                excepted = [mode for mode in Mode if mode.is_valid(char)]
+                self.assertEqual(set(excepted), set(mask2modes(mask)))
+
+                if naive_char2mode(char) is None:
+                    with self.assertRaises(InvalidCharacterError):
+                        char2mode(char)
+                else:
+                    self.assertEqual(naive_char2mode(char), char2mode(char))
+
+    def test_classify(self):
+        self.check_chars()
+
+    def test_classify_encoding(self):
+        """8ビットバイトモードのエンコーディングを変更した場合"""
+        try:
+            set_encoding('utf-8')
+            self.check_chars()
+        finally:
+            set_encoding('shift-jis')
+
+    def test_split_runs(self):
+        text = '123ABCabcあいう1'
+        excepted = [
+            (0, 3, Mode.Numeric),
+            (3, 6, Mode.AlphaNumeric),
+            (6, 9, Mode.EightBitByte),
+            (9, 12, Mode.Kanji),
+            (12, 13, Mode.Numeric),
+        ]
+        self.assertEqual(excepted, split_runs(text))
+        self.assertEqual(['123', 'ABC', 'abc', 'あいう', '1'], [sub.text for sub in grouping(text)])
+        self.assertEqual([], split_runs(''))
+
+    def test_split_runs_invalid(self):
+        with self.assertRaises(InvalidCharacterError) as cm:
+            split_runs('12\U0001F600')
+        self.assertEqual('\U0001F600', cm.exception.args[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import itertools
+import unittest
+from mkmqr.error_correction import PolynomialRing, ResidueFieldOperator, GaloisField
+
+
+class TestGaloisField(unittest.TestCase):
+    def test_mul(self):
+        """乗算を検証"""
+        field = GaloisField(0b111)
+
+        # (a, b, a*b)
+        tests = [
+            (0, 0, 0),
+            (0, 3, 0),
+            (1, 1, 1),
+            (1, 2, 2),
+            (2, 2, 3),
+            (2, 3, 1),
+            (3, 3, 2),
+        ]
+
+        for a, b, excepted in tests:
+            with self.subTest(f'{a} * {b} = {excepted}'):
+                self.assertEqual(excepted, field.mul(a, b))
+
+    def test_div(self):
+        """除算を検証"""
+        field = GaloisField(0b111)
+
+        # (a, b, a/b)
+        tests = [
+            (0, 1, 0),
+            (1, 2, 3),
+            (1, 3, 2),
+            (2, 3, 3),
+            (3, 2, 2),
+            (3, 3, 1),
+        ]
+
+        for a, b, excepted in tests:
+            with self.subTest(f'{a} / {b} = {excepted}'):
+                self.assertEqual(excepted, field.div(a, b))
+
+        for a in [0, 1, 2, 3]:
+            with self.subTest(f'{a} / 0'), self.assertRaises(ZeroDivisionError):
+                field.div(a, 0)
+
+    def test_inv(self):
+        """逆元を検証"""
+        field = GaloisField(0b111)
+
+        for a, excepted in [(1, 1), (2, 3), (3, 2)]:
+            with self.subTest(f'{a}^-1 = {excepted}'):
+                self.assertEqual(excepted, field.inv(a))
+
+        with self.subTest('0^-1'), self.assertRaises(ZeroDivisionError):
+            field.inv(0)
+
+    def test_not_primitive(self):
+        """原始多項式でない場合は例外を送出する"""
+        for p in [0b1, 0b101, 0b1_0001_1011]:  # 0b1_0001_1011は既約だが原始多項式ではない
+            with self.subTest(f'{p:b}'), self.assertRaises(ValueError):
+                GaloisField(p)
+
+    def test_same_as_residue_field_8d(self):
+        """マイクロQRコードで使用される8次の原始多項式について、剰余体の計算と一致するか検証"""
+        primitive_polynomial = PolynomialRing(0b1_0001_1101)
+        rf_op = ResidueFieldOperator(primitive_polynomial)
+        field = GaloisField(primitive_polynomial)
+
+        for e in range(300):
+            with self.subTest(f'a^{e}'):
+                self.assertEqual(rf_op.from_exp(e).coefficient, field.from_exp(e))
+
+        for a, b in itertools.product([0, 1, 2, 29, 128, 200, 255], repeat=2):
+            pa, pb = PolynomialRing(a), PolynomialRing(b)
+            with self.subTest(f'{a} * {b}'):
+                self.assertEqual(rf_op.mul(pa, pb).coefficient, field.mul(a, b))
+            if b != 0:
+                with self.subTest(f'{a} / {b}'):
+                    self.assertEqual(rf_op.div(pa, pb).coefficient, field.div(a, b))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,8 @@
+import random
 import unittest
-from mkmqr.error_correction import PolynomialRing, ReedSolomonCode
+from mkmqr.error_correction import (
+    PolynomialRing, ReedSolomonCode, GaloisField, ResidueFieldOperator, calc_generator_polynomial
+)
 
 
 class TestReedSolomonCode(unittest.TestCase):
@@ -40,6 +43,86 @@ class TestReedSolomonCode(unittest.TestCase):
                 for _e, _a in zip(excepted, actual):
                     self.assertEqual(_e._coefficient, _a._coefficient)
 
+    def test_encode_raw(self):
+        """桁をシフトしない符号化が、シフト済みのデータに対する符号化と一致するか検証"""
+        generator_polynomial = self.from_list(1, 31, 198, 63, 147, 116)
+        rs_code = ReedSolomonCode(self.primitive_polynomial, generator_polynomial)
+
+        data = self.from_list(233, 253, 6, 34, 80)
+        excepted = rs_code.encode(data)
+        actual = rs_code.encode_raw(data + self.from_list(0, 0, 0, 0, 0))
+        self.assertEqual(excepted, actual)
+
+        # 下位の桁はそのまま剰余に加わる
+        actual = rs_code.encode_raw(data + self.from_list(1, 2, 3, 4, 5))
+        excepted = [e.coefficient ^ t for e, t in zip(excepted, [1, 2, 3, 4, 5])]
+        self.assertEqual(excepted, [a.coefficient for a in actual])
+
+    def test_encode_raw_short(self):
+        """生成多項式の次数より短いデータは、そのまま剰余として返す"""
+        generator_polynomial = self.from_list(1, 31, 198, 63, 147, 116)
+        rs_code = ReedSolomonCode(self.primitive_polynomial, generator_polynomial)
+        for data in [[], [7], [1, 2, 3, 4]]:
+            with self.subTest(data):
+                self.assertEqual(data, rs_code.encode_raw_coefficient(data))
+                self.assertEqual(self.from_list(*data), rs_code.encode_raw(self.from_list(*data)))
+
+    def test_compatibility(self):
+        """以前の属性を同じ型で参照できるか検証"""
+        generator_polynomial = self.from_list(1, 31, 198, 63, 147, 116)
+        rs_code = ReedSolomonCode(self.primitive_polynomial, generator_polynomial)
+        self.assertEqual(generator_polynomial, rs_code.generator_polynomial)
+        self.assertTrue(all(isinstance(g, PolynomialRing) for g in rs_code.generator_polynomial))
+        self.assertEqual((1, 31, 198, 63, 147, 116), rs_code.generator_coefficients)
+
+        self.assertIsInstance(rs_code.rf_op, ResidueFieldOperator)
+        self.assertEqual(self.primitive_polynomial, rs_code.rf_op.primitive_polynomial)
+        a, b = PolynomialRing(233), PolynomialRing(31)
+        self.assertEqual(rs_code.field.mul(233, 31), rs_code.rf_op.mul(a, b).coefficient)
+
+        rf_op = ResidueFieldOperator(self.primitive_polynomial)
+        self.assertIs(rf_op, ReedSolomonCode(rf_op, generator_polynomial).rf_op)
+
+        with self.assertRaises(AttributeError):
+            rs_code.rf_op = rf_op
+
+    def test_generator_polynomial(self):
+        """展開して求めた生成多項式が、規格に掲載されたもの(べき表現)と一致するか検証"""
+        field = GaloisField(self.primitive_polynomial)
+
+        table = [
+            (0, 25, 1),
+            (0, 113, 164, 166, 119, 10),
+            (0, 166, 0, 134, 5, 176, 15),
+            (0, 175, 238, 208, 249, 215, 252, 196, 28),
+            (0, 251, 67, 46, 61, 118, 70, 64, 94, 32, 45),
+            (0, 199, 249, 155, 48, 190, 124, 218, 137, 216, 87, 207, 59, 22, 91),
+        ]
+
+        for exp in table:
+            degree = len(exp) - 1
+            with self.subTest(f'degree {degree}'):
+                excepted = [field.from_exp(e) for e in exp]
+                actual = calc_generator_polynomial(field, degree)
+                self.assertEqual(excepted, actual)
+
+    def test_encode_batch(self):
+        """一括処理の結果が1つずつ符号化した結果と一致するか検証"""
+        field = GaloisField(self.primitive_polynomial)
+        rnd = random.Random(0)
+
+        for degree, k in [(2, 3), (5, 5), (14, 9)]:
+            rs_code = ReedSolomonCode(field, calc_generator_polynomial(field, degree))
+            data = [[rnd.randrange(256) for _ in range(k)] for _ in range(20)]
+            with self.subTest(f'degree {degree}'):
+                excepted = [rs_code.encode_coefficient(d) for d in data]
+                actual = rs_code.encode_batch(data)
+                self.assertEqual((20, degree), actual.shape)
+                self.assertEqual(excepted, actual.tolist())
+
+        with self.subTest('not 2-dimensional'), self.assertRaises(ValueError):
+            rs_code.encode_batch([1, 2, 3])
+
 
 if __name__ == '__main__':
     unittest.main()